@@ -0,0 +1,226 @@
+import os
+import re
+import sys
+import csv
+import json
+import time
+import sqlite3
+import argparse
+
+from build_test_db import DEFAULT_DB_PATH, PASS_STATUSES, WORKSPACE, connect, ingest
+from results_layout import CATEGORIES, RESPONSE_FILES
+
+# Ad-hoc questions over every indexed run, answered from the SQLite index of build_test_db.py:
+#   appgw_results.py query --category release --branch '1.2.*' --proposition 'SCXI*' \
+#       --test-type 'Core Sanity' --latest --columns branch,proposition,run,pass_rate
+#   appgw_results.py query --of tests --test Device_0007 --status Failed --group-by branch --sort runs:desc
+# --branch/--proposition/--test take shell-style wildcards; results can be grouped, sorted and
+# printed as a table, JSON or CSV. 'appgw_results.py index' brings the index up to date.
+_DATE_RE = re.compile(r'^\d{8}(_\d{6})?$')
+# Dashboard label of each suite ('CoreSanity' -> 'Core Sanity'), as in the index tabs
+TEST_TYPES = {suite: re.sub(r'(?<=[a-z])(?=[A-Z])', ' ', suite) for suite in RESPONSE_FILES}
+_PASS_RATE = 'ROUND(CASE WHEN r.total > 0 THEN r.passed * 100.0 / r.total ELSE 0 END, 1)'
+_TEST_TYPE = 'CASE r.suite ' + ' '.join(f"WHEN '{s}' THEN '{t}'" for s, t in TEST_TYPES.items()) + ' ELSE r.suite END'
+_PASSED_STATUS = '(' + ', '.join(f"'{s}'" for s in PASS_STATUSES) + ')'
+
+# Output columns: name -> SQL expression, for plain rows and for --group-by aggregates
+RUN_COLUMNS = {
+    'category': 'r.category', 'branch': 'r.branch', 'proposition': 'r.proposition', 'suite': 'r.suite',
+    'test_type': _TEST_TYPE, 'run': 'r.run_ts', 'total': 'r.total', 'passed': 'r.passed', 'failed': 'r.failed',
+    'skipped': 'r.skipped', 'pass_rate': _PASS_RATE, 'duration_ms': 'r.duration_ms', 'path': 'r.path',
+}
+TEST_COLUMNS = {
+    'category': 'r.category', 'branch': 'r.branch', 'proposition': 'r.proposition', 'suite': 'r.suite',
+    'test_type': _TEST_TYPE, 'run': 'r.run_ts', 'test_id': 't.test_id', 'test_name': 't.test_name',
+    'status': 't.status', 'duration_ms': 't.duration_ms',
+}
+RUN_AGGREGATES = {
+    'runs': 'COUNT(*)', 'latest_run': 'MAX(r.run_ts)', 'avg_pass_rate': f'ROUND(AVG({_PASS_RATE}), 1)',
+    'min_pass_rate': f'MIN({_PASS_RATE})', 'passed': 'SUM(r.passed)', 'failed': 'SUM(r.failed)',
+    'skipped': 'SUM(r.skipped)',
+}
+TEST_AGGREGATES = {
+    'runs': 'COUNT(*)', 'latest_run': 'MAX(r.run_ts)', 'passed': f'SUM(t.status IN {_PASSED_STATUS})',
+    'failed': "SUM(t.status = 'Failed')", 'fail_rate': "ROUND(AVG(t.status = 'Failed') * 100, 1)",
+    'last_failed': "MAX(CASE WHEN t.status = 'Failed' THEN r.run_ts END)", 'tests': 'COUNT(DISTINCT t.test_id)',
+}
+DEFAULT_COLUMNS = {
+    'runs': ['category', 'branch', 'proposition', 'test_type', 'run', 'total', 'passed', 'failed', 'skipped', 'pass_rate'],
+    'tests': ['category', 'branch', 'proposition', 'test_type', 'run', 'test_id', 'status', 'duration_ms'],
+}
+DEFAULT_AGGREGATES = {
+    'runs': ['runs', 'latest_run', 'avg_pass_rate', 'failed'],
+    'tests': ['runs', 'failed', 'fail_rate', 'last_failed'],
+}
+
+
+def _match(column, pattern):
+    """Equality (which can use the index) unless the pattern has shell-style wildcards."""
+    return (f'{column} GLOB ?' if any(c in pattern for c in '*?[') else f'{column} = ?'), pattern
+
+
+def build_query(args):
+    """(SQL, parameters, output column names) for the parsed query options."""
+    of_tests = args.of == 'tests'
+    columns, aggregates = (TEST_COLUMNS, TEST_AGGREGATES) if of_tests else (RUN_COLUMNS, RUN_AGGREGATES)
+
+    run_clauses, params = [], []
+    for column, value in (('category', args.category), ('branch', args.branch), ('proposition', args.proposition)):
+        if value:
+            clause, value = _match(column, value)
+            run_clauses.append(clause)
+            params.append(value)
+    if args.suite:
+        run_clauses.append('suite = ?')
+        params.append(args.suite)
+    if args.since:
+        run_clauses.append('run_ts >= ?')
+        params.append(args.since if len(args.since) > 8 else args.since + '_000000')
+    if args.until:
+        run_clauses.append('run_ts <= ?')
+        params.append(args.until if len(args.until) > 8 else args.until + '_999999')
+    # The filtered runs; --latest keeps the newest of each proposition and suite among them
+    recency = (', ROW_NUMBER() OVER (PARTITION BY category, branch, proposition, suite ORDER BY run_ts DESC) AS recency'
+               if args.latest else '')
+    sql = f"WITH r AS (SELECT *{recency} FROM runs{' WHERE ' + ' AND '.join(run_clauses) if run_clauses else ''}) "
+
+    clauses = ['r.recency = 1'] if args.latest else []
+    if of_tests:
+        if args.test:
+            clause, value = _match('t.test_id', args.test)
+            clauses.append(clause)
+            params.append(value)
+        if args.status:
+            clauses.append('t.status = ?')
+            params.append(args.status)
+
+    if args.group_by:
+        names = args.group_by + (args.columns or DEFAULT_AGGREGATES[args.of])
+        exprs = {**{name: columns[name] for name in args.group_by}, **aggregates}
+    else:
+        names = args.columns or DEFAULT_COLUMNS[args.of]
+        exprs = columns
+    sql += 'SELECT ' + ', '.join(f'{exprs[name]} AS "{name}"' for name in names)
+    sql += ' FROM r' + (' JOIN test_results t ON t.run_id = r.id' if of_tests else '')
+    if clauses:
+        sql += ' WHERE ' + ' AND '.join(clauses)
+    if args.group_by:
+        sql += ' GROUP BY ' + ', '.join(columns[name] for name in args.group_by)
+
+    order = []
+    if not args.sort and not args.group_by:
+        # Newest runs first, whether or not the run is one of the output columns
+        order.append('r.run_ts DESC')
+    for key in args.sort or ():
+        name, _, direction = key.partition(':')
+        if name not in names:
+            raise ValueError(f"cannot sort by {name!r}: not an output column ({', '.join(names)})")
+        if direction not in ('', 'asc', 'desc'):
+            raise ValueError(f"unknown sort direction {direction!r} (asc or desc)")
+        order.append(f'"{name}" {direction.upper() or "ASC"}')
+    if order:
+        sql += ' ORDER BY ' + ', '.join(order)
+    if args.limit:
+        sql += ' LIMIT ?'
+        params.append(args.limit)
+    return sql, params, names
+
+
+def format_table(names, rows):
+    cells = [[('' if v is None else str(v)) for v in row] for row in rows]
+    widths = [max([len(name)] + [len(row[i]) for row in cells]) for i, name in enumerate(names)]
+    numeric = [all(isinstance(row[i], (int, float)) or row[i] is None for row in rows) and rows for i in range(len(names))]
+    lines = ['  '.join(name.rjust(w) if num else name.ljust(w) for name, w, num in zip(names, widths, numeric)).rstrip(),
+             '  '.join('-' * w for w in widths)]
+    for row in cells:
+        lines.append('  '.join(v.rjust(w) if num else v.ljust(w) for v, w, num in zip(row, widths, numeric)).rstrip())
+    return '\n'.join(lines)
+
+
+def write_output(names, rows, fmt, out=sys.stdout):
+    if fmt == 'json':
+        json.dump([dict(zip(names, row)) for row in rows], out, indent=1)
+        out.write('\n')
+    elif fmt == 'csv':
+        writer = csv.writer(out, lineterminator='\n')
+        writer.writerow(names)
+        writer.writerows(rows)
+    else:
+        out.write(format_table(names, rows) + '\n')
+
+
+def _column_list(value):
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Answer ad-hoc questions over every indexed run (see build_test_db.py).')
+    parser.add_argument('command', choices=['query', 'index'],
+                        help='query: print matching runs or test outcomes; index: bring the index up to date')
+    parser.add_argument('--db', default=os.getenv('RESULTS_DB', DEFAULT_DB_PATH), help='SQLite database path')
+    parser.add_argument('--update', action='store_true', help='query: ingest new or changed runs first')
+    parser.add_argument('--of', choices=['runs', 'tests'], default='runs',
+                        help='One row per run and suite (default), or per test outcome')
+    parser.add_argument('--category', choices=CATEGORIES)
+    parser.add_argument('--branch', help="Branch name or wildcard pattern, e.g. '1.2.*'")
+    parser.add_argument('--proposition', help="Proposition name or wildcard pattern, e.g. 'SCXI*'")
+    suite = parser.add_mutually_exclusive_group()
+    suite.add_argument('--suite', choices=sorted(RESPONSE_FILES))
+    suite.add_argument('--test-type', choices=sorted(TEST_TYPES.values()), help='Suite by its dashboard label')
+    parser.add_argument('--since', help='First run date, YYYYMMDD or YYYYMMDD_HHMMSS (inclusive)')
+    parser.add_argument('--until', help='Last run date, YYYYMMDD or YYYYMMDD_HHMMSS (inclusive)')
+    parser.add_argument('--latest', action='store_true', help='Only the newest matching run of each proposition and suite')
+    parser.add_argument('--test', help='--of tests: test_id or wildcard pattern')
+    parser.add_argument('--status', help='--of tests: only this status (Passed, Failed, Skipped, ...)')
+    parser.add_argument('--group-by', type=_column_list, metavar='COLS',
+                        help='Comma-separated columns to group by; --columns then picks the aggregates')
+    parser.add_argument('--columns', type=_column_list, metavar='COLS', help='Comma-separated output columns')
+    parser.add_argument('--sort', type=_column_list, metavar='COLS',
+                        help="Comma-separated output columns to sort by, NAME:desc for descending (default: newest run first)")
+    parser.add_argument('--limit', type=int, help='At most this many rows')
+    parser.add_argument('--format', choices=['table', 'json', 'csv'], default='table')
+    args = parser.parse_args()
+
+    if args.test_type:
+        args.suite = next(s for s, label in TEST_TYPES.items() if label == args.test_type)
+    for key in ('since', 'until'):
+        if getattr(args, key) and not _DATE_RE.match(getattr(args, key)):
+            parser.error(f"--{key} must be YYYYMMDD or YYYYMMDD_HHMMSS")
+    if args.of == 'runs' and (args.test or args.status):
+        parser.error('--test and --status need --of tests')
+    columns = TEST_COLUMNS if args.of == 'tests' else RUN_COLUMNS
+    aggregates = TEST_AGGREGATES if args.of == 'tests' else RUN_AGGREGATES
+    for name in args.group_by or ():
+        if name not in columns:
+            parser.error(f"unknown --group-by column {name!r} (choose from {', '.join(columns)})")
+    allowed = aggregates if args.group_by else columns
+    for name in args.columns or ():
+        if name not in allowed:
+            parser.error(f"unknown column {name!r} (choose from {', '.join(allowed)})")
+
+    if args.command == 'index' or args.update:
+        conn = connect(args.db)
+        ingested, skipped, removed = ingest(conn, WORKSPACE)
+        conn.close()
+        print(f"[INFO] Ingested {ingested} run(s), {skipped} unchanged, {removed} removed: {args.db}", file=sys.stderr)
+        if args.command == 'index':
+            return
+    if not os.path.isfile(args.db):
+        print(f"[ERROR] {args.db} does not exist; run 'appgw_results.py index' first", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        sql, params, names = build_query(args)
+    except ValueError as e:
+        parser.error(str(e))
+    start = time.perf_counter()
+    conn = sqlite3.connect(f'file:{args.db}?mode=ro', uri=True)
+    rows = conn.execute(sql, params).fetchall()
+    conn.close()
+    write_output(names, rows, args.format)
+    if args.format == 'table':
+        print(f"[INFO] {len(rows)} row(s) in {time.perf_counter() - start:.3f} s", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+import io
+import os
+import sys
+import argparse
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from report_engine import SUITES, render_run
+from results_layout import CATEGORIES, iter_run_dirs, stored_response_path
+from run_history import history_path, iter_records
+
+# WORKSPACE is the root of the repo (two directories up from .github/scripts/)
+WORKSPACE = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+# Suites with a published per-run page, summary.json entry and history
+SANITY_SUITES = [name for name, suite in SUITES.items() if 'sanity' in suite['outputs']]
+# Modules whose code ends up in every page; a change to any of them makes all pages stale
+TEMPLATE_MODULES = ('report_engine.py', 'json_stream.py', 'report_assets.py', 'report_index.py', 'report_details.py')
+
+
+def template_mtime_ns():
+    return max(os.stat(os.path.join(SCRIPTS_DIR, name)).st_mtime_ns for name in TEMPLATE_MODULES)
+
+
+def recorded_dates(web_result_dir, key):
+    """Run dates already in the proposition history under one summary key."""
+    path = history_path(web_result_dir)
+    if not os.path.isfile(path):
+        return set()
+    return {record.get('date') for _, record in iter_records(path) if record.get('key') == key}
+
+
+def collect_propositions(workspace, categories=None):
+    """Groups every response JSON (or delta) by proposition: {proposition_dir: {suite: [json_path, ...]}}.
+
+    Paths are relative to workspace and each list is ordered oldest run first.
+    """
+    propositions = {}
+    for category, branch, proposition, timestamp, run_dir in iter_run_dirs(workspace, categories):
+        suites = propositions.setdefault(os.path.join(category, branch, proposition), {})
+        for suite in SANITY_SUITES:
+            # Delta-encoded runs (run_delta.py) are read through their .delta.jsonl file
+            path = stored_response_path(run_dir, SUITES[suite]['response_file'])
+            if path:
+                suites.setdefault(suite, []).append(os.path.join(category, branch, proposition, timestamp,
+                                                                 os.path.basename(path)))
+    return propositions
+
+
+def build_proposition(proposition_dir, suites, force=False, quiet=False):
+    """Brings the reports of one proposition up to date; runs inside a worker process.
+
+    Runs missing from the history are recorded oldest first. The page and summary.json entry are
+    only re-rendered from the newest run, and only when they are older than that run or than the
+    templates (or force is set). Returns (proposition_dir, rendered, recorded, skipped, error).
+    """
+    rendered = recorded = skipped = 0
+    web_result_dir = os.path.join(proposition_dir, 'web_result')
+    out = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(out) if quiet else contextlib.nullcontext():
+            for suite, json_paths in suites.items():
+                dates = recorded_dates(web_result_dir, SUITES[suite]['summary_key'])
+                for json_path in json_paths[:-1]:
+                    if os.path.basename(os.path.dirname(json_path)) not in dates:
+                        render_run(suite, json_path, render=False)
+                        recorded += 1
+                latest = json_paths[-1]
+                report_path = os.path.join(web_result_dir, SUITES[suite]['sanity_page'])
+                up_to_date = (
+                    not force
+                    and os.path.basename(os.path.dirname(latest)) in dates
+                    and os.path.isfile(report_path)
+                    and os.stat(report_path).st_mtime_ns >= max(os.stat(latest).st_mtime_ns, template_mtime_ns()))
+                if up_to_date:
+                    skipped += 1
+                    continue
+                render_run(suite, latest)
+                rendered += 1
+    except Exception as e:
+        return proposition_dir, rendered, recorded, skipped, f"{type(e).__name__}: {e}"
+    return proposition_dir, rendered, recorded, skipped, None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Regenerate the Core/Badger sanity reports, summaries and histories of every run.')
+    parser.add_argument('roots', nargs='*', metavar='ROOT',
+                        help=f"Result roots to process ({', '.join(CATEGORIES)}); default: all")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Worker processes (default: CPU count; 1 runs everything in this process)')
+    parser.add_argument('--force', action='store_true', help='Re-render reports even if they are up to date')
+    parser.add_argument('--quiet', action='store_true', help='Only print per-proposition results')
+    args = parser.parse_args()
+    # Validated here rather than with choices=, which rejects an empty nargs='*' list on older Pythons
+    for root in args.roots:
+        if root.strip('/') not in CATEGORIES:
+            parser.error(f"unknown root {root!r} (choose from {', '.join(CATEGORIES)})")
+    args.roots = [root.strip('/') for root in args.roots]
+
+    # The generators derive category/branch/proposition from workspace-relative paths; workers inherit the cwd
+    os.chdir(WORKSPACE)
+    propositions = collect_propositions(WORKSPACE, args.roots or None)
+    print(f"[INFO] Found {len(propositions)} proposition(s) under {', '.join(args.roots or CATEGORIES)}")
+
+    totals = [0, 0, 0]
+    failures = []
+
+    def report(result):
+        proposition_dir, rendered, recorded, skipped, error = result
+        for i, n in enumerate((rendered, recorded, skipped)):
+            totals[i] += n
+        if error:
+            failures.append(proposition_dir)
+            print(f"[ERROR] {proposition_dir}: {error}")
+        elif not args.quiet or rendered or recorded:
+            print(f"[INFO] {proposition_dir}: {rendered} rendered, {recorded} recorded, {skipped} up to date")
+
+    if args.workers <= 1:
+        for proposition_dir, suites in propositions.items():
+            report(build_proposition(proposition_dir, suites, args.force, args.quiet))
+    else:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            futures = [pool.submit(build_proposition, proposition_dir, suites, args.force, args.quiet)
+                       for proposition_dir, suites in propositions.items()]
+            for future in as_completed(futures):
+                report(future.result())
+
+    print(f"[SUCCESS] {totals[0]} report(s) rendered, {totals[1]} older run(s) recorded, {totals[2]} up to date"
+          + (f", {len(failures)} proposition(s) failed" if failures else ''))
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1 @@
+# Benchmarks of the pipeline scripts against synthetic results trees (see run_benchmarks.py)
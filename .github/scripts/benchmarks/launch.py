@@ -0,0 +1,41 @@
+import os
+import sys
+import json
+import atexit
+import runpy
+import resource
+
+# python launch.py <peak_out.json> <script.py> [args...]
+# Runs the script as __main__ and records its peak RSS when the interpreter exits. A child's
+# ru_maxrss starts at the parent's RSS at fork time; VmHWM belongs to the exec'd process alone.
+
+
+def peak_rss_kb():
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    # No procfs (macOS): fall back to ru_maxrss, which is in bytes there
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def _record(path):
+    with open(path, 'w') as f:
+        json.dump({'max_rss_kb': peak_rss_kb()}, f)
+
+
+def main():
+    out_path, script = sys.argv[1], os.path.abspath(sys.argv[2])
+    sys.argv = sys.argv[2:]
+    # As if the script had been started directly: its directory first on sys.path
+    sys.path[0] = os.path.dirname(script)
+    atexit.register(_record, out_path)
+    runpy.run_path(script, run_name='__main__')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+import os
+import sys
+import json
+import time
+import argparse
+import contextlib
+import tracemalloc
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+
+import generate_index
+import fb_coreSDK_schema_validation_regression_result as regression
+from build_test_db import connect, ingest
+from flaky_tests import find_flaky, flaky_for, load_outcomes
+from json_stream import load_response
+from regression_diff import compare_runs, fingerprint_tests
+from report_engine import SUITES, SanityPage, SchemaPage, parse_version_txt
+from report_index import TestIndex
+from results_layout import stored_response_path
+from run_index import WORKSPACE, RunIndex
+
+# Runs inside a synthetic tree's copy of the scripts (see run_benchmarks.py), one process per
+# benchmark, and calls the same functions as the script's main() one phase at a time.
+
+
+class PhaseTimer:
+    """Wall time and peak traced Python allocation of consecutive phases.
+
+    tracemalloc slows allocation-heavy code down, so phase times add up to more than the
+    untraced end-to-end run; compare them with phase times of other runs only.
+    """
+
+    def __init__(self):
+        self.phases = {}
+        tracemalloc.start()
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        yield
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        self.phases[name] = {'wall_s': round(elapsed, 4), 'peak_kb': max(0, peak - before) // 1024}
+
+
+def bench_targets(workspace=WORKSPACE):
+    """(run, base_run): the newest develop run and the release run regression pages compare it against."""
+    index = RunIndex.scan(workspace)
+    develop = [run for run in index.by_branch if run[0] == 'develop']
+    run = max(develop, key=lambda r: r[3])
+    return run, index.release_baseline(run, SUITES['CoreSDKRegression']['response_file'])
+
+
+def phases_generate_index(timer):
+    with timer.phase('scan summaries'):
+        manifest = {'version': generate_index.MANIFEST_VERSION, 'summaries': {}, 'tabs': {}}
+        generate_index.refresh_manifest(manifest)
+    with timer.phase('run index'):
+        generate_index.update_run_index()
+    with timer.phase('load records'):
+        store = generate_index.ReportStore.from_manifest(manifest)
+    with timer.phase('dataset'):
+        dataset_json = generate_index.build_reports_dataset(store)
+    tab_inputs = {
+        'propositions': store.propositions,
+        'test_types': store.test_types,
+        'data_version': str(len(dataset_json)),
+    }
+    with timer.phase('summary tab'):
+        generate_index.build_summary_tab(store)
+    with timer.phase('search tab'):
+        generate_index.build_search_tab(tab_inputs)
+    with timer.phase('graphs tab'):
+        generate_index.build_graphs_tab(tab_inputs)
+
+
+def phases_report_engine(timer):
+    run, _ = bench_targets()
+    suite = SUITES['CoreSanity']
+    run_dir = os.path.join(*run)
+    json_path = stored_response_path(run_dir, suite['response_file'])
+    with timer.phase('parse'):
+        meta, tests = load_response(json_path)
+        tests = list(tests)
+    with timer.phase('index'):
+        index = TestIndex()
+        for test in tests:
+            index.add(test)
+    with timer.phase('sanity page'):
+        page = SanityPage(suite, json_path, parse_version_txt(os.path.join(run_dir, 'version.txt'), run[3]), index,
+                          flaky_for(run, 'CoreSanity'))
+        for test in tests:
+            page.add(test)
+        page.close(meta)
+    with timer.phase('schema page'):
+        page = SchemaPage(suite, 'bench_schema', run[3], index)
+        for test in tests:
+            page.add(test)
+        page.close(meta)
+
+
+def phases_regression(timer):
+    run, base_run = bench_targets()
+    response_file = SUITES['CoreSDKRegression']['response_file']
+    with timer.phase('load base'):
+        _, base_tests = load_response(stored_response_path(os.path.join(*base_run), response_file))
+        base_tests = list(base_tests)
+    with timer.phase('fingerprint base'):
+        base_prints = fingerprint_tests(base_tests)
+    with timer.phase('load current'):
+        _, tests = load_response(stored_response_path(os.path.join(*run), response_file))
+        tests = list(tests)
+    with timer.phase('fingerprint current'):
+        prints = fingerprint_tests(tests)
+    with timer.phase('compare'):
+        comparison = compare_runs(base_prints, prints)
+    with timer.phase('write page'):
+        regression.write_comparison_report(comparison, os.path.join(*run), os.path.join(*base_run),
+                                           SUITES['CoreSDKRegression']['regression_page'], flaky_for(run))
+
+
+def phases_flaky_tests(timer):
+    with timer.phase('ingest'):
+        conn = connect(os.path.join(WORKSPACE, 'bench_phases.sqlite'))
+        ingest(conn, WORKSPACE, full=True)
+    with timer.phase('load outcomes'):
+        series = load_outcomes(conn)
+    with timer.phase('find flaky'):
+        find_flaky(series)
+    conn.close()
+
+
+PHASES = {
+    'generate_index': phases_generate_index,
+    'report_engine': phases_report_engine,
+    'regression': phases_regression,
+    'flaky_tests': phases_flaky_tests,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time the phases of one pipeline script inside a synthetic tree.')
+    parser.add_argument('benchmark', choices=sorted(PHASES))
+    parser.add_argument('--out', required=True, help='JSON file to write {phase: {wall_s, peak_kb}} to')
+    args = parser.parse_args()
+
+    os.chdir(WORKSPACE)
+    timer = PhaseTimer()
+    # The scripts' own progress lines are not part of the result
+    with contextlib.redirect_stdout(sys.stderr):
+        PHASES[args.benchmark](timer)
+    with open(args.out, 'w') as f:
+        json.dump(timer.phases, f, indent=1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,226 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import datetime
+import tempfile
+import subprocess
+
+import synth_tree
+from phases import PHASES, bench_targets
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(BENCH_DIR, 'baseline.json')
+DEFAULT_RESULTS = 'benchmark_results.json'
+RESULTS_VERSION = 1
+# A metric regresses when it grows by more than the tolerance and by more than the noise floor
+DEFAULT_TOLERANCE = 0.25
+NOISE_FLOOR = {'wall_s': 0.05, 'cpu_s': 0.05, 'max_rss_kb': 2048, 'peak_kb': 1024}
+
+# Every benchmark runs its script end to end in the synthetic tree, in this order (later scripts use
+# what earlier ones wrote: the database, the rendered pages). {proposition}, {timestamp}, {base_run} and {workers} are
+# filled in per tree; reset lists workspace files removed before each repetition so it does the full work.
+BENCHMARKS = {
+    'build_test_db': {'argv': ['build_test_db.py', '--full']},
+    'flaky_tests': {'argv': ['flaky_tests.py']},
+    'batch_reports': {'argv': ['batch_reports.py', '--force', '--quiet', '--workers', '{workers}']},
+    'report_engine': {'argv': ['report_engine.py', '{proposition}', '--run', '{timestamp}', '--schema-dir', 'bench_schema', '--no-index']},
+    'regression': {'argv': ['report_engine.py', '{proposition}', '--run', '{timestamp}', '--suite', 'CoreSDKRegression',
+                            '--regression-base', '{base_run}', '--no-index']},
+    'regression_matrix': {'argv': ['regression_matrix.py', '{base_run}', '--workers', '{workers}']},
+    'generate_index': {'argv': ['generate_index.py', '--full']},
+    'compress_site': {'argv': ['compress_site.py'], 'reset': ['tabs/compress_manifest.json']},
+}
+
+
+def run_script(tree, argv, log_path):
+    """Runs one script of the tree's copy end to end; returns wall/CPU seconds, peak RSS and exit code."""
+    peak_path = os.path.join(tree, 'bench_peak.json')
+    if os.path.isfile(peak_path):
+        os.remove(peak_path)
+    with open(log_path, 'a') as log:
+        start = time.perf_counter()
+        proc = subprocess.Popen([sys.executable, os.path.join(BENCH_DIR, 'launch.py'), peak_path,
+                                 os.path.join(tree, '.github', 'scripts', argv[0]), *argv[1:]],
+                                cwd=tree, stdout=log, stderr=subprocess.STDOUT)
+        # wait4 reports the CPU time of this child (and the workers it waited for)
+        _, status, usage = os.wait4(proc.pid, 0)
+        wall = time.perf_counter() - start
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    try:
+        with open(peak_path) as f:
+            max_rss_kb = json.load(f)['max_rss_kb']
+    except (OSError, ValueError):
+        max_rss_kb = usage.ru_maxrss
+    return {'wall_s': round(wall, 4), 'cpu_s': round(usage.ru_utime + usage.ru_stime, 4),
+            'max_rss_kb': max_rss_kb, 'exit_code': proc.returncode}
+
+
+def run_phases(tree, name, log_path):
+    out_path = os.path.join(tree, f'bench_phases_{name}.json')
+    with open(log_path, 'a') as log:
+        code = subprocess.call([sys.executable, os.path.join(tree, '.github', 'scripts', 'benchmarks', 'phases.py'), name,
+                                '--out', out_path], cwd=tree, stdout=log, stderr=subprocess.STDOUT)
+    if code:
+        return None
+    with open(out_path) as f:
+        return json.load(f)
+
+
+def _best(samples):
+    """Lowest time and highest memory over the repetitions."""
+    best = dict(samples[0])
+    for sample in samples[1:]:
+        for key, value in sample.items():
+            if key.endswith('_kb'):
+                best[key] = max(best[key], value)
+            elif key.endswith('_s'):
+                best[key] = min(best[key], value)
+            else:
+                best[key] = best[key] or value
+    return best
+
+
+def run_benchmarks(tree, names, repeat=1, workers=1):
+    """{name: {wall_s, cpu_s, max_rss_kb, exit_code, phases}} for every selected benchmark."""
+    run, base_run = bench_targets(tree)
+    fields = {'proposition': os.path.join(*run[:3]), 'timestamp': run[3], 'base_run': os.path.join(*base_run),
+              'workers': str(workers)}
+    log_dir = os.path.join(tree, 'bench_logs')
+    os.makedirs(log_dir, exist_ok=True)
+    results = {}
+    for name, bench in BENCHMARKS.items():
+        if names and name not in names:
+            continue
+        argv = [arg.format(**fields) for arg in bench['argv']]
+        log_path = os.path.join(log_dir, f'{name}.log')
+        samples = []
+        phase_samples = {}
+        for _ in range(repeat):
+            for rel_path in bench.get('reset', ()):
+                if os.path.isfile(os.path.join(tree, rel_path)):
+                    os.remove(os.path.join(tree, rel_path))
+            samples.append(run_script(tree, argv, log_path))
+            phases = run_phases(tree, name, log_path) if name in PHASES else None
+            for phase, sample in (phases or {}).items():
+                phase_samples.setdefault(phase, []).append(sample)
+        result = _best(samples)
+        if phase_samples:
+            result['phases'] = {phase: _best(s) for phase, s in phase_samples.items()}
+        results[name] = result
+        status = 'ok' if not result['exit_code'] else f"exit code {result['exit_code']}, see {log_path}"
+        print(f"[INFO] {name:<18} {result['wall_s']:8.3f} s wall {result['cpu_s']:8.3f} s CPU "
+              f"{result['max_rss_kb'] / 1024:8.1f} MB peak RSS  ({status})")
+        for phase, sample in result.get('phases', {}).items():
+            print(f"[INFO]   {phase:<22} {sample['wall_s']:8.3f} s {sample['peak_kb'] / 1024:8.1f} MB traced peak")
+    return results
+
+
+def _metrics(results):
+    """{(benchmark, phase or '', metric): value} of a results file."""
+    out = {}
+    for name, result in results.items():
+        for metric in ('wall_s', 'cpu_s', 'max_rss_kb'):
+            out[(name, '', metric)] = result[metric]
+        for phase, sample in result.get('phases', {}).items():
+            for metric in ('wall_s', 'peak_kb'):
+                out[(name, phase, metric)] = sample[metric]
+    return out
+
+
+def compare(current, baseline, tolerance=DEFAULT_TOLERANCE):
+    """(regressions, improvements): lists of (benchmark, phase, metric, baseline, current) beyond the tolerance."""
+    regressions, improvements = [], []
+    base = _metrics(baseline['benchmarks'])
+    for key, value in sorted(_metrics(current['benchmarks']).items()):
+        if key not in base:
+            continue
+        before = base[key]
+        floor = NOISE_FLOOR[key[2]]
+        if value > before * (1 + tolerance) and value - before > floor:
+            regressions.append((*key, before, value))
+        elif value < before / (1 + tolerance) and before - value > floor:
+            improvements.append((*key, before, value))
+    return regressions, improvements
+
+
+def _describe(entry):
+    name, phase, metric, before, value = entry
+    change = f"{100 * (value - before) / before:+.0f}%" if before else 'new'
+    return f"{name}{'/' + phase if phase else ''} {metric}: {before} -> {value} ({change})"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time and memory-profile the pipeline scripts on a synthetic results tree '
+                                                 'and compare the numbers with a stored baseline.')
+    synth_tree.add_tree_arguments(parser)
+    parser.add_argument('--tree', help='Reuse (or create) the synthetic tree here instead of a temporary directory')
+    parser.add_argument('--keep', action='store_true', help='Do not delete the temporary tree afterwards')
+    parser.add_argument('--only', action='append', choices=list(BENCHMARKS), help='Run only this benchmark (repeatable)')
+    parser.add_argument('--repeat', type=int, default=1, help='Repetitions per benchmark; the best time is kept (default: 1)')
+    parser.add_argument('--workers', type=int, default=1, help='--workers passed to the parallel scripts (default: 1)')
+    parser.add_argument('--out', default=DEFAULT_RESULTS, help=f'Results JSON (default: {DEFAULT_RESULTS})')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='Baseline results to compare against (default: benchmarks/baseline.json)')
+    parser.add_argument('--save-baseline', action='store_true', help='Also store the results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help=f'Allowed growth before a metric counts as a regression (default: {DEFAULT_TOLERANCE})')
+    args = parser.parse_args()
+
+    params = synth_tree.params_from_args(args)
+    tree = os.path.abspath(args.tree) if args.tree else tempfile.mkdtemp(prefix='appgw_bench_')
+    try:
+        if not os.path.isdir(os.path.join(tree, 'develop')):
+            start = time.perf_counter()
+            stats = synth_tree.generate_tree(tree, **params)
+            print(f"[INFO] Generated {stats['runs']} run(s), {stats['files']} response file(s), "
+                  f"{stats['bytes'] / 1024 / 1024:.1f} MB in {time.perf_counter() - start:.1f} s: {tree}")
+        else:
+            print(f"[INFO] Reusing the tree in {tree}; tree options are ignored")
+            params = None
+        # Always benchmark the current scripts
+        synth_tree.install_scripts(tree)
+        results = {
+            'version': RESULTS_VERSION,
+            'created': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'machine': f"{platform.system()} {platform.machine()}, {os.cpu_count()} CPU(s)",
+            'tree': params,
+            'benchmarks': run_benchmarks(tree, args.only, args.repeat, args.workers),
+        }
+    finally:
+        if not args.tree and not args.keep:
+            shutil.rmtree(tree, ignore_errors=True)
+
+    with open(args.out, 'w') as f:
+        json.dump(results, f, indent=1)
+    print(f"[SUCCESS] Wrote benchmark results: {args.out}")
+    failed = [name for name, result in results['benchmarks'].items() if result['exit_code']]
+    if failed:
+        print(f"[ERROR] Failed benchmark(s): {', '.join(failed)}")
+
+    regressions = []
+    if os.path.isfile(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get('tree') != results['tree']:
+            print(f"[WARN] The baseline was measured on a different tree ({baseline.get('tree')}); compare with care")
+        regressions, improvements = compare(results, baseline, args.tolerance)
+        for entry in improvements:
+            print(f"[INFO] Faster/smaller: {_describe(entry)}")
+        for entry in regressions:
+            print(f"[WARN] Regression: {_describe(entry)}")
+        print(f"[INFO] {len(regressions)} regression(s), {len(improvements)} improvement(s) against {args.baseline}")
+    elif args.save_baseline:
+        shutil.copyfile(args.out, args.baseline)
+        print(f"[SUCCESS] Saved baseline: {args.baseline}")
+    else:
+        print(f"[INFO] No baseline at {args.baseline}; run with --save-baseline to store one")
+    if failed or regressions:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
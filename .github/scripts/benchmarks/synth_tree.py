@@ -0,0 +1,198 @@
+import io
+import os
+import sys
+import json
+import random
+import shutil
+import argparse
+import contextlib
+import datetime
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+
+import report_assets
+from report_engine import SUITES, summary_entry
+
+# Tree sizes: branches per category, propositions per branch, runs per proposition, tests per response file
+PRESETS = {
+    'small': {'branches': 2, 'propositions': 2, 'runs': 3, 'tests': 50},
+    'medium': {'branches': 3, 'propositions': 2, 'runs': 5, 'tests': 200},
+    'large': {'branches': 6, 'propositions': 4, 'runs': 10, 'tests': 500},
+}
+DEFAULT_PRESET = 'medium'
+DEFAULT_STEPS = 3
+# Approximate serialized size of one step response; real Firebolt responses range from a few bytes to several KB
+DEFAULT_PAYLOAD_BYTES = 400
+MODULES = ['Device', 'Accessibility', 'Localization', 'Lifecycle', 'Advertising', 'Discovery', 'Parameters',
+           'SecondScreen', 'Metrics', 'Authentication']
+PROPOSITIONS = ['SCXI11BEI', 'SKXI11ADS', 'SKTL11AEI', 'SCXI11AIC', 'XIONE11UK', 'SKXI11ANS']
+FIRST_RUN = datetime.datetime(2026, 1, 5, 9, 0, 0)
+
+# How a test behaves across runs: (share of tests, probability of failing in a run); the rest is skipped
+PROFILES = [(0.75, 0.02), (0.08, 0.95), (0.12, 0.5)]
+
+
+def _profile(r):
+    x = r.random()
+    for share, fail_rate in PROFILES:
+        if x < share:
+            return fail_rate
+        x -= share
+    return None
+
+
+def _result_payload(test_no, step_no, payload_bytes, drift):
+    items = [{'id': i, 'name': f'item-{test_no}-{i}', 'enabled': (i + drift) % 3 != 0}
+             for i in range(max(1, payload_bytes // 48))]
+    return {'value': (test_no * 7 + step_no + drift) % 5, 'version': {'major': 1, 'minor': drift % 4, 'patch': 0},
+            'items': items}
+
+
+def make_response(suite_name, tests, r, fail_rates, steps=DEFAULT_STEPS, payload_bytes=DEFAULT_PAYLOAD_BYTES, drift=0):
+    """One response JSON: tests with Passed/Failed/Skipped outcomes drawn from their profile.
+
+    drift changes a few payload values from run to run, as real runs do.
+    """
+    results = []
+    for i in range(tests):
+        module = MODULES[i % len(MODULES)]
+        fail_rate = fail_rates[i]
+        if fail_rate is None:
+            status = 'Skipped'
+        else:
+            status = 'Failed' if r.random() < fail_rate else 'Passed'
+        test_steps = []
+        for s in range(1 + i % steps):
+            test_drift = drift if (i + s) % 11 == 0 else 0
+            step = {
+                'step_id': f'step_{s}',
+                'description': f'Call {module}.method{i % 37} and validate the result against the schema',
+                'status': status,
+                'request': {'jsonrpc': '2.0', 'id': s + 1, 'method': f'{module.lower()}.method{i % 37}',
+                            'params': {'options': {'index': s, 'locale': 'en-US'}}},
+                'response': {'jsonrpc': '2.0', 'id': s + 1, 'result': _result_payload(i, s, payload_bytes, test_drift)},
+                'error': None,
+            }
+            if status == 'Failed' and s == 0:
+                step['error'] = (f"Schema validation failed: data.items[{i % 5}].enabled should be boolean "
+                                 f"(got {'null' if i % 2 else 'string'})")
+            if i % 4 == 0:
+                step['examples'] = [{'expected_result': {'value': (i * 7 + s) % 5}}]
+            test_steps.append(step)
+        results.append({'test_id': f'{module}_{i:04d}', 'test_name': f'{module} method{i % 37} case {i}',
+                        'status': status, 'duration_ms': 20 + r.randrange(400) * len(test_steps), 'steps': test_steps})
+    counts = {status: sum(1 for t in results if t['status'] == status) for status in ('Passed', 'Failed', 'Skipped')}
+    return {'suite_name': suite_name, 'total_tests': tests, 'passed': counts['Passed'], 'failed': counts['Failed'],
+            'skipped': counts['Skipped'], 'duration_ms': sum(t['duration_ms'] for t in results), 'test_results': results}
+
+
+def generate_tree(root, branches, propositions, runs, tests, steps=DEFAULT_STEPS, payload_bytes=DEFAULT_PAYLOAD_BYTES, seed=1):
+    """Writes develop/ and release/ trees of runs (response JSONs, version.txt) plus each proposition's
+    summary.json for its latest run. Returns {'runs', 'files', 'bytes'}."""
+    stats = {'runs': 0, 'files': 0, 'bytes': 0}
+    branch_names = {
+        'develop': [f'RDKEMW-{2000 + 13 * b}' for b in range(branches)],
+        'release': [f'8.{b // 3}.{b % 3}.0' for b in range(branches)],
+    }
+    for c, (category, names) in enumerate(branch_names.items()):
+        for b, branch in enumerate(names):
+            for p, proposition in enumerate((PROPOSITIONS * (propositions // len(PROPOSITIONS) + 1))[:propositions]):
+                proposition_dir = os.path.join(root, category, branch, f'{proposition}{p // len(PROPOSITIONS) or ""}')
+                r = random.Random(f'{seed}/{category}/{branch}/{p}')
+                fail_rates = {name: [_profile(r) for _ in range(tests)] for name in SUITES}
+                latest = {}
+                for run in range(runs):
+                    started = FIRST_RUN + datetime.timedelta(days=run * 2 + b, hours=c * 5 + p, minutes=7 * run)
+                    timestamp = started.strftime('%Y%m%d_%H%M%S')
+                    run_dir = os.path.join(proposition_dir, timestamp)
+                    os.makedirs(run_dir, exist_ok=True)
+                    with open(os.path.join(run_dir, 'version.txt'), 'w') as f:
+                        f.write(f"imagename:{proposition}_MIDDLEWARE_DEV_{category}_{timestamp}\n"
+                                f"MIDDLEWARE_VERSION=8.{b}.{run}\nFW_CLASS={category[:3]}\nAPPGATEWAY_VERSION={branch}\n")
+                    for suite_name, suite in SUITES.items():
+                        response = make_response(suite_name, tests, r, fail_rates[suite_name], steps, payload_bytes, drift=run)
+                        path = os.path.join(run_dir, suite['response_file'])
+                        with open(path, 'w') as f:
+                            json.dump(response, f)
+                        stats['files'] += 1
+                        stats['bytes'] += os.path.getsize(path)
+                        if 'sanity' in suite['outputs']:
+                            latest[suite['summary_key']] = (path, response)
+                    stats['runs'] += 1
+                # summary.json as report_engine writes it for the latest run
+                summary = {}
+                for key, (path, response) in latest.items():
+                    platform = {'imagename': f'{proposition}_MIDDLEWARE_DEV_{category}', 'MIDDLEWARE_VERSION': f'8.{b}',
+                                'test_date': os.path.basename(os.path.dirname(path))}
+                    meta = {k: v for k, v in response.items() if k != 'test_results'}
+                    summary[key] = summary_entry(os.path.relpath(path, root), platform, meta, len(response['test_results']))
+                web_result_dir = os.path.join(proposition_dir, 'web_result')
+                os.makedirs(web_result_dir, exist_ok=True)
+                with open(os.path.join(web_result_dir, 'summary.json'), 'w') as f:
+                    json.dump(summary, f, indent=2)
+    return stats
+
+
+def install_scripts(root):
+    """Copies .github/scripts into root, so the scripts (which locate the workspace from their own path)
+    run against the synthetic tree. Copies rather than symlinks: Python resolves a symlinked script's
+    directory for sys.path[0], and the sibling imports would then see the real repo."""
+    target = os.path.join(root, '.github', 'scripts')
+    if os.path.isdir(target):
+        shutil.rmtree(target)
+    shutil.copytree(SCRIPTS_DIR, target, ignore=shutil.ignore_patterns('__pycache__', '*.pyc'))
+    # The pages are never opened in a browser here, so libraries that are not vendored yet get pinned placeholders
+    vendor_dir = os.path.join(target, os.path.basename(report_assets.VENDOR_DIR))
+    os.makedirs(vendor_dir, exist_ok=True)
+    for lib, (file_name, _) in report_assets.VENDOR_LIBS.items():
+        path = os.path.join(vendor_dir, file_name)
+        if not os.path.isfile(path):
+            with open(path, 'w') as f:
+                f.write(f'/* {lib} placeholder */\n')
+    with contextlib.redirect_stdout(io.StringIO()):
+        report_assets.vendor_libs(vendor_dir, pin=True)
+    return target
+
+
+def tree_params(preset=DEFAULT_PRESET, **overrides):
+    params = dict(PRESETS[preset], steps=DEFAULT_STEPS, payload_bytes=DEFAULT_PAYLOAD_BYTES, seed=1)
+    params.update({k: v for k, v in overrides.items() if v is not None})
+    return params
+
+
+def add_tree_arguments(parser):
+    parser.add_argument('--size', choices=sorted(PRESETS), default=DEFAULT_PRESET,
+                        help=f'Tree size preset (default: {DEFAULT_PRESET}); the options below override it')
+    parser.add_argument('--branches', type=int, help='Branches per category')
+    parser.add_argument('--propositions', type=int, help='Propositions per branch')
+    parser.add_argument('--runs', type=int, help='Runs per proposition')
+    parser.add_argument('--tests', type=int, help='Tests per response file')
+    parser.add_argument('--steps', type=int, help=f'Maximum steps per test (default: {DEFAULT_STEPS})')
+    parser.add_argument('--payload-bytes', type=int, help=f'Approximate size of one step response (default: {DEFAULT_PAYLOAD_BYTES})')
+    parser.add_argument('--seed', type=int, help='Random seed (default: 1)')
+
+
+def params_from_args(args):
+    return tree_params(args.size, branches=args.branches, propositions=args.propositions, runs=args.runs, tests=args.tests,
+                       steps=args.steps, payload_bytes=args.payload_bytes, seed=args.seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write a synthetic develop/release results tree for benchmarking.')
+    parser.add_argument('out_dir', metavar='OUT_DIR', help='Directory to create the tree in (must not exist)')
+    parser.add_argument('--with-scripts', action='store_true', help='Also copy .github/scripts into the tree')
+    add_tree_arguments(parser)
+    args = parser.parse_args()
+    if os.path.exists(args.out_dir):
+        print(f"[ERROR] {args.out_dir} already exists")
+        sys.exit(1)
+    params = params_from_args(args)
+    stats = generate_tree(args.out_dir, **params)
+    if args.with_scripts:
+        install_scripts(args.out_dir)
+    print(f"[SUCCESS] Wrote {stats['runs']} run(s), {stats['files']} response file(s) ({stats['bytes']} bytes): {args.out_dir}")
+
+
+if __name__ == '__main__':
+    main()
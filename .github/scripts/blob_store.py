@@ -0,0 +1,176 @@
+import os
+import sys
+import json
+import hashlib
+import argparse
+
+from json_stream import (BLOB_DIR, BLOB_FIELDS, BLOB_REF_KEY, WORKSPACE, ObjectWriter, blob_path, load_response)
+from results_layout import CATEGORIES, DELTA_SUFFIX, iter_run_dirs
+from run_delta import read_delta
+
+# Payloads shorter than this (serialized) stay inline; a reference would not be much smaller
+MIN_BLOB_BYTES = 64
+RESPONSE_SUFFIX = '_response.json'
+# Delta-encoded runs (run_delta.py) keep the blob references of their added and changed tests
+DELTA_RESPONSE_SUFFIX = '_response' + DELTA_SUFFIX
+
+
+def _serialize(value):
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False)
+
+
+class BlobStore:
+    """Content-addressed store of step payloads shared by every packed response file.
+
+    A payload is stored once under the blake2b hash of its compact JSON; packed files keep
+    {"$blob": <digest>} in its place. Blobs are never modified, so any number of runs (and git)
+    can share them.
+    """
+
+    def __init__(self, blob_dir=BLOB_DIR):
+        self.blob_dir = blob_dir
+        self.known = set()
+        self.written = 0
+        self.written_bytes = 0
+
+    def put(self, value, data=None):
+        """Stores value (if new) and returns its reference; data is its compact JSON if already serialized."""
+        data = (data if data is not None else _serialize(value)).encode('utf-8')
+        digest = hashlib.blake2b(data, digest_size=20).hexdigest()
+        if digest not in self.known:
+            path = blob_path(digest, self.blob_dir)
+            if not os.path.isfile(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = path + '.tmp'
+                with open(tmp_path, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+                self.written += 1
+                self.written_bytes += len(data)
+            self.known.add(digest)
+        return {BLOB_REF_KEY: digest}
+
+    def pack_test(self, test):
+        """Replaces the large step payloads of a test with references; returns the test."""
+        for step in test.get('steps') or ():
+            for field in BLOB_FIELDS:
+                value = step.get(field)
+                if value is None or (type(value) is dict and BLOB_REF_KEY in value):
+                    continue
+                data = _serialize(value)
+                if len(data) >= MIN_BLOB_BYTES:
+                    step[field] = self.put(value, data)
+        return test
+
+
+def rewrite_response(path, transform):
+    """Streams a response file through transform(test) into a temporary file and swaps it in."""
+    tmp_path = path + '.tmp'
+    meta, tests = load_response(path)
+    with open(tmp_path, 'w') as f:
+        writer = ObjectWriter(f)
+        for test in tests:
+            writer.add(transform(test))
+        writer.close(meta)
+    os.replace(tmp_path, path)
+
+
+def iter_response_paths(paths, workspace=WORKSPACE, suffixes=(RESPONSE_SUFFIX,)):
+    """Response files given directly, found under the given directories, or (no paths) in every run.
+
+    Directories and runs are searched for file names ending in one of suffixes.
+    """
+    if not paths:
+        for *_, run_dir in iter_run_dirs(workspace, CATEGORIES):
+            with os.scandir(run_dir) as it:
+                for entry in sorted(it, key=lambda e: e.name):
+                    if entry.name.endswith(suffixes):
+                        yield entry.path
+        return
+    for path in paths:
+        if os.path.isfile(path):
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs[:] = sorted(d for d in dirs if not d.startswith('.') and d != 'web_result')
+            for name in sorted(files):
+                if name.endswith(suffixes):
+                    yield os.path.join(root, name)
+
+
+def _add_step_refs(steps, digests):
+    for step in steps or ():
+        for field in BLOB_FIELDS:
+            value = step.get(field)
+            if type(value) is dict and BLOB_REF_KEY in value:
+                digests.add(value[BLOB_REF_KEY])
+
+
+def referenced_blobs(paths, workspace=WORKSPACE):
+    """Digests referenced by the given response and delta files (every run without paths).
+
+    A delta entry is either an added test or a patch whose "steps" replace the base test's.
+    """
+    digests = set()
+    for path in iter_response_paths(paths, workspace, (RESPONSE_SUFFIX, DELTA_RESPONSE_SUFFIX)):
+        if path.endswith(DELTA_SUFFIX):
+            _, entries = read_delta(path)
+            for entry in entries:
+                _add_step_refs(entry.get('$patch', entry).get('steps'), digests)
+            continue
+        _, tests = load_response(path, resolve=False)
+        for test in tests:
+            _add_step_refs(test.get('steps'), digests)
+    return digests
+
+
+def collect_garbage(blob_dir=BLOB_DIR, workspace=WORKSPACE):
+    """Deletes the blobs no response or delta file in the workspace refers to; returns (removed, kept)."""
+    used = referenced_blobs(None, workspace)
+    removed = kept = 0
+    for root, _, files in os.walk(blob_dir):
+        for name in files:
+            digest = os.path.basename(root) + name[:-len('.json')]
+            if name.endswith('.json') and digest not in used:
+                os.remove(os.path.join(root, name))
+                removed += 1
+            else:
+                kept += 1
+    return removed, kept
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Move step payloads of response files into the shared content-addressed blob store (or back).')
+    parser.add_argument('command', choices=['pack', 'unpack', 'gc'],
+                        help='pack: replace payloads with blob references; unpack: inline them again; '
+                             'gc: delete blobs no response or delta file refers to')
+    parser.add_argument('paths', nargs='*', metavar='PATH',
+                        help='Response files or directories to (un)pack (default: every run in the workspace)')
+    args = parser.parse_args()
+
+    if args.command == 'gc':
+        if args.paths:
+            parser.error('gc always scans the whole workspace')
+        removed, kept = collect_garbage()
+        print(f"[SUCCESS] Removed {removed} unreferenced blob(s), kept {kept}: {BLOB_DIR}")
+        return
+
+    store = BlobStore()
+    transform = store.pack_test if args.command == 'pack' else (lambda test: test)
+    files = before = after = 0
+    for path in iter_response_paths(args.paths):
+        size = os.path.getsize(path)
+        try:
+            rewrite_response(path, transform)
+        except Exception as e:
+            print(f"[ERROR] Could not {args.command} {path}: {e}")
+            sys.exit(1)
+        files += 1
+        before += size
+        after += os.path.getsize(path)
+    print(f"[SUCCESS] {args.command.capitalize()}ed {files} response file(s): {before} -> {after} bytes"
+          + (f", {store.written} new blob(s) ({store.written_bytes} bytes) in {BLOB_DIR}" if args.command == 'pack' else ''))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,166 @@
+import os
+import sqlite3
+import argparse
+
+from json_stream import load_response
+from results_layout import CATEGORIES, RESPONSE_FILES, iter_response_files
+
+# WORKSPACE is the root of the repo (two directories up from .github/scripts/)
+WORKSPACE = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Local, rebuildable database of per-test outcomes (not committed, see .gitignore)
+DEFAULT_DB_PATH = os.path.join(WORKSPACE, 'results_index.sqlite')
+PASS_STATUSES = ('Passed', 'Success')
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    suite TEXT NOT NULL,
+    category TEXT NOT NULL,
+    branch TEXT NOT NULL,
+    proposition TEXT NOT NULL,
+    run_ts TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    total INTEGER,
+    passed INTEGER,
+    failed INTEGER,
+    skipped INTEGER,
+    duration_ms INTEGER
+);
+CREATE TABLE IF NOT EXISTS test_results (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    test_id TEXT NOT NULL,
+    test_name TEXT,
+    status TEXT,
+    duration_ms INTEGER,
+    PRIMARY KEY (run_id, test_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_test_results_test_id ON test_results(test_id, run_id);
+CREATE INDEX IF NOT EXISTS idx_runs_branch ON runs(branch, proposition, run_ts);
+CREATE INDEX IF NOT EXISTS idx_runs_proposition ON runs(proposition, run_ts);
+CREATE INDEX IF NOT EXISTS idx_runs_run_ts ON runs(run_ts, id);
+'''
+
+
+def connect(db_path=DEFAULT_DB_PATH):
+    conn = sqlite3.connect(db_path)
+    conn.execute('PRAGMA foreign_keys = ON')
+    conn.execute('PRAGMA journal_mode = WAL')
+    conn.execute('PRAGMA synchronous = NORMAL')
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def ingest_run(conn, rel_path, run, st):
+    """(Re)inserts one response JSON as a runs row plus one test_results row per test."""
+    category, branch, proposition, timestamp, suite, path = run
+    # Only statuses and durations are indexed, so packed step payloads are left unresolved
+    meta, tests = load_response(path, resolve=False)
+    conn.execute('DELETE FROM runs WHERE path = ?', (rel_path,))
+    cur = conn.execute(
+        'INSERT INTO runs (path, suite, category, branch, proposition, run_ts, mtime_ns, size) '
+        'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+        (rel_path, suite, category, branch, proposition, timestamp, st.st_mtime_ns, st.st_size))
+    run_id = cur.lastrowid
+    # Tests are streamed for large files; the run totals are only complete once they are consumed
+    rows = ((run_id, t.get('test_id', ''), t.get('test_name'), t.get('status'), t.get('duration_ms')) for t in tests)
+    conn.executemany(
+        'INSERT OR REPLACE INTO test_results (run_id, test_id, test_name, status, duration_ms) VALUES (?, ?, ?, ?, ?)', rows)
+    test_count = conn.execute('SELECT COUNT(*) FROM test_results WHERE run_id = ?', (run_id,)).fetchone()[0]
+    conn.execute(
+        'UPDATE runs SET total = ?, passed = ?, failed = ?, skipped = ?, duration_ms = ? WHERE id = ?',
+        (meta.get('total_tests', test_count), meta.get('passed', 0), meta.get('failed', 0),
+         meta.get('skipped', 0), meta.get('duration_ms', 0), run_id))
+
+
+def ingest(conn, workspace=WORKSPACE, categories=None, full=False):
+    """Ingests every response JSON that is new or whose mtime/size changed; drops vanished runs.
+
+    Returns (ingested, skipped, removed) counts.
+    """
+    if full:
+        conn.execute('DELETE FROM runs')
+    known = {path: (mtime_ns, size) for path, mtime_ns, size in conn.execute('SELECT path, mtime_ns, size FROM runs')}
+    seen = set()
+    ingested = skipped = 0
+    with conn:
+        for run in iter_response_files(workspace, categories):
+            path = run[-1]
+            rel_path = os.path.relpath(path, workspace)
+            seen.add(rel_path)
+            st = os.stat(path)
+            if known.get(rel_path) == (st.st_mtime_ns, st.st_size):
+                skipped += 1
+                continue
+            try:
+                ingest_run(conn, rel_path, run, st)
+                ingested += 1
+            except Exception as e:
+                print(f"[WARN] Could not ingest {path}: {e}")
+        scopes = tuple(c + os.sep for c in (categories or CATEGORIES))
+        removed = [p for p in known if p not in seen and p.startswith(scopes)]
+        conn.executemany('DELETE FROM runs WHERE path = ?', ((p,) for p in removed))
+    return ingested, skipped, len(removed)
+
+
+def test_history(conn, test_id, proposition=None, branch=None, category=None, suite=None):
+    """Returns the outcome of one test in every indexed run, oldest first."""
+    query = ('SELECT r.run_ts, r.category, r.branch, r.proposition, r.suite, t.status, t.duration_ms '
+             'FROM test_results t JOIN runs r ON r.id = t.run_id WHERE t.test_id = ?')
+    params = [test_id]
+    for column, value in (('proposition', proposition), ('branch', branch), ('category', category), ('suite', suite)):
+        if value:
+            query += f' AND r.{column} = ?'
+            params.append(value)
+    query += ' ORDER BY r.run_ts, r.branch'
+    return conn.execute(query, params).fetchall()
+
+
+def failing_since(history):
+    """Returns the first row of the current failure streak, or None if the test passed since its last failure.
+
+    Skipped runs neither start nor end a streak.
+    """
+    start = None
+    for row in history:
+        if row[5] in PASS_STATUSES:
+            start = None
+        elif row[5] == 'Failed' and start is None:
+            start = row
+    return start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Index per-test outcomes of every *_SchemaValidation_response.json into SQLite.')
+    parser.add_argument('--db', default=os.getenv('RESULTS_DB', DEFAULT_DB_PATH), help='SQLite database path')
+    parser.add_argument('--category', action='append', choices=CATEGORIES, help='Only ingest this category (repeatable)')
+    parser.add_argument('--full', action='store_true', help='Drop everything and re-ingest all runs')
+    parser.add_argument('--no-ingest', action='store_true', help='Query the database as-is')
+    parser.add_argument('--test', metavar='TEST_ID', help='Print the run history of one test')
+    parser.add_argument('--proposition', help='Restrict --test to one proposition')
+    parser.add_argument('--branch', help='Restrict --test to one branch')
+    parser.add_argument('--suite', choices=sorted(RESPONSE_FILES), help='Restrict --test to one suite')
+    args = parser.parse_args()
+
+    conn = connect(args.db)
+    if not args.no_ingest:
+        ingested, skipped, removed = ingest(conn, WORKSPACE, args.category, args.full)
+        print(f"[INFO] Ingested {ingested} run(s), {skipped} unchanged, {removed} removed: {args.db}")
+    if args.test:
+        history = test_history(conn, args.test, args.proposition, args.branch, suite=args.suite)
+        if not history:
+            print(f"[INFO] No results for {args.test}")
+        for run_ts, category, branch, proposition, suite, status, duration_ms in history:
+            print(f"{run_ts}  {category:<8} {branch:<20} {proposition:<12} {suite:<13} {status or '':<8} {duration_ms or 0} ms")
+        for suite in sorted(set(row[4] for row in history)):
+            start = failing_since([row for row in history if row[4] == suite])
+            if start:
+                print(f"[INFO] {suite} {args.test} has been failing since {start[0]} ({start[2]}/{start[3]})")
+            else:
+                print(f"[INFO] {suite} {args.test} is not currently failing")
+    conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,299 @@
+import os
+import re
+import sys
+import gzip
+import json
+import hashlib
+import argparse
+
+from results_layout import CATEGORIES
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# WORKSPACE is the root of the repo (two directories up from .github/scripts/)
+WORKSPACE = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Digest and stat of every processed file, committed with the tabs so unchanged outputs are
+# neither minified nor compressed again by the next run
+MANIFEST_PATH = os.path.join(WORKSPACE, 'tabs', 'compress_manifest.json')
+MANIFEST_VERSION = 1
+# What the browser loads: pages, assets and detail shards, plus the dataset the tabs fetch
+COMPRESS_EXTENSIONS = ('.html', '.js', '.css')
+SITE_DATA_FILES = ('reports_data.json',)
+# Below this size a sidecar saves less than its own request overhead
+MIN_COMPRESS_BYTES = 512
+# Content-hashed files of report_assets.py, minified before they are named: only their sidecars are written
+ASSETS_ROOT = 'assets'
+DEFAULT_ROOTS = ('index.html', 'tabs', ASSETS_ROOT)
+
+# <script>/<style> bodies are minified as JS/CSS; <pre>/<textarea> keep their whitespace
+_HTML_BLOCK_RE = re.compile(r'(<script\b[^>]*>)(.*?)(</script>)|(<style\b[^>]*>)(.*?)(</style>)|<(pre|textarea)\b.*?</\7>',
+                            re.S | re.I)
+_CSS_COMMENT_RE = re.compile(r'/\*.*?\*/', re.S)
+
+
+def _strip_lines(text):
+    return '\n'.join(line.strip() for line in text.split('\n') if line.strip())
+
+
+def _strip_segment(text):
+    """_strip_lines() of the markup between two blocks, keeping one line break where it had whitespace at either end."""
+    core = _strip_lines(text)
+    if not core:
+        return '\n' if text else ''
+    return ('\n' if text[0].isspace() else '') + core + ('\n' if text[-1].isspace() else '')
+
+
+def minify_js(text):
+    """Drops indentation, trailing blanks and empty lines, except inside multi-line template literals.
+
+    Line breaks stay, so automatic semicolon insertion sees the same code. A line's unescaped
+    backticks tell whether the next line starts inside a template literal (nested templates
+    open and close on the same line in these pages).
+    """
+    out = []
+    in_template = False
+    for line in text.split('\n'):
+        starts_inside = in_template
+        if (line.count('`') - line.count('\\`')) % 2:
+            in_template = not in_template
+        if starts_inside:
+            out.append(line if in_template else line.rstrip())
+        elif line.strip():
+            out.append(line.strip() if not in_template else line.lstrip())
+    return '\n'.join(out)
+
+
+def minify_css(text):
+    return _strip_lines(_CSS_COMMENT_RE.sub('', text))
+
+
+def minify_html(text):
+    out = []
+    pos = 0
+    for m in _HTML_BLOCK_RE.finditer(text):
+        out.append(_strip_segment(text[pos:m.start()]))
+        if m.group(1):
+            out.append(m.group(1) + minify_js(m.group(2)) + m.group(3))
+        elif m.group(4):
+            out.append(m.group(4) + minify_css(m.group(5)) + m.group(6))
+        else:
+            out.append(m.group(0))
+        pos = m.end()
+    out.append(_strip_lines(text[pos:]))
+    return ''.join(out)
+
+
+def minify(path, data):
+    """Minified bytes of a site file (data itself when there is nothing to gain or it cannot be parsed)."""
+    try:
+        text = data.decode('utf-8')
+    except UnicodeDecodeError:
+        return data
+    if path.endswith('.json'):
+        try:
+            text = json.dumps(json.loads(text), separators=(',', ':'), ensure_ascii=False)
+        except ValueError:
+            return data
+    elif path.endswith('.html'):
+        text = minify_html(text)
+    elif path.endswith('.js'):
+        text = minify_js(text)
+    elif path.endswith('.css'):
+        text = minify_css(text)
+    text += '\n' if data.endswith(b'\n') else ''
+    minified = text.encode('utf-8')
+    return minified if len(minified) < len(data) else data
+
+
+def encodings():
+    """Sidecar suffixes written by this run: .gz always, .br when the brotli module is installed."""
+    return ('gz', 'br') if brotli else ('gz',)
+
+
+def compress(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=11)
+    # mtime=0 keeps the bytes (and the committed sidecar) identical for identical input
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def is_site_file(name):
+    return name.endswith(COMPRESS_EXTENSIONS) or name in SITE_DATA_FILES
+
+
+def iter_site_files(roots, workspace=WORKSPACE):
+    """Workspace-relative paths of the site files under roots (files or directories)."""
+    for root in roots:
+        path = os.path.join(workspace, root)
+        if os.path.isfile(path):
+            if is_site_file(path):
+                yield os.path.relpath(path, workspace)
+            continue
+        for dirpath, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if is_site_file(name):
+                    yield os.path.relpath(os.path.join(dirpath, name), workspace)
+
+
+def default_roots(workspace=WORKSPACE):
+    """index.html, tabs/, assets/ and every <category>/<branch>/<proposition>/web_result/."""
+    roots = list(DEFAULT_ROOTS)
+    for category in CATEGORIES:
+        category_dir = os.path.join(workspace, category)
+        if not os.path.isdir(category_dir):
+            continue
+        for branch in sorted(os.listdir(category_dir)):
+            branch_dir = os.path.join(category_dir, branch)
+            for proposition in sorted(os.listdir(branch_dir)) if os.path.isdir(branch_dir) else ():
+                if os.path.isdir(os.path.join(branch_dir, proposition, 'web_result')):
+                    roots.append(os.path.join(category, branch, proposition, 'web_result'))
+    return roots
+
+
+def load_manifest(path=MANIFEST_PATH):
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+        if manifest.get('version') == MANIFEST_VERSION:
+            return manifest
+    except (OSError, ValueError):
+        pass
+    return {'version': MANIFEST_VERSION, 'files': {}}
+
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+
+
+def _write(path, data):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _stat_key(path):
+    st = os.stat(path)
+    return [st.st_size, st.st_mtime_ns]
+
+
+def process_file(rel_path, manifest, minify_files=True, workspace=WORKSPACE):
+    """Minifies one site file in place (except hashed assets) and (re)writes its sidecars if its content changed.
+
+    Returns None when the file was unchanged, else {'original', 'minified', <encoding>: size}.
+    """
+    path = os.path.join(workspace, rel_path)
+    wanted = encodings()
+    entry = manifest['files'].get(rel_path)
+    # encodings maps every suffix tried for the file to whether a sidecar was worth writing
+    sidecars_ok = entry is not None and all(e in entry['encodings'] and os.path.isfile(f"{path}.{e}") == entry['encodings'][e]
+                                            for e in wanted)
+    if sidecars_ok and entry['stat'] == _stat_key(path):
+        return None
+
+    with open(path, 'rb') as f:
+        data = f.read()
+    # Rewriting a hashed asset would leave its name (and any cached copy) out of date
+    hashed = os.path.normpath(rel_path).split(os.sep)[0] == ASSETS_ROOT
+    minified = minify(rel_path, data) if minify_files and not hashed else data
+    if minified is not data:
+        _write(path, minified)
+    digest = hashlib.blake2b(minified, digest_size=16).hexdigest()
+    if sidecars_ok and entry['digest'] == digest:
+        # Same content with a new mtime (e.g. a fresh checkout): nothing to recompress
+        entry['stat'] = _stat_key(path)
+        return None
+
+    stats = {'original': len(data), 'minified': len(minified)}
+    written = {}
+    for encoding in wanted:
+        sidecar = f"{path}.{encoding}"
+        compressed = compress(minified, encoding) if len(minified) >= MIN_COMPRESS_BYTES else None
+        if compressed is not None and len(compressed) < len(minified):
+            _write(sidecar, compressed)
+            written[encoding] = True
+            stats[encoding] = len(compressed)
+        else:
+            # Not worth a sidecar; a stale one would serve old content
+            if os.path.isfile(sidecar):
+                os.remove(sidecar)
+            written[encoding] = False
+            stats[encoding] = len(minified)
+    manifest['files'][rel_path] = {'stat': _stat_key(path), 'digest': digest, 'encodings': written}
+    return stats
+
+
+def prune(roots, manifest, workspace=WORKSPACE):
+    """Removes sidecars (and manifest entries) whose source file under roots is gone; returns the count."""
+    removed = 0
+    suffixes = tuple('.' + e for e in ('gz', 'br'))
+    for root in roots:
+        path = os.path.join(workspace, root)
+        for dirpath, _, files in os.walk(path) if os.path.isdir(path) else ():
+            for name in files:
+                if name.endswith(suffixes) and is_site_file(name.rsplit('.', 1)[0]):
+                    source = os.path.join(dirpath, name.rsplit('.', 1)[0])
+                    if not os.path.isfile(source):
+                        os.remove(os.path.join(dirpath, name))
+                        removed += 1
+    for rel_path in [p for p in manifest['files'] if not os.path.isfile(os.path.join(workspace, p))]:
+        del manifest['files'][rel_path]
+    return removed
+
+
+def _saving(before, after):
+    return f"{before} -> {after} bytes ({100 * (before - after) / before:.1f}% smaller)" if before else "0 bytes"
+
+
+def compress_site(roots=None, minify_files=True, workspace=WORKSPACE, manifest_path=MANIFEST_PATH):
+    """Minifies and precompresses the changed site files under roots (default: the whole site).
+
+    Returns {'files', 'changed', 'original', 'minified', <encoding>: total bytes of the changed files}.
+    """
+    roots = roots or default_roots(workspace)
+    manifest = load_manifest(manifest_path)
+    totals = {'files': 0, 'changed': 0, 'original': 0, 'minified': 0, **{e: 0 for e in encodings()}}
+    for rel_path in iter_site_files(roots, workspace):
+        totals['files'] += 1
+        stats = process_file(rel_path, manifest, minify_files, workspace)
+        if stats:
+            totals['changed'] += 1
+            for key, size in stats.items():
+                totals[key] += size
+    totals['pruned'] = prune(roots, manifest, workspace)
+    save_manifest(manifest, manifest_path)
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Minify the generated site files and write precompressed .gz/.br sidecars for the changed ones.')
+    parser.add_argument('paths', nargs='*', metavar='PATH',
+                        help='Files or directories relative to the workspace (default: index.html, tabs/, assets/ '
+                             'and every web_result/)')
+    parser.add_argument('--no-minify', action='store_true', help='Only write the sidecars; leave the files as generated')
+    args = parser.parse_args()
+
+    paths = [os.path.relpath(os.path.abspath(p), WORKSPACE) for p in args.paths]
+    outside = [p for p in paths if p.startswith('..')]
+    if outside:
+        print(f"[ERROR] Not inside the workspace {WORKSPACE}: {', '.join(outside)}")
+        sys.exit(1)
+    if not brotli:
+        print("[INFO] brotli module not installed; writing .gz sidecars only")
+    totals = compress_site(paths, not args.no_minify)
+    if totals['changed']:
+        print(f"[INFO] Minified: {_saving(totals['original'], totals['minified'])}")
+        for encoding in encodings():
+            print(f"[INFO] .{encoding} sidecars: {_saving(totals['original'], totals[encoding])}")
+    print(f"[SUCCESS] {totals['changed']} of {totals['files']} site file(s) changed and recompressed"
+          + (f", {totals['pruned']} orphaned sidecar(s) removed" if totals['pruned'] else ''))
+
+
+if __name__ == '__main__':
+    main()
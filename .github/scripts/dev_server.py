@@ -0,0 +1,383 @@
+import io
+import os
+import sys
+import time
+import ctypes
+import ctypes.util
+import select
+import struct
+import argparse
+import threading
+import subprocess
+from collections import OrderedDict
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from compress_site import MIN_COMPRESS_BYTES, compress, is_site_file
+from report_engine import SUITES
+from results_layout import CATEGORIES, DELTA_SUFFIX, RUN_DIR_RE, iter_run_dirs
+
+# WORKSPACE is the root of the repo (two directories up from .github/scripts/)
+WORKSPACE = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PORT = 8000
+# Seconds between two scans of the tree when inotify is not available
+POLL_INTERVAL = 2.0
+# A run's response files arrive in several writes; regeneration waits until the tree was quiet this long
+QUIET_SECONDS = 1.0
+# Compressed bodies of files without a fresh .gz sidecar, kept for the most recently served files
+GZIP_CACHE_ENTRIES = 64
+# Response files (full or delta-encoded) whose arrival triggers a re-render of their proposition
+WATCHED_FILES = frozenset(name for suite in SUITES.values()
+                          for name in (suite['response_file'], suite['response_file'][:-len('.json')] + DELTA_SUFFIX))
+
+# inotify(7) constants
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+_EVENT = struct.Struct('iIII')
+
+# Depth of a watched directory: the workspace, <category>, <branch>, <proposition>, <timestamp>
+WORKSPACE_DEPTH, CATEGORY_DEPTH, BRANCH_DEPTH, PROPOSITION_DEPTH, RUN_DEPTH = range(-1, 4)
+
+
+def _proposition_dir(run_dir):
+    return os.path.dirname(run_dir)
+
+
+def _watched_child(depth, name):
+    """Whether a directory entry at depth + 1 belongs to the results layout."""
+    if depth == WORKSPACE_DEPTH:
+        return name in CATEGORIES
+    if depth == PROPOSITION_DEPTH:
+        return bool(RUN_DIR_RE.match(name))
+    return not name.startswith('.')
+
+
+def _has_response(run_dir):
+    try:
+        with os.scandir(run_dir) as it:
+            return any(e.name in WATCHED_FILES for e in it)
+    except OSError:
+        return False
+
+
+class InotifyWatcher:
+    """Watches the layout levels of develop/ and release/ (never web_result/ or run contents below
+    the response files) and reports the proposition directories whose runs changed."""
+
+    def __init__(self, workspace, on_change):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or None, use_errno=True)
+        try:
+            self._init = libc.inotify_init1
+            self._add = libc.inotify_add_watch
+        except AttributeError:
+            raise OSError('inotify is not available on this platform')
+        self._add.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = self._init(os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self.workspace = workspace
+        self.on_change = on_change
+        self.watches = {}
+        self.add_tree(workspace, WORKSPACE_DEPTH)
+
+    def add_tree(self, path, depth):
+        """Watches path and the layout directories below it; returns the proposition directories
+        that already hold response files (written before the watch existed)."""
+        mask = IN_CLOSE_WRITE | IN_MOVED_TO if depth == RUN_DEPTH else IN_CREATE | IN_MOVED_TO
+        wd = self._add(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            if depth > WORKSPACE_DEPTH and errno == 2:
+                return set()  # removed again before the watch was added
+            raise OSError(errno, f'inotify_add_watch failed for {path} (see fs.inotify.max_user_watches)')
+        self.watches[wd] = (path, depth)
+        if depth == RUN_DEPTH:
+            return {_proposition_dir(path)} if _has_response(path) else set()
+        changed = set()
+        try:
+            with os.scandir(path) as it:
+                children = [e.name for e in it if e.is_dir() and _watched_child(depth, e.name)]
+        except OSError:
+            return changed
+        for name in sorted(children):
+            changed |= self.add_tree(os.path.join(path, name), depth + 1)
+        return changed
+
+    def run(self, stop):
+        while not stop.is_set():
+            ready, _, _ = select.select([self.fd], [], [], 0.5)
+            if not ready:
+                continue
+            data = os.read(self.fd, 64 * 1024)
+            changed = set()
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT.unpack_from(data, offset)
+                name = data[offset + _EVENT.size:offset + _EVENT.size + length].rstrip(b'\0')
+                offset += _EVENT.size + length
+                if mask & IN_Q_OVERFLOW:
+                    print("[WARN] inotify queue overflowed; rescanning every proposition")
+                    changed |= {_proposition_dir(run_dir) for *_, run_dir in iter_run_dirs(self.workspace)}
+                    continue
+                if mask & IN_IGNORED:
+                    self.watches.pop(wd, None)
+                    continue
+                if wd not in self.watches:
+                    continue
+                path, depth = self.watches[wd]
+                name = os.fsdecode(name)
+                if depth == RUN_DEPTH:
+                    if name in WATCHED_FILES:
+                        changed.add(_proposition_dir(path))
+                elif mask & IN_ISDIR and _watched_child(depth, name):
+                    changed |= self.add_tree(os.path.join(path, name), depth + 1)
+            if changed:
+                self.on_change(changed)
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Fallback for systems without inotify: compares the response files of every run between scans."""
+
+    def __init__(self, workspace, on_change, interval=POLL_INTERVAL):
+        self.workspace = workspace
+        self.on_change = on_change
+        self.interval = interval
+        self.snapshot = self.scan()
+
+    def scan(self):
+        """{run_dir: ((file name, mtime_ns, size), ...)} of the response files of every run."""
+        snapshot = {}
+        for *_, run_dir in iter_run_dirs(self.workspace):
+            try:
+                with os.scandir(run_dir) as it:
+                    stats = [(e.name, e.stat()) for e in it if e.name in WATCHED_FILES]
+                files = tuple(sorted((name, st.st_mtime_ns, st.st_size) for name, st in stats))
+            except OSError:
+                continue
+            if files:
+                snapshot[run_dir] = files
+        return snapshot
+
+    def run(self, stop):
+        while not stop.wait(self.interval):
+            snapshot = self.scan()
+            changed = {_proposition_dir(run_dir) for run_dir, files in snapshot.items()
+                       if self.snapshot.get(run_dir) != files}
+            self.snapshot = snapshot
+            if changed:
+                self.on_change(changed)
+
+    def close(self):
+        pass
+
+
+class Regenerator:
+    """Re-renders changed propositions (their latest run) and the index rows they feed, in batches."""
+
+    def __init__(self, workspace, quiet=QUIET_SECONDS):
+        self.workspace = workspace
+        self.quiet = quiet
+        self.pending = set()
+        self.last_change = 0.0
+        self.cond = threading.Condition()
+
+    def notify(self, proposition_dirs):
+        with self.cond:
+            self.pending |= set(proposition_dirs)
+            self.last_change = time.monotonic()
+            self.cond.notify()
+
+    def _script(self, name, *args):
+        return subprocess.call([sys.executable, os.path.join(SCRIPTS_DIR, name), *args], cwd=self.workspace)
+
+    def regenerate(self, proposition_dirs):
+        start = time.perf_counter()
+        rel_dirs = sorted(os.path.relpath(d, self.workspace) for d in proposition_dirs)
+        for rel_dir in rel_dirs:
+            print(f"[INFO] New results in {rel_dir}; re-rendering its latest run")
+            if self._script('report_engine.py', rel_dir, '--no-index'):
+                print(f"[WARN] report_engine.py failed for {rel_dir}")
+        changed_args = [arg for rel_dir in rel_dirs for arg in ('--changed', rel_dir)]
+        if self._script('generate_index.py', *changed_args):
+            print("[WARN] generate_index.py failed; the tabs may be out of date")
+        print(f"[SUCCESS] Regenerated {len(rel_dirs)} proposition(s) in {time.perf_counter() - start:.1f} s")
+
+    def run(self, stop):
+        while not stop.is_set():
+            with self.cond:
+                if not self.pending:
+                    self.cond.wait(0.5)
+                    continue
+                wait = self.last_change + self.quiet - time.monotonic()
+                if wait > 0:
+                    self.cond.wait(wait)
+                    continue
+                batch, self.pending = self.pending, set()
+            self.regenerate(batch)
+
+
+class _GzipCache:
+    """gzip bodies keyed by (path, mtime_ns, size), so a rewritten file is compressed again."""
+
+    def __init__(self, entries=GZIP_CACHE_ENTRIES):
+        self.entries = entries
+        self.items = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, path, st):
+        key = (path, st.st_mtime_ns, st.st_size)
+        with self.lock:
+            if key in self.items:
+                self.items.move_to_end(key)
+                return self.items[key]
+        with open(path, 'rb') as f:
+            body = compress(f.read(), 'gz')
+        with self.lock:
+            self.items[key] = body
+            while len(self.items) > self.entries:
+                self.items.popitem(last=False)
+        return body
+
+
+class SiteHandler(SimpleHTTPRequestHandler):
+    """Serves the workspace like the published site, with ETags for revalidation and gzip/br
+    bodies taken from fresh compress_site.py sidecars or compressed on the fly."""
+
+    gzip_cache = _GzipCache()
+
+    def end_headers(self):
+        # Always revalidate, so regenerated pages show up on the next reload
+        self.send_header('Cache-Control', 'no-cache')
+        super().end_headers()
+
+    def _accepted(self):
+        accepted = set()
+        for part in self.headers.get('Accept-Encoding', '').split(','):
+            token, _, params = part.strip().partition(';')
+            if token and params.replace(' ', '') not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+                accepted.add(token.lower())
+        return accepted
+
+    def _encoding(self, path, st):
+        """('br' | 'gzip' | None, sidecar path or None) for the response body."""
+        if not is_site_file(os.path.basename(path)) or st.st_size < MIN_COMPRESS_BYTES:
+            return None, None
+        accepted = self._accepted()
+        for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+            if encoding not in accepted:
+                continue
+            sidecar = path + suffix
+            try:
+                # A sidecar older than its file was written before the file was re-rendered
+                if os.stat(sidecar).st_mtime_ns >= st.st_mtime_ns:
+                    return encoding, sidecar
+            except OSError:
+                pass
+        return ('gzip', None) if 'gzip' in accepted else (None, None)
+
+    def send_head(self):
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            return super().send_head()
+        try:
+            st = os.stat(path)
+        except OSError:
+            self.send_error(404, 'File not found')
+            return None
+        encoding, sidecar = self._encoding(path, st)
+        etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}{"-" + encoding if encoding else ""}"'
+        if_none_match = self.headers.get('If-None-Match', '')
+        if etag in [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Vary', 'Accept-Encoding')
+            self.end_headers()
+            return None
+        try:
+            if sidecar:
+                with open(sidecar, 'rb') as f:
+                    body = f.read()
+            elif encoding:
+                body = self.gzip_cache.get(path, st)
+            else:
+                with open(path, 'rb') as f:
+                    body = f.read()
+        except OSError:
+            self.send_error(404, 'File not found')
+            return None
+        self.send_response(200)
+        self.send_header('Content-Type', self.guess_type(path))
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Last-Modified', self.date_time_string(st.st_mtime))
+        self.send_header('ETag', etag)
+        self.send_header('Vary', 'Accept-Encoding')
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        self.end_headers()
+        return io.BytesIO(body)
+
+
+def start_watcher(workspace, on_change, poll=False, interval=POLL_INTERVAL):
+    if not poll:
+        try:
+            watcher = InotifyWatcher(workspace, on_change)
+            print(f"[INFO] Watching {', '.join(CATEGORIES)} with inotify ({len(watcher.watches)} directories)")
+            return watcher
+        except OSError as e:
+            print(f"[WARN] Could not use inotify ({e}); polling every {interval:g} s instead")
+    watcher = PollingWatcher(workspace, on_change, interval)
+    print(f"[INFO] Polling {len(watcher.snapshot)} run(s) every {interval:g} s")
+    return watcher
+
+
+def serve(bind, port, poll=False, interval=POLL_INTERVAL, build=True, workspace=WORKSPACE):
+    regenerator = Regenerator(workspace)
+    if build:
+        # The tabs may be older than the results already on disk
+        regenerator._script('generate_index.py')
+    stop = threading.Event()
+    watcher = start_watcher(workspace, regenerator.notify, poll, interval)
+    threads = [threading.Thread(target=watcher.run, args=(stop,), daemon=True),
+               threading.Thread(target=regenerator.run, args=(stop,), daemon=True)]
+    for thread in threads:
+        thread.start()
+
+    handler = lambda *args: SiteHandler(*args, directory=workspace)
+    server = ThreadingHTTPServer((bind, port), handler)
+    print(f"[SUCCESS] Serving {workspace} at http://{bind}:{server.server_address[1]}/ (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.server_close()
+        for thread in threads:
+            thread.join(timeout=2)
+        watcher.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve the dashboard locally and re-render new results as they land '
+                                                 'in develop/ and release/.')
+    parser.add_argument('command', choices=['serve'],
+                        help='serve: watch the results tree, regenerate what changed and serve the site over HTTP')
+    parser.add_argument('--bind', default='127.0.0.1', help='Address to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'Port to listen on (default: {DEFAULT_PORT})')
+    parser.add_argument('--poll', action='store_true', help='Poll the tree instead of using inotify')
+    parser.add_argument('--interval', type=float, default=POLL_INTERVAL,
+                        help=f'Seconds between polls (default: {POLL_INTERVAL:g})')
+    parser.add_argument('--no-build', action='store_true', help='Do not refresh the tabs before serving')
+    args = parser.parse_args()
+    serve(args.bind, args.port, args.poll, args.interval, not args.no_build)
+
+
+if __name__ == '__main__':
+    main()
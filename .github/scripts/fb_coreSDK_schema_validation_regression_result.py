@@ -1,249 +1,58 @@
 import json
 import os
-import glob
+import html
 import subprocess
 
-def find_latest_result_file(base_folder):
-    """Finds the latest 'complete_firebolt_schema_validation_response.json' in a given base folder."""
-    print(f"[INFO] Searching for results in base folder: {base_folder}")
-    if not os.path.isdir(base_folder):
-        print(f"[ERROR] Base folder not found: {base_folder}")
-        return None
-
-    # Find all timestamped subfolders
-    subfolders = [f.path for f in os.scandir(base_folder) if f.is_dir()]
-    if not subfolders:
-        print(f"[ERROR] No timestamped subfolders found in {base_folder}")
-        return None
-
-    # Get the latest subfolder
-    latest_subfolder = max(subfolders, key=os.path.getmtime)
-    print(f"[INFO] Using latest subfolder: {latest_subfolder}")
-
-    # Find the JSON file
-    result_file = os.path.join(latest_subfolder, 'fb_coreSDK_schema_validation_response.json')
-    if not os.path.isfile(result_file):
-        print(f"[ERROR] Result JSON not found in {latest_subfolder}")
-        return None
-    
-    print(f"[INFO] Found result file: {result_file}")
-    return result_file
-
-def get_current_branch_folder():
-    """Determines the current branch folder name by checking the active git branch."""
-    try:
-        branch_name = subprocess.check_output(['git', 'rev-parse', '--abbrev-ref', 'HEAD']).decode('utf-8').strip()
-        print(f"[INFO] Detected current git branch: {branch_name}")
-        if os.path.isdir(branch_name):
-            print(f"[INFO] Found a directory with the same name as the branch: {branch_name}")
-            return branch_name
-        else:
-            raise RuntimeError(f"A directory named '{branch_name}' was not found in the current path.")
-    except Exception as e:
-        raise RuntimeError(f"Could not determine the current branch folder: {e}")
-
-def generate_comparison_report():
-    """Generates an HTML report comparing two test results."""
-    
-    # --- 1. Find the two JSON files to compare ---
-    base_result_dir = os.getenv('BASE_RESULT_DIR')
-    if not base_result_dir:
-        print("[ERROR] Environment variable 'BASE_RESULT_DIR' is not set.")
-        return
-    #TODO: Update to fb_coreSDK once available
-    base_result_file = os.path.join(base_result_dir, 'fb_coreSDK_schema_validation_response.json')
-    
-    # Use CURRENT_BRANCH_DIR if set, otherwise fall back to git branch
-    current_branch_folder = os.getenv('CURRENT_BRANCH_DIR')
-    if current_branch_folder:
-        print(f"[INFO] Using CURRENT_BRANCH_DIR env var: {current_branch_folder}")
-        if not os.path.isdir(current_branch_folder):
-            raise RuntimeError(f"The directory specified by CURRENT_BRANCH_DIR does not exist: {current_branch_folder}")
-    else:
-        print("[INFO] CURRENT_BRANCH_DIR not set, determining folder from git branch.")
-        current_branch_folder = get_current_branch_folder()
-
-    print(f"[INFO] Using base reference file: {base_result_file}")
-    if not os.path.isfile(base_result_file):
-        print(f"[ERROR] Base reference file not found at: {base_result_file}")
-        return
-
-    current_result_file = find_latest_result_file(current_branch_folder)
-
-    if not current_result_file:
-        print("[ERROR] Cannot generate comparison report. Current result file is missing.")
-        return
-
-    with open(base_result_file) as f:
-        base_data = json.load(f)
-    with open(current_result_file) as f:
-        current_data = json.load(f)
-
-    # Resolve display paths
-    current_run_folder = os.path.dirname(current_result_file)
-
-    # --- 2. Compare the results ---
-    base_tests = {test['test_id']: test for test in base_data['test_results']}
-    current_tests = {test['test_id']: test for test in current_data['test_results']}
-
-    regressions = []
-    improvements = []
-    
-    for test_id, current_test in current_tests.items():
-        base_test = base_tests.get(test_id)
-        if base_test:
-            base_status_ok = base_test['status'] in ['Passed', 'Success']
-            current_status_ok = current_test['status'] in ['Passed', 'Success']
-            
-            # Regression: Was OK, now it's not
-            if base_status_ok and not current_status_ok:
-                regressions.append((current_test, base_test))
-            
-            # Improvement: Was not OK, now it is
-            if not base_status_ok and current_status_ok:
-                improvements.append((current_test, base_test))
-
-    new_tests = [current_tests[test_id] for test_id in current_tests if test_id not in base_tests]
-    removed_tests = [base_tests[test_id] for test_id in base_tests if test_id not in current_tests]
-
-    # Build HTML sections after helper functions are defined
-
-    # --- 3. Generate HTML content ---
-    def create_test_row(test, base_test=None):
-        test_id = test['test_id']
-        test_name = test['test_name']
-        current_status = test['status']
-        base_status = base_test['status'] if base_test else 'N/A'
-        
-        status_class = 'status-passed' if current_status in ['Passed', 'Success'] else 'status-failed'
-        
-        # Extract request and response from the first step
-        request_details = test.get('steps', [{}])[0].get('request', {})
-        response_details = test.get('steps', [{}])[0].get('response', {})
-        error_details = test.get('steps', [{}])[0].get('error', 'No error details.')
-
-        details_html = f"""
-        <div class="details" id="details-{test_id}">
-            <div style=\"font-size:12px;color:#6b7b8c;margin:8px 20px;\"><b>Test ID:</b> {test_id}</div>
-            <div class="details-content">
-                <div class="column">
-                    <h4>Request</h4>
-                    <pre><code>{json.dumps(request_details, indent=2)}</code></pre>
-                </div>
-                <div class="column">
-                    <h4>Response</h4>
-                    <pre><code>{json.dumps(response_details, indent=2)}</code></pre>
-                    <h4>Error</h4>
-                    <pre><code>{error_details}</code></pre>
-                </div>
-            </div>
-        </div>
-        """
-        
-        row_html = f"""
-        <tr class="test-row" onclick="toggleDetails('{test_id}')">
-            <td><span class=\"idtag\">{test_id}</span>{test_name}</td>
-            <td class='status'>{base_status}</td>
-            <td class='status {status_class}'>{current_status}</td>
-        </tr>
-        <tr>
-            <td colspan="3">{details_html}</td>
-        </tr>
-        """
-        return row_html
-
-    def create_single_test_row(test):
-        test_id = test['test_id']
-        test_name = test['test_name']
-        current_status = test['status']
-        
-        status_class = 'status-passed' if current_status in ['Passed', 'Success'] else 'status-failed'
-        
-        request_details = test.get('steps', [{}])[0].get('request', {})
-        response_details = test.get('steps', [{}])[0].get('response', {})
-        error_details = test.get('steps', [{}])[0].get('error', 'No error details.')
-
-        details_html = f"""
-        <div class="details" id="details-{test_id}">
-            <div style=\"font-size:12px;color:#6b7b8c;margin:8px 20px;\"><b>Test ID:</b> {test_id}</div>
-            <div class="details-content">
-                <div class="column">
-                    <h4>Request</h4>
-                    <pre><code>{json.dumps(request_details, indent=2)}</code></pre>
-                </div>
-                <div class="column">
-                    <h4>Response</h4>
-                    <pre><code>{json.dumps(response_details, indent=2)}</code></pre>
-                    <h4>Error</h4>
-                    <pre><code>{error_details}</code></pre>
-                </div>
-            </div>
-        </div>
-        """
-        
-        row_html = f"""
-        <tr class="test-row" onclick="toggleDetails('{test_id}')">
-            <td><span class=\"idtag\">{test_id}</span>{test_name}</td>
-            <td class='status {status_class}'>{current_status}</td>
-        </tr>
-        <tr>
-            <td colspan="2">{details_html}</td>
-        </tr>
-        """
-        return row_html
-
-    # Build section HTML (joins will yield empty strings when no differences)
-    regressions_html = "".join([create_test_row(current, base) for current, base in regressions])
-    improvements_html = "".join([create_test_row(current, base) for current, base in improvements])
-    new_tests_html = "".join([create_single_test_row(test) for test in new_tests])
-    removed_tests_html = "".join([create_single_test_row(test) for test in removed_tests])
-
-    # --- 4. Generate final HTML from an embedded template ---
-    html_content = f"""
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>Firebolt Schema Validation Comparison Report</title>
-        <style>
-            body {{
+from flaky_tests import flaky_for
+from instrument import span, timed_iter, traced
+from json_stream import load_response
+from report_assets import asset_tag
+from regression_diff import compare_runs, fingerprint_tests
+from results_layout import RUN_DIR_RE, stored_response_path
+from run_index import WORKSPACE, RunIndex, run_dir, split_run_path
+
+RESPONSE_FILE = 'fb_coreSDK_schema_validation_response.json'
+# Longest request/response/diff value shown on the page before it is cut off
+MAX_VALUE_CHARS = 4000
+# Stylesheet and script of the regression page, published as assets/regression-report.<hash>.css/.js
+REGRESSION_CSS = '''
+            body {
                 font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Helvetica, Arial, sans-serif;
                 line-height: 1.6;
                 color: #333;
                 background-color: #f4f7f9;
                 margin: 0;
                 padding: 20px;
-            }}
-            .container {{
+            }
+            .container {
                 max-width: 1200px;
                 margin: auto;
                 background-color: #fff;
                 padding: 30px;
                 border-radius: 8px;
                 box-shadow: 0 4px 12px rgba(0,0,0,0.08);
-            }}
-            h1, h2 {{
+            }
+            h1, h2 {
                 color: #1a2c42;
                 border-bottom: 2px solid #eef2f5;
                 padding-bottom: 10px;
                 margin-top: 0;
-            }}
-            h2 {{
+            }
+            h2 {
                 margin-top: 30px;
-            }}
-            .page-title {{
+            }
+            .page-title {
                 text-align: center;
                 border-bottom: none;
                 margin-bottom: 10px;
-            }}
-            .summary {{
+            }
+            .summary {
                 display: grid;
                 grid-template-columns: repeat(auto-fit, minmax(160px, 1fr));
                 gap: 14px;
                 margin: 10px 0 20px 0;
-            }}
-            .run-info {{
+            }
+            .run-info {
                 display: flex;
                 justify-content: space-between;
                 align-items: center;
@@ -255,86 +64,145 @@ def generate_comparison_report():
                 border-radius: 8px;
                 padding: 10px 12px;
                 margin: 6px 0 16px 0;
-            }}
-            .run-info code {{
+            }
+            .run-info code {
                 background: #eef2f5;
                 padding: 2px 6px;
                 border-radius: 4px;
                 font-family: "SFMono-Regular", Consolas, "Liberation Mono", Menlo, Courier, monospace;
                 font-size: 12px;
                 color: #1a2c42;
-            }}
-            .summary-card {{
+            }
+            .summary-card {
                 background-color: #f9fafb;
                 border: 1px solid #eef2f5;
                 border-radius: 8px;
                 padding: 14px;
                 text-align: center;
-            }}
-            .summary-card h3 {{
+            }
+            .summary-card h3 {
                 margin: 0 0 6px 0;
                 font-size: 14px;
                 font-weight: 600;
                 color: #44566c;
-            }}
-            .summary-card .count {{
+            }
+            .summary-card .count {
                 font-size: 24px;
                 font-weight: 700;
                 color: #1a2c42;
-            }}
+            }
             /* Inline section description style */
-            .section-inline-desc {{
+            .section-inline-desc {
                 margin-left: 8px;
                 font-size: 13px;
                 color: #6b7b8c;
                 font-weight: 400;
-            }}
-            .summary-card.regressions .count {{ color: #dc3545; }}
-            .summary-card.improvements .count {{ color: #28a745; }}
-            .summary-card.new .count {{ color: #007bff; }}
-            .summary-card.removed .count {{ color: #6c757d; }}
-            table {{
+            }
+            .summary-card.regressions .count { color: #dc3545; }
+            .summary-card.improvements .count { color: #28a745; }
+            .summary-card.changed .count { color: #b8860b; }
+            .summary-card.new .count { color: #007bff; }
+            .summary-card.removed .count { color: #6c757d; }
+            table {
                 width: 100%;
                 border-collapse: collapse;
                 margin-top: 20px;
-            }}
-            th, td {{
+            }
+            th, td {
                 padding: 12px 15px;
                 text-align: left;
                 border-bottom: 1px solid #eef2f5;
-            }}
-            th {{
+            }
+            th {
                 background-color: #f9fafb;
                 font-weight: 600;
                 color: #555;
-            }}
-            tr.test-row {{
+            }
+            tr.test-row {
                 cursor: pointer;
                 transition: background-color 0.2s ease;
-            }}
-            tr.test-row:hover {{
+            }
+            tr.test-row:hover {
                 background-color: #f9fafb;
-            }}
-            .status {{
+            }
+            .status {
                 font-weight: 600;
-            }}
-            .status-passed {{
+            }
+            .status-passed {
                 color: #28a745;
-            }}
-            .status-failed {{
+            }
+            .status-failed {
                 color: #dc3545;
-            }}
-            .details {{
+            }
+            .details {
                 display: none;
                 padding: 0;
                 background-color: #fafafa;
-            }}
-            .details-content {{
+            }
+            .details-content {
                 display: flex;
                 padding: 20px;
                 border-top: 2px solid #eef2f5;
-            }}
-            .idtag {{
+            }
+            .step-title {
+                font-weight: 600;
+                color: #44566c;
+                padding: 10px 20px 0 20px;
+            }
+            .step-changed .step-title {
+                color: #b8860b;
+            }
+            .flaky-tag {
+                display: inline-block;
+                font-size: 11px;
+                font-weight: 600;
+                padding: 1px 6px;
+                margin-left: 8px;
+                border-radius: 6px;
+                background: #f3e8ff;
+                color: #6f42c1;
+                border: 1px solid #dcc6f5;
+                cursor: help;
+            }
+            .summary-card .count-note {
+                font-size: 12px;
+                color: #6f42c1;
+            }
+            .changed-tag {
+                display: inline-block;
+                font-size: 11px;
+                font-weight: 600;
+                padding: 1px 6px;
+                margin-left: 8px;
+                border-radius: 6px;
+                background: #fff4d6;
+                color: #8a6500;
+                border: 1px solid #f0dca0;
+            }
+            .step-diff {
+                padding: 0 20px 20px 20px;
+            }
+            .diff-table {
+                margin-top: 6px;
+                font-size: 13px;
+            }
+            .diff-table td, .diff-table th {
+                padding: 6px 8px;
+                vertical-align: top;
+            }
+            .diff-table pre {
+                margin: 0;
+                padding: 6px 8px;
+            }
+            .diff-added td:nth-child(2) { color: #28a745; }
+            .diff-removed td:nth-child(2) { color: #dc3545; }
+            .diff-changed td:nth-child(2) { color: #b8860b; }
+            .diff-more {
+                font-size: 12px;
+                color: #6b7b8c;
+                margin-top: 6px;
+            }
+            .idtag {
                 display: inline-block;
                 font-size: 12px;
                 padding: 2px 6px;
@@ -343,15 +211,15 @@ def generate_comparison_report():
                 color: #6b7b8c;
                 margin-right: 8px;
                 border: 1px solid #e3e8ee;
-            }}
-            .column {{
+            }
+            .column {
                 flex: 1;
                 padding: 0 15px;
-            }}
-            .column:first-child {{
+            }
+            .column:first-child {
                 border-right: 1px solid #eef2f5;
-            }}
-            pre {{
+            }
+            pre {
                 background-color: #eef2f5;
                 padding: 15px;
                 border-radius: 6px;
@@ -359,28 +227,343 @@ def generate_comparison_report():
                 word-wrap: break-word;
                 font-family: "SFMono-Regular", Consolas, "Liberation Mono", Menlo, Courier, monospace;
                 font-size: 13px;
-            }}
-            code {{
+            }
+            code {
                 color: #1a2c42;
-            }}
-            .no-changes {{
+            }
+            .no-changes {
                 text-align: center;
                 padding: 50px;
-            }}
-            .section {{
+            }
+            .section {
                 margin-top: 20px;
-            }}
-            .section-title {{
+            }
+            .section-title {
                 cursor: pointer;
                 user-select: none;
                 display: inline-flex;
                 align-items: center;
                 gap: 6px;
-            }}
-            .section-body {{
+            }
+            .section-body {
                 display: none;
-            }}
-        </style>
+            }
+'''
+REGRESSION_JS = '''
+            function toggleDetails(testId) {
+                const details = document.getElementById('details-' + testId);
+                if (details.style.display === 'block') {
+                    details.style.display = 'none';
+                } else {
+                    details.style.display = 'block';
+                }
+            }
+
+            function toggleSection(sectionKey) {
+                const body = document.getElementById('section-' + sectionKey);
+                if (!body) return;
+                body.style.display = (body.style.display === 'block') ? 'none' : 'block';
+            }
+
+            document.addEventListener('DOMContentLoaded', function () {
+                // Click to toggle each section
+                const headers = document.querySelectorAll('.section-title');
+                headers.forEach(h => {
+                    h.addEventListener('click', () => toggleSection(h.dataset.target));
+                });
+                // Keep all sections collapsed by default
+            });
+'''
+
+def find_latest_result_file(base_folder, index=None):
+    """Finds the 'fb_coreSDK_schema_validation_response.json' of the newest run in a given base folder.
+
+    Runs are ordered by their YYYYMMDD_HHMMSS folder names, looked up in the run index (re-listed
+    for this folder first, the saved one predates this run) for <category>/<branch>/<proposition>
+    folders; other folders fall back to sorting the subfolder names. The path returned may be a
+    delta-encoded response (see run_delta.py), which load_response reads like a full one.
+    """
+    print(f"[INFO] Searching for results in base folder: {base_folder}")
+    if not os.path.isdir(base_folder):
+        print(f"[ERROR] Base folder not found: {base_folder}")
+        return None
+
+    latest_subfolder = None
+    key = split_run_path(base_folder)
+    if key and len(key) == 3:
+        index = index or RunIndex.load()
+        index.refresh(base_folder)
+        run = index.latest(key[0], key[2], branch=key[1], file_name=RESPONSE_FILE)
+        if run:
+            latest_subfolder = os.path.join(base_folder, run[3])
+    if not latest_subfolder:
+        # Find all timestamped subfolders
+        subfolders = sorted(f.name for f in os.scandir(base_folder) if f.is_dir() and RUN_DIR_RE.match(f.name))
+        if not subfolders:
+            print(f"[ERROR] No timestamped subfolders found in {base_folder}")
+            return None
+        latest_subfolder = os.path.join(base_folder, subfolders[-1])
+    print(f"[INFO] Using latest subfolder: {latest_subfolder}")
+
+    # Find the JSON file, stored in full or as a delta
+    result_file = stored_response_path(latest_subfolder, RESPONSE_FILE)
+    if not result_file:
+        print(f"[ERROR] Result JSON not found in {latest_subfolder}")
+        return None
+    
+    print(f"[INFO] Found result file: {result_file}")
+    return result_file
+
+def find_base_result_dir(current_run_folder, index):
+    """Newest release run of the current run's proposition (older than it, for a release run)."""
+    key = split_run_path(current_run_folder)
+    if not key or len(key) != 4:
+        print(f"[ERROR] Cannot derive the proposition of {current_run_folder}")
+        return None
+    index.refresh_branches('release', key[2])
+    run = index.release_baseline(key, file_name=RESPONSE_FILE)
+    if not run:
+        print(f"[ERROR] No release run of {key[2]} with {RESPONSE_FILE} found in the run index")
+        return None
+    return os.path.relpath(run_dir(run, WORKSPACE))
+
+def get_current_branch_folder():
+    """Determines the current branch folder name by checking the active git branch."""
+    try:
+        branch_name = subprocess.check_output(['git', 'rev-parse', '--abbrev-ref', 'HEAD']).decode('utf-8').strip()
+        print(f"[INFO] Detected current git branch: {branch_name}")
+        if os.path.isdir(branch_name):
+            print(f"[INFO] Found a directory with the same name as the branch: {branch_name}")
+            return branch_name
+        else:
+            raise RuntimeError(f"A directory named '{branch_name}' was not found in the current path.")
+    except Exception as e:
+        raise RuntimeError(f"Could not determine the current branch folder: {e}")
+
+def generate_comparison_report():
+    """Generates an HTML report comparing two test results."""
+    
+    # --- 1. Find the two JSON files to compare ---
+    index = RunIndex.load()
+
+    # Use CURRENT_BRANCH_DIR if set, otherwise fall back to git branch
+    current_branch_folder = os.getenv('CURRENT_BRANCH_DIR')
+    if current_branch_folder:
+        print(f"[INFO] Using CURRENT_BRANCH_DIR env var: {current_branch_folder}")
+        if not os.path.isdir(current_branch_folder):
+            raise RuntimeError(f"The directory specified by CURRENT_BRANCH_DIR does not exist: {current_branch_folder}")
+    else:
+        print("[INFO] CURRENT_BRANCH_DIR not set, determining folder from git branch.")
+        current_branch_folder = get_current_branch_folder()
+
+    current_result_file = find_latest_result_file(current_branch_folder, index)
+
+    if not current_result_file:
+        print("[ERROR] Cannot generate comparison report. Current result file is missing.")
+        return
+
+    # Use BASE_RESULT_DIR if set, otherwise the latest release run of the same proposition
+    base_result_dir = os.getenv('BASE_RESULT_DIR')
+    if base_result_dir:
+        print(f"[INFO] Using BASE_RESULT_DIR env var: {base_result_dir}")
+    else:
+        base_result_dir = find_base_result_dir(os.path.dirname(current_result_file), index)
+        if not base_result_dir:
+            print("[ERROR] Cannot generate comparison report. Set BASE_RESULT_DIR to choose a base run.")
+            return
+    # Older runs may be stored as deltas (see run_delta.py)
+    base_result_file = stored_response_path(base_result_dir, RESPONSE_FILE) or os.path.join(base_result_dir, RESPONSE_FILE)
+
+    print(f"[INFO] Using base reference file: {base_result_file}")
+    if not os.path.isfile(base_result_file):
+        print(f"[ERROR] Base reference file not found at: {base_result_file}")
+        return
+
+    # Streams large files and resolves the step payloads of packed ones (see blob_store.py)
+    with span('load responses'):
+        _, base_tests = load_response(base_result_file)
+        _, current_tests = load_response(current_result_file)
+
+    # --- 2. Compare the results ---
+    # Every test is fingerprinted once; tests whose step fingerprints match are skipped without
+    # looking at their payloads, the rest get a step-by-step structural diff
+    with span('fingerprint base'):
+        base_prints = fingerprint_tests(timed_iter('parse', base_tests))
+    with span('fingerprint current'):
+        prints = fingerprint_tests(timed_iter('parse', current_tests))
+    with span('compare'):
+        comparison = compare_runs(base_prints, prints)
+    current_run_folder = os.path.dirname(current_result_file)
+    write_comparison_report(comparison, current_run_folder, base_result_dir,
+                            flaky=flaky_for(split_run_path(current_run_folder)))
+
+@traced('regression page')
+def write_comparison_report(comparison, current_run_folder, base_result_dir,
+                            out_path="fb_coreSDK_schema_validation_regression_result.html", flaky=None):
+    """Writes the HTML page of a regression_diff.Comparison between two runs.
+
+    flaky ({test_id: stats}, see flaky_tests.py) tags tests known to flip between runs, so their
+    regressions can be told apart from real ones.
+    """
+    flaky = flaky or {}
+    # The run folder sits directly in the branch/proposition folder shown as "latest"
+    current_branch_folder = os.path.dirname(os.path.normpath(current_run_folder))
+    page_dir = os.path.dirname(os.path.abspath(out_path))
+
+    regressions = comparison.regressions
+    improvements = comparison.improvements
+    payload_changed = comparison.payload_changed
+    new_tests = comparison.new_tests
+    removed_tests = comparison.removed_tests
+    print(f"[INFO] {comparison.unchanged} unchanged test(s) skipped by fingerprint; "
+          f"{len(regressions) + len(improvements) + len(payload_changed)} compared in detail")
+
+    # Build HTML sections after helper functions are defined
+
+    # --- 3. Generate HTML content ---
+    def format_value(value):
+        text = json.dumps(value, indent=2, ensure_ascii=False, default=str)
+        if len(text) > MAX_VALUE_CHARS:
+            text = text[:MAX_VALUE_CHARS] + '\n...'
+        return html.escape(text)
+
+    def create_diff_html(step_diff):
+        rows = "".join(
+            f"""
+                    <tr class="diff-{diff['kind']}">
+                        <td><code>{html.escape(diff['path'])}</code></td>
+                        <td>{diff['kind']}</td>
+                        <td><pre><code>{format_value(diff['base'])}</code></pre></td>
+                        <td><pre><code>{format_value(diff['current'])}</code></pre></td>
+                    </tr>"""
+            for diff in step_diff['diffs'])
+        more = step_diff['total'] - len(step_diff['diffs'])
+        more_html = f"<div class=\"diff-more\">... and {more} more difference(s)</div>" if more > 0 else ""
+        return f"""
+            <div class="step-diff">
+                <h4>Changes vs. base</h4>
+                <table class="diff-table">
+                    <thead><tr><th>Path</th><th>Change</th><th>Base</th><th>Current</th></tr></thead>
+                    <tbody>{rows}</tbody>
+                </table>
+                {more_html}
+            </div>
+        """
+
+    def create_details_html(test, step_diffs=()):
+        test_id = test['test_id']
+        diffs_by_step = {step_diff['step']: step_diff for step_diff in step_diffs}
+        steps = test.get('steps') or [{}]
+        blocks = []
+        for i, step in enumerate(steps):
+            step_diff = diffs_by_step.pop(i, None)
+            title = f"Step {i + 1}" + (f": {html.escape(str(step['description']))}" if step.get('description') else "")
+            badge = " <span class=\"changed-tag\">changed</span>" if step_diff else ""
+            blocks.append(f"""
+            <div class="step{' step-changed' if step_diff else ''}">
+                <div class="step-title">{title}{badge}</div>
+                <div class="details-content">
+                    <div class="column">
+                        <h4>Request</h4>
+                        <pre><code>{format_value(step.get('request', {}))}</code></pre>
+                    </div>
+                    <div class="column">
+                        <h4>Response</h4>
+                        <pre><code>{format_value(step.get('response', {}))}</code></pre>
+                        <h4>Error</h4>
+                        <pre><code>{html.escape(str(step.get('error', 'No error details.')))}</code></pre>
+                    </div>
+                </div>
+                {create_diff_html(step_diff) if step_diff else ''}
+            </div>
+            """)
+        # Steps that only exist in the base run
+        for i, step_diff in sorted(diffs_by_step.items()):
+            blocks.append(f"""
+            <div class="step step-changed">
+                <div class="step-title">Step {i + 1} <span class="changed-tag">only in base</span></div>
+                {create_diff_html(step_diff)}
+            </div>
+            """)
+        return f"""
+        <div class="details" id="details-{test_id}">
+            <div style=\"font-size:12px;color:#6b7b8c;margin:8px 20px;\"><b>Test ID:</b> {test_id}</div>
+            {''.join(blocks)}
+        </div>
+        """
+
+    def flaky_tag(test_id):
+        stats = flaky.get(test_id)
+        if not stats:
+            return ""
+        title = (f"Outcome flipped in {round(stats['flip_rate'] * 100)}% of its last {stats['runs']} runs "
+                 f"({round(stats['failure_rate'] * 100)}% failed)")
+        return f"<span class=\"flaky-tag\" title=\"{title}\">flaky</span>"
+
+    def changed_steps_tag(step_diffs):
+        if not step_diffs:
+            return ""
+        return f"<span class=\"changed-tag\">{len(step_diffs)} step(s) changed</span>"
+
+    def create_test_row(test, base_test=None, step_diffs=()):
+        test_id = test['test_id']
+        test_name = test['test_name']
+        current_status = test['status']
+        base_status = base_test['status'] if base_test else 'N/A'
+        
+        status_class = 'status-passed' if current_status in ['Passed', 'Success'] else 'status-failed'
+        
+        details_html = create_details_html(test, step_diffs)
+        
+        row_html = f"""
+        <tr class="test-row" onclick="toggleDetails('{test_id}')">
+            <td><span class=\"idtag\">{test_id}</span>{test_name}{flaky_tag(test_id)}{changed_steps_tag(step_diffs)}</td>
+            <td class='status'>{base_status}</td>
+            <td class='status {status_class}'>{current_status}</td>
+        </tr>
+        <tr>
+            <td colspan="3">{details_html}</td>
+        </tr>
+        """
+        return row_html
+
+    def create_single_test_row(test):
+        test_id = test['test_id']
+        test_name = test['test_name']
+        current_status = test['status']
+        
+        status_class = 'status-passed' if current_status in ['Passed', 'Success'] else 'status-failed'
+        
+        details_html = create_details_html(test)
+        
+        row_html = f"""
+        <tr class="test-row" onclick="toggleDetails('{test_id}')">
+            <td><span class=\"idtag\">{test_id}</span>{test_name}</td>
+            <td class='status {status_class}'>{current_status}</td>
+        </tr>
+        <tr>
+            <td colspan="2">{details_html}</td>
+        </tr>
+        """
+        return row_html
+
+    # Build section HTML (joins will yield empty strings when no differences)
+    flaky_regressions = sum(1 for current, _, _ in regressions if current['test_id'] in flaky)
+    regressions_html = "".join([create_test_row(*entry) for entry in regressions])
+    improvements_html = "".join([create_test_row(*entry) for entry in improvements])
+    payload_changed_html = "".join([create_test_row(*entry) for entry in payload_changed])
+    new_tests_html = "".join([create_single_test_row(test) for test in new_tests])
+    removed_tests_html = "".join([create_single_test_row(test) for test in removed_tests])
+
+    # --- 4. Generate final HTML from an embedded template ---
+    html_content = f"""
+    <!DOCTYPE html>
+    <html lang="en">
+    <head>
+        <meta charset="UTF-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+        <title>Firebolt Schema Validation Comparison Report</title>
+        {asset_tag("regression-report", "css", REGRESSION_CSS, page_dir)}
     </head>
     <body>
         <div class="container">
@@ -393,11 +576,16 @@ def generate_comparison_report():
                 <div class="summary-card regressions">
                     <h3>🚨Regressions</h3>
                     <div class="count">{len(regressions)}</div>
+                    {f'<div class="count-note">{flaky_regressions} flaky</div>' if flaky_regressions else ''}
                 </div>
                 <div class="summary-card improvements">
                     <h3>✨Improvements</h3>
                     <div class="count">{len(improvements)}</div>
                 </div>
+                <div class="summary-card changed">
+                    <h3>🔀Payload Changed</h3>
+                    <div class="count">{len(payload_changed)}</div>
+                </div>
                 <div class="summary-card new">
                     <h3>💡New Tests</h3>
                     <div class="count">{len(new_tests)}</div>
@@ -428,6 +616,16 @@ def generate_comparison_report():
                 </div>
             </div>
 
+            <div class="section">
+                <h2 class="section-title" data-target="payload-changed"><span style="color: #b8860b;">&#x1f500;</span>Payload Changed ({len(payload_changed)})<span class="section-inline-desc">(Same Status, Different Request/Response/Error)</span></h2>
+                <div id="section-payload-changed" class="section-body">
+                    <table>
+                        <thead><tr><th>Test Name</th><th>Base Status</th><th>Current Status</th></tr></thead>
+                        <tbody>{payload_changed_html}</tbody>
+                    </table>
+                </div>
+            </div>
+
             <div class="section">
                 <h2 class="section-title" data-target="new-tests"><span style="color: #007bff;">&#x1f4a1;</span>New Tests ({len(new_tests)})<span class="section-inline-desc">(Only in Current)</span></h2>
                 <div id="section-new-tests" class="section-body">
@@ -449,31 +647,7 @@ def generate_comparison_report():
             </div>
         </div>
 
-        <script>
-            function toggleDetails(testId) {{
-                const details = document.getElementById('details-' + testId);
-                if (details.style.display === 'block') {{
-                    details.style.display = 'none';
-                }} else {{
-                    details.style.display = 'block';
-                }}
-            }}
-
-            function toggleSection(sectionKey) {{
-                const body = document.getElementById('section-' + sectionKey);
-                if (!body) return;
-                body.style.display = (body.style.display === 'block') ? 'none' : 'block';
-            }}
-
-            document.addEventListener('DOMContentLoaded', function () {{
-                // Click to toggle each section
-                const headers = document.querySelectorAll('.section-title');
-                headers.forEach(h => {{
-                    h.addEventListener('click', () => toggleSection(h.dataset.target));
-                }});
-                // Keep all sections collapsed by default
-            }});
-        </script>
+        {asset_tag("regression-report", "js", REGRESSION_JS, page_dir)}
     </body>
     </html>
     """
@@ -712,10 +886,12 @@ def generate_comparison_report():
     </html>
     """
     
-    with open("fb_coreSDK_schema_validation_regression_result.html", 'w') as f:
-        f.write(html_content)
+    with span('write page'):
+        with open(out_path, 'w') as f:
+            f.write(html_content)
     
-    print(f"[SUCCESS] Generated comparison report: fb_coreSDK_schema_validation_regression_result.html")
+    print(f"[SUCCESS] Generated comparison report: {out_path}")
 
 if __name__ == "__main__":
-    generate_comparison_report()
+    with span('generate comparison report'):
+        generate_comparison_report()
@@ -0,0 +1,179 @@
+import os
+import json
+import argparse
+import datetime
+from functools import lru_cache
+
+from build_test_db import DEFAULT_DB_PATH, PASS_STATUSES, WORKSPACE, connect, ingest
+from results_layout import CATEGORIES
+
+# Flaky tests per branch/proposition, committed with the other tabs and read by the report pages
+FLAKY_PATH = os.path.join(WORKSPACE, 'tabs', 'flaky_tests.json')
+FLAKY_VERSION = 1
+# Only the newest executions of a test count, so a test that was fixed long ago stops being flaky
+DEFAULT_WINDOW = 100
+# A test is flaky when it ran at least MIN_RUNS times in the window and its outcome flipped
+# between Passed and Failed at least MIN_FLIPS times, in at least MIN_FLIP_RATE of its transitions
+MIN_RUNS = 5
+MIN_FLIPS = 2
+MIN_FLIP_RATE = 0.2
+
+
+class OutcomeBits:
+    """Pass/fail history of one test in one branch/proposition series, bit-packed into an int.
+
+    Bit k of failed is set when the k-th execution of the test failed. Skipped runs and runs
+    without the test add no bit, so adjacent bits are always adjacent executions and flips,
+    rates and streaks reduce to a few shifts, xors and popcounts over the whole history.
+    """
+
+    __slots__ = ('runs', 'failed')
+
+    def __init__(self):
+        self.runs = 0
+        self.failed = 0
+
+    def add(self, failed):
+        if failed:
+            self.failed |= 1 << self.runs
+        self.runs += 1
+
+
+def outcome_stats(failed, runs, window=None):
+    """Flip/failure rates and streaks of a bit-packed history (bit runs-1 is the newest execution)."""
+    if window and runs > window:
+        failed >>= runs - window
+        runs = window
+    mask = (1 << runs) - 1
+    failures = failed.bit_count()
+    # Bit i of failed ^ (failed >> 1) is set where executions i and i+1 disagree
+    flips = ((failed ^ (failed >> 1)) & (mask >> 1)).bit_count()
+    newest_failed = (failed >> (runs - 1)) & 1
+    # Current streak: executions since the newest bit of the opposite outcome
+    streak = runs - ((~failed & mask) if newest_failed else failed).bit_length()
+    # Each x &= x >> 1 shortens every run of ones by one bit
+    longest, x = 0, failed
+    while x:
+        x &= x >> 1
+        longest += 1
+    return {
+        'runs': runs,
+        'failures': failures,
+        'flips': flips,
+        'failure_rate': round(failures / runs, 3),
+        'flip_rate': round(flips / (runs - 1), 3) if runs > 1 else 0.0,
+        'streak': streak,
+        'streak_status': 'Failed' if newest_failed else 'Passed',
+        'longest_failure_streak': longest,
+    }
+
+
+def is_flaky(stats, min_runs=MIN_RUNS, min_flips=MIN_FLIPS, min_flip_rate=MIN_FLIP_RATE):
+    return stats['runs'] >= min_runs and stats['flips'] >= min_flips and stats['flip_rate'] >= min_flip_rate
+
+
+def load_outcomes(conn, categories=None):
+    """{(suite, category, branch, proposition): {test_id: OutcomeBits}} from every indexed run."""
+    query = ('SELECT r.suite, r.category, r.branch, r.proposition, t.test_id, t.status '
+             'FROM test_results t JOIN runs r ON r.id = t.run_id '
+             f"WHERE t.status IN ({', '.join('?' * (len(PASS_STATUSES) + 1))})")
+    params = [*PASS_STATUSES, 'Failed']
+    if categories:
+        query += f" AND r.category IN ({', '.join('?' * len(categories))})"
+        params += categories
+    query += ' ORDER BY r.suite, r.category, r.branch, r.proposition, r.run_ts'
+    series = {}
+    key = tests = None
+    for suite, category, branch, proposition, test_id, status in conn.execute(query, params):
+        if key != (suite, category, branch, proposition):
+            key = (suite, category, branch, proposition)
+            tests = series.setdefault(key, {})
+        bits = tests.get(test_id)
+        if bits is None:
+            bits = tests[test_id] = OutcomeBits()
+        bits.add(status == 'Failed')
+    return series
+
+
+def find_flaky(series, window=DEFAULT_WINDOW, **criteria):
+    """flaky_tests.json content: the flaky tests of every series with their stats."""
+    out = []
+    for (suite, category, branch, proposition), tests in sorted(series.items()):
+        flaky = {}
+        for test_id, bits in tests.items():
+            stats = outcome_stats(bits.failed, bits.runs, window)
+            if is_flaky(stats, **criteria):
+                flaky[test_id] = stats
+        if flaky:
+            out.append({'suite': suite, 'category': category, 'branch': branch, 'proposition': proposition,
+                        'tests': dict(sorted(flaky.items()))})
+    return {
+        'version': FLAKY_VERSION,
+        'generated': datetime.datetime.now().isoformat(timespec='seconds'),
+        'window': window,
+        'series': out,
+    }
+
+
+@lru_cache(maxsize=None)
+def load_flaky(path=FLAKY_PATH):
+    """{(category, branch, proposition): {suite: {test_id: stats}}} from the saved list; {} without one."""
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get('version') != FLAKY_VERSION:
+        return {}
+    flaky = {}
+    for series in data['series']:
+        key = (series['category'], series['branch'], series['proposition'])
+        flaky.setdefault(key, {})[series['suite']] = series['tests']
+    return flaky
+
+
+def flaky_for(run, suite=None, path=FLAKY_PATH):
+    """{test_id: stats} of the flaky tests of run's branch/proposition (run starts with category, branch,
+    proposition); every suite's tests are merged unless suite is given."""
+    suites = load_flaky(path).get(tuple(run[:3]), {}) if run else {}
+    if suite:
+        return suites.get(suite, {})
+    merged = {}
+    for tests in suites.values():
+        merged.update(tests)
+    return merged
+
+
+def main():
+    parser = argparse.ArgumentParser(description='List tests whose outcome keeps flipping between runs of the same branch/proposition.')
+    parser.add_argument('--db', default=os.getenv('RESULTS_DB', DEFAULT_DB_PATH), help='SQLite database path (see build_test_db.py)')
+    parser.add_argument('--category', action='append', choices=CATEGORIES, help='Only analyze this category (repeatable)')
+    parser.add_argument('--no-ingest', action='store_true', help='Use the database as-is instead of ingesting new runs first')
+    parser.add_argument('--window', type=int, default=DEFAULT_WINDOW,
+                        help=f'Newest executions per test to consider (default: {DEFAULT_WINDOW}; 0 for all)')
+    parser.add_argument('--min-runs', type=int, default=MIN_RUNS, help=f'Minimum executions in the window (default: {MIN_RUNS})')
+    parser.add_argument('--min-flips', type=int, default=MIN_FLIPS, help=f'Minimum pass/fail flips (default: {MIN_FLIPS})')
+    parser.add_argument('--min-flip-rate', type=float, default=MIN_FLIP_RATE,
+                        help=f'Minimum share of transitions that flip (default: {MIN_FLIP_RATE})')
+    parser.add_argument('--out', default=FLAKY_PATH, help='Output JSON (default: tabs/flaky_tests.json)')
+    args = parser.parse_args()
+
+    conn = connect(args.db)
+    if not args.no_ingest:
+        ingested, skipped, removed = ingest(conn, WORKSPACE, args.category)
+        print(f"[INFO] Ingested {ingested} run(s), {skipped} unchanged, {removed} removed: {args.db}")
+    series = load_outcomes(conn, args.category)
+    conn.close()
+
+    result = find_flaky(series, args.window or None, min_runs=args.min_runs, min_flips=args.min_flips,
+                        min_flip_rate=args.min_flip_rate)
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, 'w') as f:
+        json.dump(result, f, indent=1)
+    tests = sum(len(tests) for tests in series.values())
+    flaky = sum(len(s['tests']) for s in result['series'])
+    print(f"[SUCCESS] {flaky} flaky test(s) out of {tests} across {len(series)} branch/proposition series: {args.out}")
+
+
+if __name__ == '__main__':
+    main()
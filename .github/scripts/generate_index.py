@@ -1,109 +1,334 @@
 import os
+import sys
 import json
-from glob import glob
+import hashlib
+import argparse
+from functools import cached_property, lru_cache
+from operator import attrgetter
+
+from instrument import add_trace_argument, enable_from_args, span, timed_iter
+from report_assets import VendorError, asset_tag, vendor_tag
+from results_layout import iter_summary_files
+from run_history import HISTORY_FILE, iter_records
+from run_index import update_run_index
 
 # WORKSPACE is the root of the repo (two directories up from .github/scripts/)
 WORKSPACE = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-SUMMARY_FILES = list(glob(os.path.join(WORKSPACE, '**/web_result/summary.json'), recursive=True))
+# Manifest of every summary.json seen by the previous build (path -> stat + parsed rows, and how far
+# its history.jsonl was read). It lives next to the tabs so the workflow commits it together with them.
+TABS_DIR = os.path.join(WORKSPACE, 'tabs')
+MANIFEST_PATH = os.path.join(TABS_DIR, 'index_manifest.json')
+MANIFEST_VERSION = 3
+TEST_KEYS = ['core_sanity_test', 'badger_sanity_test']
+# Columnar dataset fetched by the Search and Graphs tabs instead of inlining the report list twice
+REPORTS_DATA_NAME = 'reports_data.json'
+DATASET_VERSION = 1
+# Columns stored as indexes into a shared per-field dictionary
+DICT_COLUMNS = ['category', 'branch', 'proposition', 'test_type']
+REPORT_COLUMNS = ['category', 'branch', 'proposition', 'date', 'html_path', 'test_type', 'image', 'rdk_version',
+                  'total', 'passed', 'failed', 'skipped', 'pass_rate']
+HISTORY_COLUMNS = ['category', 'branch', 'proposition', 'date', 'test_type', 'total', 'passed', 'failed', 'skipped',
+                   'pass_rate']
+
+# Loader shared by both tabs. They are iframes of index.html, so the decoded rows are kept on the
+# parent window and fetched once per page view; the file itself is cached by its versioned URL.
+REPORTS_DATA_LOADER_JS = '''
+        function decodeColumns(table, dicts) {
+            const names = Object.keys(table).filter(n => n !== 'length');
+            const rows = new Array(table.length);
+            for (let i = 0; i < table.length; i++) {
+                const row = {};
+                for (const name of names) {
+                    row[name] = dicts[name] ? dicts[name][table[name][i]] : table[name][i];
+                }
+                rows[i] = row;
+            }
+            return rows;
+        }
+        
+        function loadReportsData() {
+            let host = window;
+            try {
+                if (window.parent !== window && window.parent.location.origin === window.location.origin) host = window.parent;
+            } catch (e) {}
+            const key = '__reportsData_' + REPORTS_DATA_VERSION;
+            if (!host[key]) {
+                host[key] = fetch('reports_data.json?v=' + REPORTS_DATA_VERSION)
+                    .then(r => {
+                        if (!r.ok) throw new Error('HTTP ' + r.status);
+                        return r.json();
+                    })
+                    .then(d => ({ reports: decodeColumns(d.reports, d.dicts), history: decodeColumns(d.history, d.dicts) }));
+                host[key].catch(() => { delete host[key]; });
+            }
+            return host[key];
+        }
+'''
+
 
-# Structure: { 'develop': {branch: [ (proposition, date, html_path) ] }, 'release': {...} }
-results = {'develop': {}, 'release': {}}
+def find_summary_files(changed_dirs=None):
+    """Yields the summary.json files of the whole results tree, or only of the given directories.
 
-for summary_path in SUMMARY_FILES:
+    Only <category>/<branch>/<proposition>/web_result/ can hold one, so the walk never enters run
+    directories or anything outside develop/ and release/ (see results_layout.iter_summary_files).
+    """
+    scopes = None
+    if changed_dirs:
+        scopes = [os.path.relpath(os.path.join(WORKSPACE, d), WORKSPACE) for d in changed_dirs]
+    return iter_summary_files(WORKSPACE, scopes)
+
+
+def load_summary_rows(summary_path):
+    """Parses one summary.json into index rows.
+
+    Each row is [category, branch, proposition, date, html_path, key, image, rdk_version, result_data].
+    """
+    rows = []
+    with open(summary_path) as f:
+        summary = json.load(f)
+    # Extract proposition from folder path (2 levels up from summary.json)
+    # Path structure: .../branch/proposition/web_result/summary.json
+    web_result_dir = os.path.dirname(summary_path)
+    proposition_from_path = os.path.basename(os.path.dirname(web_result_dir))
+    for key in TEST_KEYS:
+        if key in summary:
+            entry = summary[key]
+            cat = entry.get('result_category', 'develop')
+            branch = entry.get('branch', 'unknown')
+            proposition = proposition_from_path  # Use folder name instead of JSON value
+            date = entry.get('date', 'unknown')
+            image = entry.get('image', '')
+            rdk_version = entry.get('RDK version', '')
+            result_data = entry.get('result', {})
+            # Find HTML file in same dir
+            html_name = 'fb_core_sanity_result.html' if key == 'core_sanity_test' else 'fb_badger_sanity_result.html'
+            html_path = os.path.relpath(os.path.join(os.path.dirname(summary_path), html_name), WORKSPACE)
+            if not os.path.exists(os.path.join(WORKSPACE, html_path)):
+                continue
+            rows.append([cat, branch, proposition, date, html_path, key, image, rdk_version, result_data])
+    return rows
+
+
+def load_manifest():
     try:
-        with open(summary_path) as f:
-            summary = json.load(f)
-        # Extract proposition from folder path (2 levels up from summary.json)
-        # Path structure: .../branch/proposition/web_result/summary.json
-        web_result_dir = os.path.dirname(summary_path)
-        proposition_from_path = os.path.basename(os.path.dirname(web_result_dir))
-        for key in ['core_sanity_test', 'badger_sanity_test']:
-            if key in summary:
-                entry = summary[key]
-                cat = entry.get('result_category', 'develop')
-                branch = entry.get('branch', 'unknown')
-                proposition = proposition_from_path  # Use folder name instead of JSON value
-                date = entry.get('date', 'unknown')
-                image = entry.get('image', '')
-                rdk_version = entry.get('RDK version', '')
-                result_data = entry.get('result', {})
-                # Find HTML file in same dir
-                html_name = 'fb_core_sanity_result.html' if key == 'core_sanity_test' else 'fb_badger_sanity_result.html'
-                html_path = os.path.relpath(os.path.join(os.path.dirname(summary_path), html_name), WORKSPACE)
-                if not os.path.exists(os.path.join(WORKSPACE, html_path)):
-                    continue
-                if branch not in results[cat]:
-                    results[cat][branch] = []
-                results[cat][branch].append((proposition, date, html_path, key, image, rdk_version, result_data))
+        with open(MANIFEST_PATH) as f:
+            manifest = json.load(f)
+        if manifest.get('version') == MANIFEST_VERSION:
+            return manifest
+        print(f"[INFO] Manifest version changed; rebuilding index from scratch")
+    except FileNotFoundError:
+        print(f"[INFO] No index manifest found; rebuilding index from scratch")
     except Exception as e:
-        print(f"[WARN] Could not process {summary_path}: {e}")
-
-# Generate HTML for summary_tab.html
-summary_html = [
-    '<table class="summary-table">',
-    '<tr><th class="col-title">Develop</th><th class="col-title">Release</th></tr>',
-    '<tr>'
-]
-import datetime
-def parse_date(dt):
+        print(f"[WARN] Could not read {MANIFEST_PATH}: {e}")
+    return {'version': MANIFEST_VERSION, 'summaries': {}, 'tabs': {}}
+
+
+def save_manifest(manifest):
+    os.makedirs(os.path.dirname(MANIFEST_PATH), exist_ok=True)
+    with open(MANIFEST_PATH, 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+
+
+def refresh_manifest(manifest, changed_dirs=None):
+    """Re-reads only the summary.json files that are new or whose mtime/size changed, and the
+    history.jsonl records appended since the previous build.
+
+    history.jsonl is checked on its own: batch rebuilds append to it without rewriting summary.json.
+    With changed_dirs, only those directories are looked at and every other entry is
+    trusted as-is, so a push that wrote a single RESULT_DIR costs one summary read.
+    Returns the number of summaries that were (re)parsed or dropped, or whose history grew.
+    """
+    entries = manifest['summaries']
+    seen = set()
+    changed = 0
+    # Discovery runs ahead on its own threads; its share of the loop is timed as 'find summaries'
+    for summary_path in timed_iter('find summaries', find_summary_files(changed_dirs)):
+        rel_path = os.path.relpath(summary_path, WORKSPACE)
+        seen.add(rel_path)
+        try:
+            st = os.stat(summary_path)
+        except OSError as e:
+            print(f"[WARN] Could not stat {summary_path}: {e}")
+            continue
+        entry = entries.get(rel_path)
+        if entry and entry['mtime_ns'] == st.st_mtime_ns and entry['size'] == st.st_size:
+            rows = entry['rows']
+        else:
+            try:
+                rows = load_summary_rows(summary_path)
+            except Exception as e:
+                print(f"[WARN] Could not process {summary_path}: {e}")
+                rows = []
+        history = refresh_history(summary_path, entry.get('history') if entry else None)
+        if entry and rows is entry['rows'] and history is entry.get('history'):
+            continue
+        entries[rel_path] = {'mtime_ns': st.st_mtime_ns, 'size': st.st_size, 'rows': rows, 'history': history}
+        changed += 1
+    # Drop entries whose summary.json disappeared (only within the scanned scope)
+    if changed_dirs:
+        scopes = [os.path.relpath(os.path.join(WORKSPACE, d), WORKSPACE) + os.sep for d in changed_dirs]
+        stale = [p for p in entries if p not in seen and any(p.startswith(s) for s in scopes)]
+    else:
+        stale = [p for p in entries if p not in seen]
+    for rel_path in stale:
+        del entries[rel_path]
+        changed += 1
+    return changed
+
+
+def refresh_history(summary_path, history=None):
+    """Advances past the history.jsonl records appended since the previous build.
+
+    The manifest only keeps where the complete records end (offset), their count and the file's
+    mtime/size, not the records themselves: they are streamed from history.jsonl when the store is
+    loaded (history_points), so the committed manifest does not grow with every run. Returns
+    history itself when the file's mtime and size are unchanged.
+    """
+    history_file = os.path.join(os.path.dirname(summary_path), HISTORY_FILE)
     try:
-        return datetime.datetime.strptime(dt, "%Y%m%d_%H%M%S")
-    except Exception:
-        return datetime.datetime.min
-
-for col in ['develop', 'release']:
-    col_html = ['<div class="col">']
-    # Group by branch, sort branches by latest report date
-    branch_dates = []
-    for branch, reports in results[col].items():
-        # Find latest date for this branch
-        latest_date = max((parse_date(r[1]) for r in reports), default=datetime.datetime.min)
-        branch_dates.append((branch, latest_date))
-    branch_dates.sort(key=lambda x: x[1], reverse=True)
-    for branch, _ in branch_dates:
-        reports = results[col][branch]
-        # Group reports by proposition
-        prop_groups = {}
-        for proposition, date, html_path, key, image, rdk_version, result_data in reports:
-            if proposition not in prop_groups:
-                prop_groups[proposition] = {}
-            prop_groups[proposition][key] = (date, html_path, image, rdk_version, result_data)
-        
-        col_html.append(f'<details style="margin-bottom:10px;"><summary class="branch">{branch}</summary><div class="prop-list">')
-        
-        for proposition, tests in prop_groups.items():
-            # Build each test row
-            test_rows = []
-            for key in ['core_sanity_test', 'badger_sanity_test']:
-                if key in tests:
-                    date, html_path, image, rdk_version, result_data = tests[key]
-                    link_path = '../' + html_path
-                    label = 'Core Sanity' if key == 'core_sanity_test' else 'Badger Sanity'
-                    total = result_data.get('Total', 0)
-                    passed = result_data.get('passed', 0)
-                    failed = result_data.get('failed', 0)
-                    skipped = result_data.get('skiped', 0)
-                    pass_pct = round((passed / total * 100), 1) if total > 0 else 0
-                    fail_pct = round((failed / total * 100), 1) if total > 0 else 0
-                    skip_pct = round((skipped / total * 100), 1) if total > 0 else 0
-                    test_rows.append(f'<a href="{link_path}" target="_blank" class="test-link"><span class="lbl">{label}</span><span class="nums"><span class="p">{passed}</span><span class="f">{failed}</span><span class="s">{skipped}</span></span><span class="bar"><span class="bp" style="width:{pass_pct}%"></span><span class="bf" style="width:{fail_pct}%"></span><span class="bs" style="width:{skip_pct}%"></span></span></a>')
-            # Build complete card
-            card_html = f'''<div class="prop-row">
-                <div class="prop-name">{proposition}</div>
-                <div class="prop-tests">{''.join(test_rows)}</div>
-            </div>'''
-            col_html.append(card_html)
-        col_html.append('</div></details>')
-    col_html.append('</div>')
-    summary_html.append(f'<div class="column">{''.join(col_html)}</div>')
+        st = os.stat(history_file)
+    except FileNotFoundError:
+        if history and not history['offset']:
+            return history
+        return {'offset': 0, 'records': 0}
+    if history and history.get('mtime_ns') == st.st_mtime_ns and history.get('size') == st.st_size:
+        return history
+    if not history or st.st_size < history['offset']:
+        # First read, or the file was rewritten rather than appended to
+        history = {'offset': 0, 'records': 0}
+    offset, records = history['offset'], history['records']
+    try:
+        for offset, _ in iter_records(history_file, offset):
+            records += 1
+    except Exception as e:
+        print(f"[WARN] Could not read {history_file}: {e}")
+    return {'offset': offset, 'records': records, 'mtime_ns': st.st_mtime_ns, 'size': st.st_size}
 
-summary_tab_path = os.path.join(WORKSPACE, 'tabs', 'summary_tab.html')
-html_out = '''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <title>Summary</title>
-    <style>
+
+def history_points(summary_path, history):
+    """Streams the history points of one proposition, up to the offset the manifest has seen.
+
+    Points are [category, branch, proposition, date, key, passed, failed, skipped, total].
+    """
+    history_file = os.path.join(os.path.dirname(summary_path), HISTORY_FILE)
+    proposition = os.path.basename(os.path.dirname(os.path.dirname(summary_path)))
+    if not history or not history['offset']:
+        return
+    try:
+        for offset, record in iter_records(history_file):
+            if offset > history['offset']:
+                return
+            result_data = record.get('result', {})
+            yield [record.get('result_category', 'develop'), record.get('branch', 'unknown'), proposition,
+                   record.get('date', 'unknown'), record.get('key'), result_data.get('passed', 0),
+                   result_data.get('failed', 0), result_data.get('skiped', 0), result_data.get('Total', 0)]
+    except Exception as e:
+        print(f"[WARN] Could not read {history_file}: {e}")
+
+
+def run_started(date):
+    """Run directory name YYYYMMDD_HHMMSS as a sortable integer; 0 (oldest) if it is not one."""
+    if isinstance(date, str) and len(date) == 15 and date[8] == '_' and date[:8].isdigit() and date[9:].isdigit():
+        return int(date[:8] + date[9:])
+    return 0
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class RunRecord:
+    """One suite's result in one run: a summary.json row (the published run) or a history point.
+
+    Strings are interned, since a few hundred distinct branches, propositions and dates repeat
+    across every record; the run's start (run_started) and pass rate are computed once here.
+    """
+    __slots__ = ('category', 'branch', 'proposition', 'date', 'started', 'test_type', 'html_path', 'image',
+                 'rdk_version', 'total', 'passed', 'failed', 'skipped', 'pass_rate')
+
+    def __init__(self, category, branch, proposition, date, key, passed, failed, skipped, total,
+                 html_path='', image='', rdk_version=''):
+        self.category = _intern(category)
+        self.branch = _intern(branch)
+        self.proposition = _intern(proposition)
+        self.date = _intern(date)
+        self.started = run_started(date)
+        self.test_type = 'Core Sanity' if key == 'core_sanity_test' else 'Badger Sanity'
+        # Links are relative to tabs/
+        self.html_path = '../' + html_path if html_path else ''
+        self.image = _intern(image)
+        self.rdk_version = _intern(rdk_version)
+        self.total = total
+        self.passed = passed
+        self.failed = failed
+        self.skipped = skipped
+        self.pass_rate = round((passed / total * 100), 1) if total > 0 else 0
+
+    def digest_key(self):
+        return [getattr(self, name) for name in self.__slots__]
+
+
+class ReportStore:
+    """Every report row of the manifest and history point of its history files, parsed once into RunRecords.
+
+    The tab builders share the sorted views below instead of each copying the rows.
+    """
+
+    def __init__(self, by_branch, history):
+        # {category: {branch: [RunRecord]}} in manifest order
+        self.by_branch = by_branch
+        self.reports = [r for branches in by_branch.values() for reports in branches.values() for r in reports]
+        self.history = history
+
+    @classmethod
+    def from_manifest(cls, manifest):
+        by_branch = {'develop': {}, 'release': {}}
+        history = []
+        for rel_path in sorted(manifest['summaries']):
+            entry = manifest['summaries'][rel_path]
+            for cat, branch, proposition, date, html_path, key, image, rdk_version, result_data in entry['rows']:
+                if cat not in by_branch:
+                    print(f"[WARN] Could not process {rel_path}: unknown result_category '{cat}'")
+                    continue
+                record = RunRecord(cat, branch, proposition, date, key, result_data.get('passed', 0),
+                                   result_data.get('failed', 0), result_data.get('skiped', 0),
+                                   result_data.get('Total', 0), html_path, image, rdk_version)
+                by_branch[cat].setdefault(record.branch, []).append(record)
+            for point in history_points(os.path.join(WORKSPACE, rel_path), entry.get('history')):
+                history.append(RunRecord(*point))
+        return cls(by_branch, history)
+
+    @cached_property
+    def latest_first(self):
+        """Reports, newest run first."""
+        return sorted(self.reports, key=attrgetter('started'), reverse=True)
+
+    @cached_property
+    def history_by_date(self):
+        """History points, oldest run first."""
+        return sorted(self.history, key=attrgetter('started'))
+
+    def branches(self, category):
+        """[(branch, reports)] of a category, the branch with the newest run first."""
+        branches = self.by_branch[category]
+        latest = {branch: max(r.started for r in reports) for branch, reports in branches.items()}
+        return sorted(branches.items(), key=lambda item: latest[item[0]], reverse=True)
+
+    @cached_property
+    def propositions(self):
+        return sorted(set(r.proposition for r in self.reports))
+
+    @cached_property
+    def test_types(self):
+        return sorted(set(r.test_type for r in self.reports))
+
+    def digest_key(self):
+        # History points only feed the dataset, which is digested as rendered JSON
+        return [r.digest_key() for r in self.reports]
+
+
+# Stylesheet of summary_tab.html (assets/summary-tab.<hash>.css)
+SUMMARY_TAB_CSS = '''
         * { box-sizing: border-box; }
         body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; background: linear-gradient(135deg, #f5f7fa 0%, #e4e8ec 100%); color: #1a2c42; margin: 0; padding: 0; }
         .container { display: flex; width: 100%; min-height: 100vh; }
@@ -253,273 +478,244 @@ html_out = '''<!DOCTYPE html>
         .mini-progress .passed { background: #4caf50; }
         .mini-progress .failed { background: #f44336; }
         .mini-progress .skipped { background: #ff9800; }
-    </style>
+'''
+
+
+def build_summary_tab(store):
+    # Generate HTML for summary_tab.html
+    summary_html = [
+        '<table class="summary-table">',
+        '<tr><th class="col-title">Develop</th><th class="col-title">Release</th></tr>',
+        '<tr>'
+    ]
+    for col in ['develop', 'release']:
+        col_html = ['<div class="col">']
+        # Branches with the latest report first
+        for branch, reports in store.branches(col):
+            # Group reports by proposition
+            prop_groups = {}
+            for record in reports:
+                if record.proposition not in prop_groups:
+                    prop_groups[record.proposition] = {}
+                prop_groups[record.proposition][record.test_type] = record
+        
+            col_html.append(f'<details style="margin-bottom:10px;"><summary class="branch">{branch}</summary><div class="prop-list">')
+        
+            for proposition, tests in prop_groups.items():
+                # Build each test row
+                test_rows = []
+                for label in ['Core Sanity', 'Badger Sanity']:
+                    if label in tests:
+                        record = tests[label]
+                        total = record.total
+                        passed, failed, skipped = record.passed, record.failed, record.skipped
+                        pass_pct = record.pass_rate
+                        fail_pct = round((failed / total * 100), 1) if total > 0 else 0
+                        skip_pct = round((skipped / total * 100), 1) if total > 0 else 0
+                        test_rows.append(f'<a href="{record.html_path}" target="_blank" class="test-link"><span class="lbl">{label}</span><span class="nums"><span class="p">{passed}</span><span class="f">{failed}</span><span class="s">{skipped}</span></span><span class="bar"><span class="bp" style="width:{pass_pct}%"></span><span class="bf" style="width:{fail_pct}%"></span><span class="bs" style="width:{skip_pct}%"></span></span></a>')
+                # Build complete card
+                card_html = f'''<div class="prop-row">
+                <div class="prop-name">{proposition}</div>
+                <div class="prop-tests">{''.join(test_rows)}</div>
+            </div>'''
+                col_html.append(card_html)
+            col_html.append('</div></details>')
+        col_html.append('</div>')
+        col_body = ''.join(col_html)
+        summary_html.append(f'<div class="column">{col_body}</div>')
+
+    html_out = '''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <title>Summary</title>
+    ''' + tab_assets()['summary_css'] + '''
 </head>
 <body>
     <div class="container">
         <div class="column">
             <div class="col-title">📁 Develop</div>
 '''
-html_out += summary_html[3].replace('<div class="column"><div class="col">', '').replace('</div></div>', '')
-html_out += '''
+    html_out += summary_html[3].replace('<div class="column"><div class="col">', '').replace('</div></div>', '')
+    html_out += '''
         </div>
         <div class="column">
             <div class="col-title">🚀 Release</div>
 '''
-html_out += summary_html[4].replace('<div class="column"><div class="col">', '').replace('</div></div>', '')
-html_out += '''
+    html_out += summary_html[4].replace('<div class="column"><div class="col">', '').replace('</div></div>', '')
+    html_out += '''
         </div>
     </div>
 </body>
 </html>
 '''
-with open(summary_tab_path, 'w') as f:
-        f.write(html_out)
-print(f"[SUCCESS] Updated summary_tab.html with all reports.")
-
-# Generate search_tab.html
-# Flatten all reports into a single list for search
-all_reports = []
-for cat in ['develop', 'release']:
-    for branch, reports in results[cat].items():
-        for proposition, date, html_path, key, image, rdk_version, result_data in reports:
-            total = result_data.get('Total', 0)
-            passed = result_data.get('passed', 0)
-            failed = result_data.get('failed', 0)
-            skipped = result_data.get('skiped', 0)
-            pass_rate = round((passed / total * 100), 1) if total > 0 else 0
-            all_reports.append({
-                'category': cat,
-                'branch': branch,
-                'proposition': proposition,
-                'date': date,
-                'html_path': '../' + html_path,
-                'test_type': 'Core Sanity' if key == 'core_sanity_test' else 'Badger Sanity',
-                'image': image,
-                'rdk_version': rdk_version,
-                'total': total,
-                'passed': passed,
-                'failed': failed,
-                'skipped': skipped,
-                'pass_rate': pass_rate
-            })
-
-# Sort by date descending
-all_reports.sort(key=lambda r: parse_date(r['date']), reverse=True)
-
-# Get unique values for filters
-propositions = sorted(set(r['proposition'] for r in all_reports))
-test_types = sorted(set(r['test_type'] for r in all_reports))
-
-# Find latest develop and release
-latest_develop = next((r for r in all_reports if r['category'] == 'develop'), None)
-latest_release = next((r for r in all_reports if r['category'] == 'release'), None)
-
-# Generate JSON data for JS
-import json as json_module
-reports_json = json_module.dumps(all_reports)
-
-search_tab_path = os.path.join(WORKSPACE, 'tabs', 'search_tab.html')
-search_html = f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <title>Search Reports</title>
-    <style>
-        * {{ box-sizing: border-box; }}
-        body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; background: #f4f7f9; color: #1a2c42; margin: 0; padding: 12px; }}
-        h2 {{ margin-top: 0; margin-bottom: 12px; color: #1976d2; font-size: 18px; }}
+    return html_out
+
+
+def build_reports_dataset(store):
+    """Encodes the report list (newest first) and run history (oldest first) as struct-of-arrays JSON.
+
+    Every table is {'length': n, column: [values...]}; DICT_COLUMNS hold indexes into
+    dicts[column] so repeated branch/proposition strings are stored once.
+    """
+    dicts = {name: [] for name in DICT_COLUMNS}
+    lookup = {name: {} for name in DICT_COLUMNS}
+
+    def encode(rows, columns):
+        table = {'length': len(rows)}
+        for name in columns:
+            values = list(map(attrgetter(name), rows))
+            if name in lookup:
+                codes = lookup[name]
+                for value in values:
+                    if value not in codes:
+                        codes[value] = len(dicts[name])
+                        dicts[name].append(value)
+                values = [codes[value] for value in values]
+            table[name] = values
+        return table
+
+    dataset = {
+        'version': DATASET_VERSION,
+        'reports': encode(store.latest_first, REPORT_COLUMNS),
+        'history': encode(store.history_by_date, HISTORY_COLUMNS),
+    }
+    dataset['dicts'] = dicts
+    return json.dumps(dataset, separators=(',', ':'))
+
+
+# Stylesheet and script of search_tab.html (assets/search-tab.<hash>.css/.js)
+SEARCH_TAB_CSS = '''
+        * { box-sizing: border-box; }
+        body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; background: #f4f7f9; color: #1a2c42; margin: 0; padding: 12px; }
+        h2 { margin-top: 0; margin-bottom: 12px; color: #1976d2; font-size: 18px; }
         
         /* Latest Section */
-        .latest-section {{ display: flex; gap: 12px; margin-bottom: 12px; }}
-        .latest-header {{ display: flex; justify-content: space-between; align-items: center; margin-bottom: 8px; }}
-        .latest-header h3 {{ margin: 0; color: #1976d2; font-size: 14px; }}
-        .latest-prop-select {{ padding: 4px 8px; border: 1px solid #e3e8ee; border-radius: 4px; font-size: 11px; background: white; }}
-        .latest-card {{ flex: 1; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 12px; border-radius: 8px; box-shadow: 0 2px 8px rgba(0,0,0,0.1); }}
-        .latest-card.release {{ background: linear-gradient(135deg, #11998e 0%, #38ef7d 100%); }}
-        .latest-card h3 {{ margin: 0 0 6px 0; font-size: 11px; opacity: 0.9; text-transform: uppercase; letter-spacing: 1px; }}
-        .latest-card .branch-name {{ font-size: 16px; font-weight: 700; margin-bottom: 4px; }}
-        .latest-card .test-row {{ display: flex; justify-content: space-between; align-items: center; padding: 4px 0; border-bottom: 1px solid rgba(255,255,255,0.2); }}
-        .latest-card .test-row:last-child {{ border-bottom: none; }}
-        .latest-card .test-name {{ font-size: 12px; opacity: 0.9; }}
-        .latest-card .test-rate {{ font-size: 14px; font-weight: 700; }}
-        .latest-card .test-rate.high {{ color: #90EE90; }}
-        .latest-card .test-rate.low {{ color: #FFB6C1; }}
-        .latest-card a {{ color: white; text-decoration: underline; font-size: 11px; }}
+        .latest-section { display: flex; gap: 12px; margin-bottom: 12px; }
+        .latest-header { display: flex; justify-content: space-between; align-items: center; margin-bottom: 8px; }
+        .latest-header h3 { margin: 0; color: #1976d2; font-size: 14px; }
+        .latest-prop-select { padding: 4px 8px; border: 1px solid #e3e8ee; border-radius: 4px; font-size: 11px; background: white; }
+        .latest-card { flex: 1; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 12px; border-radius: 8px; box-shadow: 0 2px 8px rgba(0,0,0,0.1); }
+        .latest-card.release { background: linear-gradient(135deg, #11998e 0%, #38ef7d 100%); }
+        .latest-card h3 { margin: 0 0 6px 0; font-size: 11px; opacity: 0.9; text-transform: uppercase; letter-spacing: 1px; }
+        .latest-card .branch-name { font-size: 16px; font-weight: 700; margin-bottom: 4px; }
+        .latest-card .test-row { display: flex; justify-content: space-between; align-items: center; padding: 4px 0; border-bottom: 1px solid rgba(255,255,255,0.2); }
+        .latest-card .test-row:last-child { border-bottom: none; }
+        .latest-card .test-name { font-size: 12px; opacity: 0.9; }
+        .latest-card .test-rate { font-size: 14px; font-weight: 700; }
+        .latest-card .test-rate.high { color: #90EE90; }
+        .latest-card .test-rate.low { color: #FFB6C1; }
+        .latest-card a { color: white; text-decoration: underline; font-size: 11px; }
         
         /* Search & Filters */
-        .search-filters {{ background: white; padding: 10px; border-radius: 8px; box-shadow: 0 2px 8px rgba(0,0,0,0.05); margin-bottom: 10px; }}
-        .search-row {{ display: flex; gap: 8px; flex-wrap: wrap; align-items: center; }}
-        .search-input {{ flex: 1; min-width: 150px; padding: 8px 12px; border: 1px solid #e3e8ee; border-radius: 6px; font-size: 13px; transition: border-color 0.2s; }}
-        .search-input:focus {{ outline: none; border-color: #1976d2; }}
-        select {{ padding: 8px 10px; border: 1px solid #e3e8ee; border-radius: 6px; font-size: 12px; background: white; cursor: pointer; min-width: 120px; }}
-        select:focus {{ outline: none; border-color: #1976d2; }}
+        .search-filters { background: white; padding: 10px; border-radius: 8px; box-shadow: 0 2px 8px rgba(0,0,0,0.05); margin-bottom: 10px; }
+        .search-row { display: flex; gap: 8px; flex-wrap: wrap; align-items: center; }
+        .search-input { flex: 1; min-width: 150px; padding: 8px 12px; border: 1px solid #e3e8ee; border-radius: 6px; font-size: 13px; transition: border-color 0.2s; }
+        .search-input:focus { outline: none; border-color: #1976d2; }
+        select { padding: 8px 10px; border: 1px solid #e3e8ee; border-radius: 6px; font-size: 12px; background: white; cursor: pointer; min-width: 120px; }
+        select:focus { outline: none; border-color: #1976d2; }
         
         /* Quick Filters */
-        .quick-filters {{ margin-top: 8px; display: flex; gap: 6px; flex-wrap: wrap; }}
-        .quick-btn {{ padding: 4px 10px; border: none; border-radius: 12px; font-size: 11px; cursor: pointer; transition: all 0.2s; }}
-        .quick-btn.all {{ background: #e3f2fd; color: #1976d2; }}
-        .quick-btn.passed {{ background: #e8f5e9; color: #2e7d32; }}
-        .quick-btn.failed {{ background: #ffebee; color: #c62828; }}
-        .quick-btn.develop {{ background: #ede7f6; color: #5e35b1; }}
-        .quick-btn.release {{ background: #e0f2f1; color: #00695c; }}
-        .quick-btn:hover {{ transform: translateY(-1px); box-shadow: 0 2px 8px rgba(0,0,0,0.1); }}
-        .quick-btn.active {{ box-shadow: inset 0 2px 4px rgba(0,0,0,0.2); }}
+        .quick-filters { margin-top: 8px; display: flex; gap: 6px; flex-wrap: wrap; }
+        .quick-btn { padding: 4px 10px; border: none; border-radius: 12px; font-size: 11px; cursor: pointer; transition: all 0.2s; }
+        .quick-btn.all { background: #e3f2fd; color: #1976d2; }
+        .quick-btn.passed { background: #e8f5e9; color: #2e7d32; }
+        .quick-btn.failed { background: #ffebee; color: #c62828; }
+        .quick-btn.develop { background: #ede7f6; color: #5e35b1; }
+        .quick-btn.release { background: #e0f2f1; color: #00695c; }
+        .quick-btn:hover { transform: translateY(-1px); box-shadow: 0 2px 8px rgba(0,0,0,0.1); }
+        .quick-btn.active { box-shadow: inset 0 2px 4px rgba(0,0,0,0.2); }
         
         /* Results Count & Sort */
-        .results-header {{ display: flex; justify-content: space-between; align-items: center; margin-bottom: 8px; }}
-        .results-count {{ color: #666; font-size: 12px; }}
-        .sort-select {{ padding: 6px 10px; border: 1px solid #e3e8ee; border-radius: 4px; font-size: 11px; }}
+        .results-header { display: flex; justify-content: space-between; align-items: center; margin-bottom: 8px; }
+        .results-count { color: #666; font-size: 12px; }
+        .sort-select { padding: 6px 10px; border: 1px solid #e3e8ee; border-radius: 4px; font-size: 11px; }
         
         /* Results Grid */
-        .results-grid {{ display: grid; grid-template-columns: repeat(auto-fill, minmax(320px, 1fr)); gap: 10px; }}
-        .result-card {{ background: white; border-radius: 8px; padding: 12px; box-shadow: 0 1px 4px rgba(0,0,0,0.05); transition: transform 0.2s, box-shadow 0.2s; }}
-        .result-card:hover {{ transform: translateY(-1px); box-shadow: 0 2px 8px rgba(0,0,0,0.1); }}
-        .result-header {{ display: flex; justify-content: space-between; align-items: flex-start; margin-bottom: 6px; }}
-        .result-title {{ font-size: 14px; font-weight: 600; color: #1976d2; margin: 0; }}
-        .result-title a {{ color: inherit; text-decoration: none; }}
-        .result-title a:hover {{ text-decoration: underline; }}
-        .badge {{ padding: 2px 6px; border-radius: 8px; font-size: 9px; font-weight: 600; text-transform: uppercase; }}
-        .badge.develop {{ background: #ede7f6; color: #5e35b1; }}
-        .badge.release {{ background: #e0f2f1; color: #00695c; }}
-        .badge.coresanity {{ background: #fff3e0; color: #e65100; }}
-        .badge.badgersanity {{ background: #e1f5fe; color: #0277bd; }}
+        .results-grid { display: grid; grid-template-columns: repeat(auto-fill, minmax(320px, 1fr)); gap: 10px; }
+        .result-card { background: white; border-radius: 8px; padding: 12px; box-shadow: 0 1px 4px rgba(0,0,0,0.05); transition: transform 0.2s, box-shadow 0.2s; }
+        .result-card:hover { transform: translateY(-1px); box-shadow: 0 2px 8px rgba(0,0,0,0.1); }
+        .result-header { display: flex; justify-content: space-between; align-items: flex-start; margin-bottom: 6px; }
+        .result-title { font-size: 14px; font-weight: 600; color: #1976d2; margin: 0; }
+        .result-title a { color: inherit; text-decoration: none; }
+        .result-title a:hover { text-decoration: underline; }
+        .badge { padding: 2px 6px; border-radius: 8px; font-size: 9px; font-weight: 600; text-transform: uppercase; }
+        .badge.develop { background: #ede7f6; color: #5e35b1; }
+        .badge.release { background: #e0f2f1; color: #00695c; }
+        .badge.coresanity { background: #fff3e0; color: #e65100; }
+        .badge.badgersanity { background: #e1f5fe; color: #0277bd; }
         
         /* Test Section */
-        .test-section {{ margin: 8px 0; padding: 8px; background: #fafafa; border-radius: 6px; border-left: 3px solid #1976d2; }}
-        .test-section-header {{ display: flex; align-items: center; gap: 8px; margin-bottom: 4px; }}
-        .pass-rate-inline {{ font-weight: 700; font-size: 12px; }}
-        .pass-rate-inline.high {{ color: #2e7d32; }}
-        .pass-rate-inline.medium {{ color: #e65100; }}
-        .pass-rate-inline.low {{ color: #c62828; }}
-        .view-link {{ font-size: 10px; color: #1976d2; text-decoration: none; margin-left: auto; }}
-        .view-link:hover {{ text-decoration: underline; }}
+        .test-section { margin: 8px 0; padding: 8px; background: #fafafa; border-radius: 6px; border-left: 3px solid #1976d2; }
+        .test-section-header { display: flex; align-items: center; gap: 8px; margin-bottom: 4px; }
+        .pass-rate-inline { font-weight: 700; font-size: 12px; }
+        .pass-rate-inline.high { color: #2e7d32; }
+        .pass-rate-inline.medium { color: #e65100; }
+        .pass-rate-inline.low { color: #c62828; }
+        .view-link { font-size: 10px; color: #1976d2; text-decoration: none; margin-left: auto; }
+        .view-link:hover { text-decoration: underline; }
         
-        .result-meta {{ display: flex; gap: 12px; margin-bottom: 6px; font-size: 11px; color: #666; }}
-        .result-meta span {{ display: flex; align-items: center; gap: 2px; }}
+        .result-meta { display: flex; gap: 12px; margin-bottom: 6px; font-size: 11px; color: #666; }
+        .result-meta span { display: flex; align-items: center; gap: 2px; }
         
         /* Progress Bar */
-        .progress-container {{ margin-top: 6px; }}
-        .progress-bar {{ height: 6px; background: #e3e8ee; border-radius: 3px; overflow: hidden; display: flex; }}
-        .progress-passed {{ background: #4caf50; }}
-        .progress-failed {{ background: #f44336; }}
-        .progress-skipped {{ background: #ff9800; }}
-        .progress-stats {{ display: flex; justify-content: space-between; margin-top: 4px; font-size: 10px; }}
-        .stat-passed {{ color: #4caf50; }}
-        .stat-failed {{ color: #f44336; }}
-        .stat-skipped {{ color: #ff9800; }}
+        .progress-container { margin-top: 6px; }
+        .progress-bar { height: 6px; background: #e3e8ee; border-radius: 3px; overflow: hidden; display: flex; }
+        .progress-passed { background: #4caf50; }
+        .progress-failed { background: #f44336; }
+        .progress-skipped { background: #ff9800; }
+        .progress-stats { display: flex; justify-content: space-between; margin-top: 4px; font-size: 10px; }
+        .stat-passed { color: #4caf50; }
+        .stat-failed { color: #f44336; }
+        .stat-skipped { color: #ff9800; }
         
         /* Details Section */
-        .result-details {{ margin-top: 6px; padding-top: 6px; border-top: 1px solid #e3e8ee; font-size: 10px; }}
-        .detail-row {{ display: flex; margin-bottom: 2px; }}
-        .detail-label {{ width: 70px; color: #888; }}
-        .detail-value {{ color: #333; word-break: break-all; flex: 1; }}
+        .result-details { margin-top: 6px; padding-top: 6px; border-top: 1px solid #e3e8ee; font-size: 10px; }
+        .detail-row { display: flex; margin-bottom: 2px; }
+        .detail-label { width: 70px; color: #888; }
+        .detail-value { color: #333; word-break: break-all; flex: 1; }
         
         /* Pass Rate Circle */
-        .pass-rate {{ width: 44px; height: 44px; border-radius: 50%; display: flex; flex-direction: column; align-items: center; justify-content: center; font-weight: 700; font-size: 12px; }}
-        .pass-rate.high {{ background: #e8f5e9; color: #2e7d32; }}
-        .pass-rate.medium {{ background: #fff3e0; color: #e65100; }}
-        .pass-rate.low {{ background: #ffebee; color: #c62828; }}
-        .pass-rate span {{ font-size: 8px; font-weight: 400; }}
+        .pass-rate { width: 44px; height: 44px; border-radius: 50%; display: flex; flex-direction: column; align-items: center; justify-content: center; font-weight: 700; font-size: 12px; }
+        .pass-rate.high { background: #e8f5e9; color: #2e7d32; }
+        .pass-rate.medium { background: #fff3e0; color: #e65100; }
+        .pass-rate.low { background: #ffebee; color: #c62828; }
+        .pass-rate span { font-size: 8px; font-weight: 400; }
         
         /* No Results */
-        .no-results {{ text-align: center; padding: 40px; color: #888; }}
+        .no-results { text-align: center; padding: 40px; color: #888; }
         
         /* Actions */
-        .result-actions {{ margin-top: 6px; display: flex; gap: 4px; }}
-        .action-btn {{ padding: 4px 8px; border: 1px solid #e3e8ee; border-radius: 4px; font-size: 10px; cursor: pointer; background: white; color: #666; transition: all 0.2s; }}
-        .action-btn:hover {{ background: #f4f7f9; border-color: #1976d2; color: #1976d2; }}
-    </style>
-</head>
-<body>
-    <h2>🔍 Search Reports</h2>
-    
-    <!-- Latest Section -->
-    <div class="latest-header">
-        <h3>📌 Latest Reports</h3>
-        <select id="latestProposition" class="latest-prop-select" onchange="renderLatest()">
-            {"\n".join(f'<option value="{p}"' + (' selected' if p == 'SKXI11ADS' else '') + f'>{p}</option>' for p in propositions)}
-        </select>
-    </div>
-    <div class="latest-section">
-        <div class="latest-card develop">
-            <h3>📁 Latest Develop</h3>
-            <div id="latest-develop">Loading...</div>
-        </div>
-        <div class="latest-card release">
-            <h3>🚀 Latest Release</h3>
-            <div id="latest-release">Loading...</div>
-        </div>
-    </div>
-    
-    <!-- Search & Filters -->
-    <div class="search-filters">
-        <div class="search-row">
-            <input type="text" class="search-input" id="searchInput" placeholder="Search by branch, proposition, image...">
-            <select id="filterProposition">
-                <option value="">All Propositions</option>
-                {"".join(f'<option value="{p}">{p}</option>' for p in propositions)}
-            </select>
-            <select id="filterTestType">
-                <option value="">All Test Types</option>
-                {"".join(f'<option value="{t}">{t}</option>' for t in test_types)}
-            </select>
-            <select id="filterCategory">
-                <option value="">All Categories</option>
-                <option value="develop">Develop</option>
-                <option value="release">Release</option>
-            </select>
-        </div>
-        <div class="quick-filters">
-            <button class="quick-btn all active" onclick="quickFilter('all')">All</button>
-            <button class="quick-btn passed" onclick="quickFilter('passed')">✓ High Pass Rate (&gt;80%)</button>
-            <button class="quick-btn failed" onclick="quickFilter('failed')">✗ Low Pass Rate (&lt;50%)</button>
-            <button class="quick-btn develop" onclick="quickFilter('develop')">Develop Only</button>
-            <button class="quick-btn release" onclick="quickFilter('release')">Release Only</button>
-        </div>
-    </div>
-    
-    <!-- Results Header -->
-    <div class="results-header">
-        <span class="results-count" id="resultsCount">Loading...</span>
-        <select class="sort-select" id="sortSelect" onchange="sortResults()">
-            <option value="date-desc">Newest First</option>
-            <option value="date-asc">Oldest First</option>
-            <option value="pass-desc">Highest Pass Rate</option>
-            <option value="pass-asc">Lowest Pass Rate</option>
-            <option value="total-desc">Most Tests</option>
-        </select>
-    </div>
-    
-    <!-- Results Grid -->
-    <div class="results-grid" id="resultsGrid"></div>
-    
-    <script>
-        const allReports = {reports_json};
-        let filteredReports = [...allReports];
+        .result-actions { margin-top: 6px; display: flex; gap: 4px; }
+        .action-btn { padding: 4px 8px; border: 1px solid #e3e8ee; border-radius: 4px; font-size: 10px; cursor: pointer; background: white; color: #666; transition: all 0.2s; }
+        .action-btn:hover { background: #f4f7f9; border-color: #1976d2; color: #1976d2; }
+'''
+SEARCH_TAB_JS = '''
+        let allReports = [];
+        let filteredReports = [];
         let currentQuickFilter = 'all';
         
-        function formatDate(dateStr) {{
+        function formatDate(dateStr) {
             if (!dateStr || dateStr === 'unknown') return 'Unknown';
-            try {{
+            try {
                 const year = dateStr.substring(0, 4);
                 const month = dateStr.substring(4, 6);
                 const day = dateStr.substring(6, 8);
                 const hour = dateStr.substring(9, 11);
                 const min = dateStr.substring(11, 13);
-                return `${{day}}/${{month}}/${{year}} ${{hour}}:${{min}}`;
-            }} catch (e) {{
+                return `${day}/${month}/${year} ${hour}:${min}`;
+            } catch (e) {
                 return dateStr;
-            }}
-        }}
+            }
+        }
         
-        function getPassRateClass(rate) {{
+        function getPassRateClass(rate) {
             if (rate >= 80) return 'high';
             if (rate >= 50) return 'medium';
             return 'low';
-        }}
+        }
         
-        function renderLatest() {{
+        function renderLatest() {
             // Get selected proposition for latest filter
             const selectedProp = document.getElementById('latestProposition').value;
             const filteredReports = allReports.filter(r => r.proposition === selectedProp);
@@ -532,148 +728,148 @@ search_html = f'''<!DOCTYPE html>
             
             const getRateClass = (rate) => rate >= 50 ? 'high' : 'low';
             
-            if (latestDevCore || latestDevBadger) {{
+            if (latestDevCore || latestDevBadger) {
                 const branch = (latestDevCore || latestDevBadger).branch;
                 document.getElementById('latest-develop').innerHTML = `
-                    <div class="branch-name">${{branch}}</div>
-                    ${{latestDevCore ? `<div class="test-row"><span class="test-name">Core Sanity</span><span class="test-rate ${{getRateClass(latestDevCore.pass_rate)}}">${{latestDevCore.pass_rate}}%</span></div>` : ''}}
-                    ${{latestDevBadger ? `<div class="test-row"><span class="test-name">Badger Sanity</span><span class="test-rate ${{getRateClass(latestDevBadger.pass_rate)}}">${{latestDevBadger.pass_rate}}%</span></div>` : ''}}
+                    <div class="branch-name">${branch}</div>
+                    ${latestDevCore ? `<div class="test-row"><span class="test-name">Core Sanity</span><span class="test-rate ${getRateClass(latestDevCore.pass_rate)}">${latestDevCore.pass_rate}%</span></div>` : ''}
+                    ${latestDevBadger ? `<div class="test-row"><span class="test-name">Badger Sanity</span><span class="test-rate ${getRateClass(latestDevBadger.pass_rate)}">${latestDevBadger.pass_rate}%</span></div>` : ''}
                     <div style="margin-top:8px;">
-                        ${{latestDevCore ? `<a href="${{latestDevCore.html_path}}" target="_blank">Core</a>` : ''}}
-                        ${{latestDevCore && latestDevBadger ? ' | ' : ''}}
-                        ${{latestDevBadger ? `<a href="${{latestDevBadger.html_path}}" target="_blank">Badger</a>` : ''}}
+                        ${latestDevCore ? `<a href="${latestDevCore.html_path}" target="_blank">Core</a>` : ''}
+                        ${latestDevCore && latestDevBadger ? ' | ' : ''}
+                        ${latestDevBadger ? `<a href="${latestDevBadger.html_path}" target="_blank">Badger</a>` : ''}
                     </div>
                 `;
-            }} else {{
+            } else {
                 document.getElementById('latest-develop').innerHTML = '<div style="opacity:0.7;font-size:12px;">No data for this proposition</div>';
-            }}
+            }
             
-            if (latestRelCore || latestRelBadger) {{
+            if (latestRelCore || latestRelBadger) {
                 const branch = (latestRelCore || latestRelBadger).branch;
                 document.getElementById('latest-release').innerHTML = `
-                    <div class="branch-name">${{branch}}</div>
-                    ${{latestRelCore ? `<div class="test-row"><span class="test-name">Core Sanity</span><span class="test-rate ${{getRateClass(latestRelCore.pass_rate)}}">${{latestRelCore.pass_rate}}%</span></div>` : ''}}
-                    ${{latestRelBadger ? `<div class="test-row"><span class="test-name">Badger Sanity</span><span class="test-rate ${{getRateClass(latestRelBadger.pass_rate)}}">${{latestRelBadger.pass_rate}}%</span></div>` : ''}}
+                    <div class="branch-name">${branch}</div>
+                    ${latestRelCore ? `<div class="test-row"><span class="test-name">Core Sanity</span><span class="test-rate ${getRateClass(latestRelCore.pass_rate)}">${latestRelCore.pass_rate}%</span></div>` : ''}
+                    ${latestRelBadger ? `<div class="test-row"><span class="test-name">Badger Sanity</span><span class="test-rate ${getRateClass(latestRelBadger.pass_rate)}">${latestRelBadger.pass_rate}%</span></div>` : ''}
                     <div style="margin-top:8px;">
-                        ${{latestRelCore ? `<a href="${{latestRelCore.html_path}}" target="_blank">Core</a>` : ''}}
-                        ${{latestRelCore && latestRelBadger ? ' | ' : ''}}
-                        ${{latestRelBadger ? `<a href="${{latestRelBadger.html_path}}" target="_blank">Badger</a>` : ''}}
+                        ${latestRelCore ? `<a href="${latestRelCore.html_path}" target="_blank">Core</a>` : ''}
+                        ${latestRelCore && latestRelBadger ? ' | ' : ''}
+                        ${latestRelBadger ? `<a href="${latestRelBadger.html_path}" target="_blank">Badger</a>` : ''}
                     </div>
                 `;
-            }} else {{
+            } else {
                 document.getElementById('latest-release').innerHTML = '<div style="opacity:0.7;font-size:12px;">No data for this proposition</div>';
-            }}
-        }}
+            }
+        }
         
-        function renderResults() {{
+        function renderResults() {
             const grid = document.getElementById('resultsGrid');
             const count = document.getElementById('resultsCount');
             
             // Group reports by branch + category + proposition
-            const grouped = {{}};
-            filteredReports.forEach(r => {{
-                const key = `${{r.category}}-${{r.branch}}-${{r.proposition}}`;
-                if (!grouped[key]) {{
-                    grouped[key] = {{ category: r.category, branch: r.branch, proposition: r.proposition, date: r.date, image: r.image, rdk_version: r.rdk_version, core: null, badger: null }};
-                }}
+            const grouped = {};
+            filteredReports.forEach(r => {
+                const key = `${r.category}-${r.branch}-${r.proposition}`;
+                if (!grouped[key]) {
+                    grouped[key] = { category: r.category, branch: r.branch, proposition: r.proposition, date: r.date, image: r.image, rdk_version: r.rdk_version, core: null, badger: null };
+                }
                 if (r.test_type === 'Core Sanity') grouped[key].core = r;
                 else grouped[key].badger = r;
                 // Use latest date
                 if (r.date > grouped[key].date) grouped[key].date = r.date;
-            }});
+            });
             
             const groupedList = Object.values(grouped);
-            count.textContent = `Showing ${{groupedList.length}} branches (${{filteredReports.length}} reports)`;
+            count.textContent = `Showing ${groupedList.length} branches (${filteredReports.length} reports)`;
             
-            if (groupedList.length === 0) {{
+            if (groupedList.length === 0) {
                 grid.innerHTML = '<div class="no-results">No reports found matching your criteria</div>';
                 return;
-            }}
+            }
             
-            grid.innerHTML = groupedList.map(g => {{
+            grid.innerHTML = groupedList.map(g => {
                 const core = g.core;
                 const badger = g.badger;
                 return `
                 <div class="result-card">
                     <div class="result-header">
                         <div>
-                            <h3 class="result-title">${{g.branch}}</h3>
-                            <span class="badge ${{g.category}}">${{g.category}}</span>
+                            <h3 class="result-title">${g.branch}</h3>
+                            <span class="badge ${g.category}">${g.category}</span>
                         </div>
                     </div>
                     <div class="result-meta">
-                        <span>📅 ${{formatDate(g.date)}}</span>
-                        <span>📦 ${{g.proposition}}</span>
+                        <span>📅 ${formatDate(g.date)}</span>
+                        <span>📦 ${g.proposition}</span>
                     </div>
                     
-                    ${{core ? `
+                    ${core ? `
                     <div class="test-section">
                         <div class="test-section-header">
-                            <a href="${{core.html_path}}" target="_blank" class="badge coresanity" style="text-decoration:none;">Core Sanity</a>
-                            <span class="pass-rate-inline ${{getPassRateClass(core.pass_rate)}}">${{core.pass_rate}}%</span>
-                            <a href="${{core.html_path}}" target="_blank" class="view-link">View →</a>
+                            <a href="${core.html_path}" target="_blank" class="badge coresanity" style="text-decoration:none;">Core Sanity</a>
+                            <span class="pass-rate-inline ${getPassRateClass(core.pass_rate)}">${core.pass_rate}%</span>
+                            <a href="${core.html_path}" target="_blank" class="view-link">View →</a>
                         </div>
                         <div class="progress-container">
                             <div class="progress-bar">
-                                <div class="progress-passed" style="width: ${{core.total > 0 ? (core.passed/core.total*100) : 0}}%"></div>
-                                <div class="progress-failed" style="width: ${{core.total > 0 ? (core.failed/core.total*100) : 0}}%"></div>
-                                <div class="progress-skipped" style="width: ${{core.total > 0 ? (core.skipped/core.total*100) : 0}}%"></div>
+                                <div class="progress-passed" style="width: ${core.total > 0 ? (core.passed/core.total*100) : 0}%"></div>
+                                <div class="progress-failed" style="width: ${core.total > 0 ? (core.failed/core.total*100) : 0}%"></div>
+                                <div class="progress-skipped" style="width: ${core.total > 0 ? (core.skipped/core.total*100) : 0}%"></div>
                             </div>
                             <div class="progress-stats">
-                                <span class="stat-passed">✓ ${{core.passed}}</span>
-                                <span class="stat-failed">✗ ${{core.failed}}</span>
-                                <span class="stat-skipped">○ ${{core.skipped}}</span>
-                                <span>/ ${{core.total}}</span>
+                                <span class="stat-passed">✓ ${core.passed}</span>
+                                <span class="stat-failed">✗ ${core.failed}</span>
+                                <span class="stat-skipped">○ ${core.skipped}</span>
+                                <span>/ ${core.total}</span>
                             </div>
                         </div>
                     </div>
-                    ` : ''}}
+                    ` : ''}
                     
-                    ${{badger ? `
+                    ${badger ? `
                     <div class="test-section">
                         <div class="test-section-header">
-                            <a href="${{badger.html_path}}" target="_blank" class="badge badgersanity" style="text-decoration:none;">Badger Sanity</a>
-                            <span class="pass-rate-inline ${{getPassRateClass(badger.pass_rate)}}">${{badger.pass_rate}}%</span>
-                            <a href="${{badger.html_path}}" target="_blank" class="view-link">View →</a>
+                            <a href="${badger.html_path}" target="_blank" class="badge badgersanity" style="text-decoration:none;">Badger Sanity</a>
+                            <span class="pass-rate-inline ${getPassRateClass(badger.pass_rate)}">${badger.pass_rate}%</span>
+                            <a href="${badger.html_path}" target="_blank" class="view-link">View →</a>
                         </div>
                         <div class="progress-container">
                             <div class="progress-bar">
-                                <div class="progress-passed" style="width: ${{badger.total > 0 ? (badger.passed/badger.total*100) : 0}}%"></div>
-                                <div class="progress-failed" style="width: ${{badger.total > 0 ? (badger.failed/badger.total*100) : 0}}%"></div>
-                                <div class="progress-skipped" style="width: ${{badger.total > 0 ? (badger.skipped/badger.total*100) : 0}}%"></div>
+                                <div class="progress-passed" style="width: ${badger.total > 0 ? (badger.passed/badger.total*100) : 0}%"></div>
+                                <div class="progress-failed" style="width: ${badger.total > 0 ? (badger.failed/badger.total*100) : 0}%"></div>
+                                <div class="progress-skipped" style="width: ${badger.total > 0 ? (badger.skipped/badger.total*100) : 0}%"></div>
                             </div>
                             <div class="progress-stats">
-                                <span class="stat-passed">✓ ${{badger.passed}}</span>
-                                <span class="stat-failed">✗ ${{badger.failed}}</span>
-                                <span class="stat-skipped">○ ${{badger.skipped}}</span>
-                                <span>/ ${{badger.total}}</span>
+                                <span class="stat-passed">✓ ${badger.passed}</span>
+                                <span class="stat-failed">✗ ${badger.failed}</span>
+                                <span class="stat-skipped">○ ${badger.skipped}</span>
+                                <span>/ ${badger.total}</span>
                             </div>
                         </div>
                     </div>
-                    ` : ''}}
+                    ` : ''}
                     
                     <div class="result-details">
-                        ${{g.image ? `<div class="detail-row"><span class="detail-label">Image:</span><span class="detail-value">${{g.image}}</span></div>` : ''}}
-                        ${{g.rdk_version ? `<div class="detail-row"><span class="detail-label">RDK Ver:</span><span class="detail-value">${{g.rdk_version}}</span></div>` : ''}}
+                        ${g.image ? `<div class="detail-row"><span class="detail-label">Image:</span><span class="detail-value">${g.image}</span></div>` : ''}
+                        ${g.rdk_version ? `<div class="detail-row"><span class="detail-label">RDK Ver:</span><span class="detail-value">${g.rdk_version}</span></div>` : ''}
                     </div>
                 </div>
-            `}}).join('');
-        }}
+            `}).join('');
+        }
         
-        function applyFilters() {{
+        function applyFilters() {
             const search = document.getElementById('searchInput').value.toLowerCase();
             const prop = document.getElementById('filterProposition').value;
             const testType = document.getElementById('filterTestType').value;
             const category = document.getElementById('filterCategory').value;
             
-            filteredReports = allReports.filter(r => {{
+            filteredReports = allReports.filter(r => {
                 // Search filter
                 if (search && !r.branch.toLowerCase().includes(search) && 
                     !r.proposition.toLowerCase().includes(search) &&
                     !r.image.toLowerCase().includes(search) &&
-                    !r.rdk_version.toLowerCase().includes(search)) {{
+                    !r.rdk_version.toLowerCase().includes(search)) {
                     return false;
-                }}
+                }
                 // Dropdown filters
                 if (prop && r.proposition !== prop) return false;
                 if (testType && r.test_type !== testType) return false;
@@ -686,47 +882,47 @@ search_html = f'''<!DOCTYPE html>
                 if (currentQuickFilter === 'release' && r.category !== 'release') return false;
                 
                 return true;
-            }});
+            });
             
             sortResults();
-        }}
+        }
         
-        function sortResults() {{
+        function sortResults() {
             const sort = document.getElementById('sortSelect').value;
             
-            filteredReports.sort((a, b) => {{
-                switch(sort) {{
+            filteredReports.sort((a, b) => {
+                switch(sort) {
                     case 'date-desc': return b.date.localeCompare(a.date);
                     case 'date-asc': return a.date.localeCompare(b.date);
                     case 'pass-desc': return b.pass_rate - a.pass_rate;
                     case 'pass-asc': return a.pass_rate - b.pass_rate;
                     case 'total-desc': return b.total - a.total;
                     default: return 0;
-                }}
-            }});
+                }
+            });
             
             renderResults();
-        }}
+        }
         
-        function quickFilter(type) {{
+        function quickFilter(type) {
             currentQuickFilter = type;
             document.querySelectorAll('.quick-btn').forEach(btn => btn.classList.remove('active'));
-            document.querySelector(`.quick-btn.${{type}}`).classList.add('active');
+            document.querySelector(`.quick-btn.${type}`).classList.add('active');
             
             // Reset category dropdown if quick filter is develop/release
-            if (type === 'develop' || type === 'release') {{
+            if (type === 'develop' || type === 'release') {
                 document.getElementById('filterCategory').value = '';
-            }}
+            }
             
             applyFilters();
-        }}
+        }
         
-        function copyToClipboard(text) {{
+        function copyToClipboard(text) {
             const fullUrl = window.location.href.replace(/\\/[^\\/]*$/, '/') + text.replace('../', '');
-            navigator.clipboard.writeText(fullUrl).then(() => {{
+            navigator.clipboard.writeText(fullUrl).then(() => {
                 alert('Link copied to clipboard!');
-            }});
-        }}
+            });
+        }
         
         // Event listeners
         document.getElementById('searchInput').addEventListener('input', applyFilters);
@@ -734,144 +930,147 @@ search_html = f'''<!DOCTYPE html>
         document.getElementById('filterTestType').addEventListener('change', applyFilters);
         document.getElementById('filterCategory').addEventListener('change', applyFilters);
         
-        // Initial render
-        renderLatest();
-        renderResults();
-    </script>
-</body>
-</html>
+        // Initial render, once the shared dataset is loaded
+        loadReportsData().then(data => {
+            allReports = data.reports;
+            filteredReports = [...allReports];
+            renderLatest();
+            renderResults();
+        }).catch(e => {
+            document.getElementById('resultsCount').textContent = `Could not load reports_data.json: ${e.message}`;
+        });
 '''
 
-with open(search_tab_path, 'w') as f:
-    f.write(search_html)
-print(f"[SUCCESS] Updated search_tab.html with search functionality.")
-
-# Generate graphs_tab.html
-# Prepare data for charts - group by branch and date
-chart_data = []
-for r in all_reports:
-    chart_data.append({
-        'category': r['category'],
-        'branch': r['branch'],
-        'proposition': r['proposition'],
-        'date': r['date'],
-        'test_type': r['test_type'],
-        'pass_rate': r['pass_rate'],
-        'passed': r['passed'],
-        'failed': r['failed'],
-        'skipped': r['skipped'],
-        'total': r['total']
-    })
-
-# Get unique propositions for filter
-all_propositions = sorted(set(r['proposition'] for r in all_reports))
-proposition_options = ''.join(f'<option value="{p}">{p}</option>' for p in all_propositions)
-
-chart_data_json = json_module.dumps(chart_data)
-
-graphs_tab_path = os.path.join(WORKSPACE, 'tabs', 'graphs_tab.html')
-graphs_html = f'''<!DOCTYPE html>
+
+def build_search_tab(tab_inputs):
+    # Unique values for filters
+    propositions = tab_inputs['propositions']
+    test_types = tab_inputs['test_types']
+    data_version = tab_inputs['data_version']
+    assets = tab_assets()
+
+    latest_options = "\n".join(f'<option value="{p}"' + (' selected' if p == 'SKXI11ADS' else '') + f'>{p}</option>' for p in propositions)
+
+    search_html = f'''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
-    <title>Graphs</title>
-    <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
-    <script src="https://cdn.jsdelivr.net/npm/chartjs-adapter-date-fns"></script>
-    <style>
-        * {{ box-sizing: border-box; }}
-        body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; background: #f4f7f9; color: #1a2c42; margin: 0; padding: 16px; }}
-        h2 {{ margin-top: 0; color: #1976d2; font-size: 18px; }}
-        
-        .filters {{ background: white; padding: 12px; border-radius: 8px; box-shadow: 0 2px 6px rgba(0,0,0,0.05); margin-bottom: 16px; display: flex; gap: 12px; flex-wrap: wrap; align-items: center; }}
-        select {{ padding: 8px 12px; border: 1px solid #e3e8ee; border-radius: 6px; font-size: 13px; }}
-        label {{ font-size: 13px; font-weight: 600; color: #666; }}
-        
-        .checkbox-group {{ display: flex; gap: 16px; align-items: center; margin-left: 12px; padding-left: 12px; border-left: 1px solid #e3e8ee; }}
-        .checkbox-item {{ display: flex; align-items: center; gap: 4px; cursor: pointer; }}
-        .checkbox-item input {{ cursor: pointer; }}
-        .checkbox-item.passed {{ color: #4caf50; }}
-        .checkbox-item.failed {{ color: #f44336; }}
-        .checkbox-item.skipped {{ color: #ff9800; }}
-        
-        .charts-container {{ display: grid; grid-template-columns: 1fr 1fr; gap: 16px; }}
-        .chart-card {{ background: white; border-radius: 10px; padding: 16px; box-shadow: 0 2px 8px rgba(0,0,0,0.06); }}
-        .chart-card.full-width {{ grid-column: 1 / -1; }}
-        .chart-title {{ font-size: 14px; font-weight: 600; color: #333; margin-bottom: 12px; display: flex; align-items: center; gap: 8px; }}
-        .chart-wrapper {{ position: relative; height: 280px; }}
-        .chart-wrapper.tall {{ height: 350px; }}
-        
-        .legend {{ display: flex; gap: 16px; flex-wrap: wrap; margin-top: 12px; font-size: 11px; }}
-        .legend-item {{ display: flex; align-items: center; gap: 4px; }}
-        .legend-color {{ width: 12px; height: 12px; border-radius: 2px; }}
-        
-        @media (max-width: 900px) {{
-            .charts-container {{ grid-template-columns: 1fr; }}
-        }}
-    </style>
+    <title>Search Reports</title>
+    {assets['search_css']}
 </head>
 <body>
-    <h2>📊 Test Results Over Time</h2>
+    <h2>🔍 Search Reports</h2>
     
-    <div class="filters">
-        <label>Test Type:</label>
-        <select id="filterTestType" onchange="updateCharts()">
-            <option value="">All</option>
-            <option value="Core Sanity">Core Sanity</option>
-            <option value="Badger Sanity">Badger Sanity</option>
-        </select>
-        
-        <label>Proposition:</label>
-        <select id="filterProposition" onchange="updateCharts()">
-            <option value="">All</option>
-            {proposition_options}
+    <!-- Latest Section -->
+    <div class="latest-header">
+        <h3>📌 Latest Reports</h3>
+        <select id="latestProposition" class="latest-prop-select" onchange="renderLatest()">
+            {latest_options}
         </select>
-        
-        <div class="checkbox-group">
-            <label class="checkbox-item passed">
-                <input type="checkbox" id="showPassed" checked onchange="updateCharts()"> Passed
-            </label>
-            <label class="checkbox-item failed">
-                <input type="checkbox" id="showFailed" checked onchange="updateCharts()"> Failed
-            </label>
-            <label class="checkbox-item skipped">
-                <input type="checkbox" id="showSkipped" checked onchange="updateCharts()"> Skipped
-            </label>
+    </div>
+    <div class="latest-section">
+        <div class="latest-card develop">
+            <h3>📁 Latest Develop</h3>
+            <div id="latest-develop">Loading...</div>
+        </div>
+        <div class="latest-card release">
+            <h3>🚀 Latest Release</h3>
+            <div id="latest-release">Loading...</div>
         </div>
     </div>
     
-    <div class="charts-container">
-        <!-- Develop Line Graph -->
-        <div class="chart-card full-width">
-            <div class="chart-title">📁 Develop - Test Results by Branch (sorted by generation time)</div>
-            <div class="chart-wrapper tall">
-                <canvas id="developChart"></canvas>
-            </div>
-            <div class="legend">
-                <span class="legend-item"><span class="legend-color" style="background:#4caf50"></span> Passed</span>
-                <span class="legend-item"><span class="legend-color" style="background:#f44336"></span> Failed</span>
-                <span class="legend-item"><span class="legend-color" style="background:#ff9800"></span> Skipped</span>
-            </div>
+    <!-- Search & Filters -->
+    <div class="search-filters">
+        <div class="search-row">
+            <input type="text" class="search-input" id="searchInput" placeholder="Search by branch, proposition, image...">
+            <select id="filterProposition">
+                <option value="">All Propositions</option>
+                {"".join(f'<option value="{p}">{p}</option>' for p in propositions)}
+            </select>
+            <select id="filterTestType">
+                <option value="">All Test Types</option>
+                {"".join(f'<option value="{t}">{t}</option>' for t in test_types)}
+            </select>
+            <select id="filterCategory">
+                <option value="">All Categories</option>
+                <option value="develop">Develop</option>
+                <option value="release">Release</option>
+            </select>
         </div>
-        
-        <!-- Release Line Graph -->
-        <div class="chart-card full-width">
-            <div class="chart-title">🚀 Release - Test Results by Branch (sorted by generation time)</div>
-            <div class="chart-wrapper tall">
-                <canvas id="releaseChart"></canvas>
-            </div>
-            <div class="legend">
-                <span class="legend-item"><span class="legend-color" style="background:#4caf50"></span> Passed</span>
-                <span class="legend-item"><span class="legend-color" style="background:#f44336"></span> Failed</span>
-                <span class="legend-item"><span class="legend-color" style="background:#ff9800"></span> Skipped</span>
-            </div>
+        <div class="quick-filters">
+            <button class="quick-btn all active" onclick="quickFilter('all')">All</button>
+            <button class="quick-btn passed" onclick="quickFilter('passed')">✓ High Pass Rate (&gt;80%)</button>
+            <button class="quick-btn failed" onclick="quickFilter('failed')">✗ Low Pass Rate (&lt;50%)</button>
+            <button class="quick-btn develop" onclick="quickFilter('develop')">Develop Only</button>
+            <button class="quick-btn release" onclick="quickFilter('release')">Release Only</button>
         </div>
     </div>
     
+    <!-- Results Header -->
+    <div class="results-header">
+        <span class="results-count" id="resultsCount">Loading...</span>
+        <select class="sort-select" id="sortSelect" onchange="sortResults()">
+            <option value="date-desc">Newest First</option>
+            <option value="date-asc">Oldest First</option>
+            <option value="pass-desc">Highest Pass Rate</option>
+            <option value="pass-asc">Lowest Pass Rate</option>
+            <option value="total-desc">Most Tests</option>
+        </select>
+    </div>
+    
+    <!-- Results Grid -->
+    <div class="results-grid" id="resultsGrid"></div>
+    
     <script>
-        const allData = {chart_data_json};
+        const REPORTS_DATA_VERSION = '{data_version}';
+    </script>
+    {assets['reports_data_js']}
+    {assets['search_js']}
+</body>
+</html>
+'''
+
+    return search_html
+
+
+# Stylesheet and script of graphs_tab.html (assets/graphs-tab.<hash>.css/.js)
+GRAPHS_TAB_CSS = '''
+        * { box-sizing: border-box; }
+        body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; background: #f4f7f9; color: #1a2c42; margin: 0; padding: 16px; }
+        h2 { margin-top: 0; color: #1976d2; font-size: 18px; }
+        
+        .filters { background: white; padding: 12px; border-radius: 8px; box-shadow: 0 2px 6px rgba(0,0,0,0.05); margin-bottom: 16px; display: flex; gap: 12px; flex-wrap: wrap; align-items: center; }
+        select { padding: 8px 12px; border: 1px solid #e3e8ee; border-radius: 6px; font-size: 13px; }
+        label { font-size: 13px; font-weight: 600; color: #666; }
+        
+        .checkbox-group { display: flex; gap: 16px; align-items: center; margin-left: 12px; padding-left: 12px; border-left: 1px solid #e3e8ee; }
+        .checkbox-item { display: flex; align-items: center; gap: 4px; cursor: pointer; }
+        .checkbox-item input { cursor: pointer; }
+        .checkbox-item.passed { color: #4caf50; }
+        .checkbox-item.failed { color: #f44336; }
+        .checkbox-item.skipped { color: #ff9800; }
+        
+        .charts-container { display: grid; grid-template-columns: 1fr 1fr; gap: 16px; }
+        .chart-card { background: white; border-radius: 10px; padding: 16px; box-shadow: 0 2px 8px rgba(0,0,0,0.06); }
+        .chart-card.full-width { grid-column: 1 / -1; }
+        .chart-title { font-size: 14px; font-weight: 600; color: #333; margin-bottom: 12px; display: flex; align-items: center; gap: 8px; }
+        .chart-wrapper { position: relative; height: 280px; }
+        .chart-wrapper.tall { height: 350px; }
+        
+        .legend { display: flex; gap: 16px; flex-wrap: wrap; margin-top: 12px; font-size: 11px; }
+        .legend-item { display: flex; align-items: center; gap: 4px; }
+        .legend-color { width: 12px; height: 12px; border-radius: 2px; }
+        
+        @media (max-width: 900px) {
+            .charts-container { grid-template-columns: 1fr; }
+        }
+'''
+GRAPHS_TAB_JS = '''
+        let allData = [];
+        let historyData = [];
         
         // Parse date string to Date object
-        function parseDate(dateStr) {{
+        function parseDate(dateStr) {
             if (!dateStr || dateStr.length < 8) return new Date();
             const year = parseInt(dateStr.substring(0, 4));
             const month = parseInt(dateStr.substring(4, 6)) - 1;
@@ -879,13 +1078,13 @@ graphs_html = f'''<!DOCTYPE html>
             const hour = dateStr.length >= 11 ? parseInt(dateStr.substring(9, 11)) : 0;
             const min = dateStr.length >= 13 ? parseInt(dateStr.substring(11, 13)) : 0;
             return new Date(year, month, day, hour, min);
-        }}
+        }
         
         // Format date for display
-        function formatDate(dateStr) {{
+        function formatDate(dateStr) {
             const d = parseDate(dateStr);
-            return d.toLocaleDateString('en-GB', {{ day: '2-digit', month: 'short', year: 'numeric' }});
-        }}
+            return d.toLocaleDateString('en-GB', { day: '2-digit', month: 'short', year: 'numeric' });
+        }
         
         // Color palette
         const colors = [
@@ -895,7 +1094,7 @@ graphs_html = f'''<!DOCTYPE html>
         
         let developChart, releaseChart;
         
-        function createCategoryLineChart(category, canvasId, chartRef) {{
+        function createCategoryLineChart(category, canvasId, chartRef) {
             const testType = document.getElementById('filterTestType').value;
             const proposition = document.getElementById('filterProposition').value;
             let data = allData.filter(d => d.category === category);
@@ -903,18 +1102,18 @@ graphs_html = f'''<!DOCTYPE html>
             if (proposition) data = data.filter(d => d.proposition === proposition);
             
             // Group by branch, aggregate passed/failed/skipped, track latest date for sorting
-            const branchMap = {{}};
-            data.forEach(d => {{
-                if (!branchMap[d.branch]) {{
-                    branchMap[d.branch] = {{ passed: 0, failed: 0, skipped: 0, latestDate: d.date }};
-                }}
+            const branchMap = {};
+            data.forEach(d => {
+                if (!branchMap[d.branch]) {
+                    branchMap[d.branch] = { passed: 0, failed: 0, skipped: 0, latestDate: d.date };
+                }
                 branchMap[d.branch].passed += d.passed;
                 branchMap[d.branch].failed += d.failed;
                 branchMap[d.branch].skipped += d.skipped;
-                if (d.date > branchMap[d.branch].latestDate) {{
+                if (d.date > branchMap[d.branch].latestDate) {
                     branchMap[d.branch].latestDate = d.date;
-                }}
-            }});
+                }
+            });
             
             // Sort branches by latest date (oldest first, so most recent on right)
             const sortedBranches = Object.keys(branchMap).sort((a, b) => 
@@ -931,8 +1130,8 @@ graphs_html = f'''<!DOCTYPE html>
             const showSkipped = document.getElementById('showSkipped').checked;
             
             const datasets = [];
-            if (showPassed) {{
-                datasets.push({{
+            if (showPassed) {
+                datasets.push({
                     label: 'Passed',
                     data: passedData,
                     borderColor: '#4caf50',
@@ -942,10 +1141,10 @@ graphs_html = f'''<!DOCTYPE html>
                     pointRadius: 5,
                     pointHoverRadius: 7,
                     pointBackgroundColor: '#4caf50'
-                }});
-            }}
-            if (showFailed) {{
-                datasets.push({{
+                });
+            }
+            if (showFailed) {
+                datasets.push({
                     label: 'Failed',
                     data: failedData,
                     borderColor: '#f44336',
@@ -955,10 +1154,10 @@ graphs_html = f'''<!DOCTYPE html>
                     pointRadius: 5,
                     pointHoverRadius: 7,
                     pointBackgroundColor: '#f44336'
-                }});
-            }}
-            if (showSkipped) {{
-                datasets.push({{
+                });
+            }
+            if (showSkipped) {
+                datasets.push({
                     label: 'Skipped',
                     data: skippedData,
                     borderColor: '#ff9800',
@@ -968,57 +1167,310 @@ graphs_html = f'''<!DOCTYPE html>
                     pointRadius: 5,
                     pointHoverRadius: 7,
                     pointBackgroundColor: '#ff9800'
-                }});
-            }}
+                });
+            }
             
             const ctx = document.getElementById(canvasId).getContext('2d');
             if (chartRef) chartRef.destroy();
-            return new Chart(ctx, {{
+            return new Chart(ctx, {
                 type: 'line',
-                data: {{
+                data: {
                     labels: sortedBranches,
                     datasets: datasets
-                }},
-                options: {{
+                },
+                options: {
                     responsive: true,
                     maintainAspectRatio: false,
-                    scales: {{
-                        x: {{
-                            title: {{ display: true, text: 'Branch (sorted by generation time →)' }}
-                        }},
-                        y: {{
+                    scales: {
+                        x: {
+                            title: { display: true, text: 'Branch (sorted by generation time →)' }
+                        },
+                        y: {
                             beginAtZero: true,
-                            title: {{ display: true, text: 'Test Count' }}
-                        }}
-                    }},
-                    plugins: {{
-                        legend: {{ display: false }},
-                        tooltip: {{
-                            callbacks: {{
-                                afterTitle: (ctx) => {{
+                            title: { display: true, text: 'Test Count' }
+                        }
+                    },
+                    plugins: {
+                        legend: { display: false },
+                        tooltip: {
+                            callbacks: {
+                                afterTitle: (ctx) => {
                                     const branch = ctx[0].label;
                                     const info = branchMap[branch];
-                                    return `Generated: ${{formatDate(info.latestDate)}}`;
-                                }}
-                            }}
-                        }}
-                    }}
-                }}
-            }});
-        }}
+                                    return `Generated: ${formatDate(info.latestDate)}`;
+                                }
+                            }
+                        }
+                    }
+                }
+            });
+        }
+        
+        let trendChart;
+        
+        function createTrendChart(chartRef) {
+            const testType = document.getElementById('filterTestType').value;
+            const proposition = document.getElementById('filterProposition').value;
+            let data = historyData;
+            if (testType) data = data.filter(d => d.test_type === testType);
+            if (proposition) data = data.filter(d => d.proposition === proposition);
+            
+            // One point per recorded run; x is the run time so both categories share the axis
+            const toPoint = d => ({ x: parseDate(d.date).getTime(), y: d.pass_rate, run: d });
+            const datasets = [
+                { label: 'Develop', data: data.filter(d => d.category === 'develop').map(toPoint), borderColor: '#667eea', backgroundColor: '#667eea33' },
+                { label: 'Release', data: data.filter(d => d.category === 'release').map(toPoint), borderColor: '#11998e', backgroundColor: '#11998e33' }
+            ].map(ds => Object.assign(ds, { tension: 0.2, pointRadius: 3, pointHoverRadius: 6, showLine: true }));
+            
+            const ctx = document.getElementById('trendChart').getContext('2d');
+            if (chartRef) chartRef.destroy();
+            return new Chart(ctx, {
+                type: 'line',
+                data: { datasets: datasets },
+                options: {
+                    responsive: true,
+                    maintainAspectRatio: false,
+                    scales: {
+                        x: {
+                            type: 'linear',
+                            title: { display: true, text: 'Run time →' },
+                            ticks: { callback: (v) => new Date(v).toLocaleDateString('en-GB', { day: '2-digit', month: 'short' }) }
+                        },
+                        y: {
+                            beginAtZero: true,
+                            max: 100,
+                            title: { display: true, text: 'Pass Rate (%)' }
+                        }
+                    },
+                    plugins: {
+                        legend: { display: false },
+                        tooltip: {
+                            callbacks: {
+                                title: (ctx) => {
+                                    const run = ctx[0].raw.run;
+                                    return `${run.branch} / ${run.proposition} (${run.test_type})`;
+                                },
+                                label: (ctx) => {
+                                    const run = ctx.raw.run;
+                                    return `${formatDate(run.date)}: ${run.pass_rate}% (${run.passed}/${run.total})`;
+                                }
+                            }
+                        }
+                    }
+                }
+            });
+        }
         
-        function updateCharts() {{
+        function updateCharts() {
             developChart = createCategoryLineChart('develop', 'developChart', developChart);
             releaseChart = createCategoryLineChart('release', 'releaseChart', releaseChart);
-        }}
+            trendChart = createTrendChart(trendChart);
+        }
+        
+        // Initial render, once the shared dataset is loaded
+        loadReportsData().then(data => {
+            allData = data.reports;
+            historyData = data.history;
+            updateCharts();
+        }).catch(e => {
+            document.querySelector('h2').textContent += ` (could not load reports_data.json: ${e.message})`;
+        });
+'''
+
+
+def build_graphs_tab(tab_inputs):
+    # Get unique propositions for filter
+    proposition_options = ''.join(f'<option value="{p}">{p}</option>' for p in tab_inputs['propositions'])
+    data_version = tab_inputs['data_version']
+    assets = tab_assets()
+
+    graphs_html = f'''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <title>Graphs</title>
+    {assets['chart_js']}
+    {assets['graphs_css']}
+</head>
+<body>
+    <h2>📊 Test Results Over Time</h2>
+    
+    <div class="filters">
+        <label>Test Type:</label>
+        <select id="filterTestType" onchange="updateCharts()">
+            <option value="">All</option>
+            <option value="Core Sanity">Core Sanity</option>
+            <option value="Badger Sanity">Badger Sanity</option>
+        </select>
         
-        // Initial render
-        updateCharts();
+        <label>Proposition:</label>
+        <select id="filterProposition" onchange="updateCharts()">
+            <option value="">All</option>
+            {proposition_options}
+        </select>
+        
+        <div class="checkbox-group">
+            <label class="checkbox-item passed">
+                <input type="checkbox" id="showPassed" checked onchange="updateCharts()"> Passed
+            </label>
+            <label class="checkbox-item failed">
+                <input type="checkbox" id="showFailed" checked onchange="updateCharts()"> Failed
+            </label>
+            <label class="checkbox-item skipped">
+                <input type="checkbox" id="showSkipped" checked onchange="updateCharts()"> Skipped
+            </label>
+        </div>
+    </div>
+    
+    <div class="charts-container">
+        <!-- Develop Line Graph -->
+        <div class="chart-card full-width">
+            <div class="chart-title">📁 Develop - Test Results by Branch (sorted by generation time)</div>
+            <div class="chart-wrapper tall">
+                <canvas id="developChart"></canvas>
+            </div>
+            <div class="legend">
+                <span class="legend-item"><span class="legend-color" style="background:#4caf50"></span> Passed</span>
+                <span class="legend-item"><span class="legend-color" style="background:#f44336"></span> Failed</span>
+                <span class="legend-item"><span class="legend-color" style="background:#ff9800"></span> Skipped</span>
+            </div>
+        </div>
+        
+        <!-- Release Line Graph -->
+        <div class="chart-card full-width">
+            <div class="chart-title">🚀 Release - Test Results by Branch (sorted by generation time)</div>
+            <div class="chart-wrapper tall">
+                <canvas id="releaseChart"></canvas>
+            </div>
+            <div class="legend">
+                <span class="legend-item"><span class="legend-color" style="background:#4caf50"></span> Passed</span>
+                <span class="legend-item"><span class="legend-color" style="background:#f44336"></span> Failed</span>
+                <span class="legend-item"><span class="legend-color" style="background:#ff9800"></span> Skipped</span>
+            </div>
+        </div>
+        
+        <!-- Per-run Trend (from web_result/history.jsonl) -->
+        <div class="chart-card full-width">
+            <div class="chart-title">📈 Pass Rate per Run (every recorded run, oldest → newest)</div>
+            <div class="chart-wrapper tall">
+                <canvas id="trendChart"></canvas>
+            </div>
+            <div class="legend">
+                <span class="legend-item"><span class="legend-color" style="background:#667eea"></span> Develop</span>
+                <span class="legend-item"><span class="legend-color" style="background:#11998e"></span> Release</span>
+            </div>
+        </div>
+    </div>
+    
+    <script>
+        const REPORTS_DATA_VERSION = '{data_version}';
     </script>
+    {assets['reports_data_js']}
+    {assets['graphs_js']}
 </body>
 </html>
 '''
+    return graphs_html
+
+
+@lru_cache(maxsize=None)
+def tab_assets():
+    """<link>/<script> tags of the shared files the tabs load from assets/ (published on first use)."""
+    return {
+        'summary_css': asset_tag('summary-tab', 'css', SUMMARY_TAB_CSS, TABS_DIR),
+        'search_css': asset_tag('search-tab', 'css', SEARCH_TAB_CSS, TABS_DIR),
+        'search_js': asset_tag('search-tab', 'js', SEARCH_TAB_JS, TABS_DIR),
+        'graphs_css': asset_tag('graphs-tab', 'css', GRAPHS_TAB_CSS, TABS_DIR),
+        'graphs_js': asset_tag('graphs-tab', 'js', GRAPHS_TAB_JS, TABS_DIR),
+        'reports_data_js': asset_tag('reports-data', 'js', REPORTS_DATA_LOADER_JS, TABS_DIR),
+        'chart_js': vendor_tag('chart.js', TABS_DIR) + '\n    ' + vendor_tag('chartjs-adapter-date-fns', TABS_DIR),
+    }
+
+
+def input_digest(inputs):
+    """Hashes a tab's input data together with this script and the asset tags, so template edits
+    (or newly vendored libraries) also trigger a rebuild."""
+    h = hashlib.sha256()
+    with open(os.path.abspath(__file__), 'rb') as f:
+        h.update(f.read())
+    h.update(json.dumps(tab_assets(), sort_keys=True).encode('utf-8'))
+    h.update(json.dumps(inputs, sort_keys=True, default=lambda o: o.digest_key()).encode('utf-8'))
+    return h.hexdigest()
+
+
+def write_tab(manifest, name, inputs, build):
+    """Writes tabs/<name> from build(inputs), unless its inputs are unchanged since the last build."""
+    tab_path = os.path.join(TABS_DIR, name)
+    digest = input_digest(inputs)
+    if manifest['tabs'].get(name) == digest and os.path.isfile(tab_path):
+        print(f"[INFO] {name} is up to date; skipping")
+        return False
+    with span(f'build {name}'):
+        html = build(inputs)
+    with span(f'write {name}'):
+        with open(tab_path, 'w') as f:
+            f.write(html)
+    manifest['tabs'][name] = digest
+    print(f"[SUCCESS] Updated {name}")
+    return True
+
+
+def update_index(changed_dirs=None, full=False):
+    """Refreshes the manifest from the changed result directories (all if None) and rewrites stale tabs."""
+    with span('update index', full=full, changed=changed_dirs or []):
+        _update_index(changed_dirs, full)
+
+
+def _update_index(changed_dirs, full):
+    with span('load manifest'):
+        if full:
+            manifest = {'version': MANIFEST_VERSION, 'summaries': {}, 'tabs': {}}
+        else:
+            manifest = load_manifest()
+    if changed_dirs and not manifest['summaries']:
+        print("[INFO] Manifest is empty; ignoring --changed and scanning the whole workspace")
+        changed_dirs = None
+
+    with span('refresh manifest'):
+        changed = refresh_manifest(manifest, changed_dirs)
+    print(f"[INFO] {len(manifest['summaries'])} summary file(s) indexed, {changed} re-read")
+    with span('run index'):
+        update_run_index(changed_dirs)
+
+    with span('load records'):
+        store = ReportStore.from_manifest(manifest)
+    write_tab(manifest, 'summary_tab.html', store, build_summary_tab)
+
+    with span('build dataset'):
+        dataset_json = build_reports_dataset(store)
+    write_tab(manifest, REPORTS_DATA_NAME, dataset_json, lambda text: text)
+    tab_inputs = {
+        'propositions': store.propositions,
+        'test_types': store.test_types,
+        'data_version': hashlib.sha256(dataset_json.encode('utf-8')).hexdigest()[:12],
+    }
+    write_tab(manifest, 'search_tab.html', tab_inputs, build_search_tab)
+    write_tab(manifest, 'graphs_tab.html', tab_inputs, build_graphs_tab)
+    with span('save manifest'):
+        save_manifest(manifest)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Regenerate the dashboard tabs from web_result/summary.json files.')
+    parser.add_argument('--changed', action='append', metavar='RESULT_DIR',
+                        help='Only re-read summaries under this directory (e.g. the RESULT_DIR just written); '
+                             'every other summary is taken from the manifest. May be repeated.')
+    parser.add_argument('--full', action='store_true', help='Ignore the manifest and rescan the whole workspace.')
+    add_trace_argument(parser)
+    args = parser.parse_args()
+    enable_from_args(args)
+    try:
+        update_index(args.changed, args.full)
+    except VendorError as e:
+        # The Graphs tab would otherwise depend on the CDN at page load
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+
 
-with open(graphs_tab_path, 'w') as f:
-    f.write(graphs_html)
-print(f"[SUCCESS] Updated graphs_tab.html with charts.")
+if __name__ == '__main__':
+    main()
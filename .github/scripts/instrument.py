@@ -0,0 +1,316 @@
+import os
+import sys
+import json
+import time
+import atexit
+import datetime
+import functools
+import threading
+import contextlib
+import tracemalloc
+
+# Spans of the pipeline scripts (wall/CPU time, peak RSS, bytes read/written), recorded only when
+# APPGW_TRACE names an output directory or a script is run with --trace DIR. Each process then writes
+#   <dir>/<script>-<pid>.json        per-span totals, nested by path ("render CoreSanity/close schema page")
+#   <dir>/<script>-<pid>.trace.json  Chrome trace events (chrome://tracing, ui.perfetto.dev)
+# when it exits. Pool workers forked by batch_reports.py/regression_matrix.py start a trace of their
+# own and write their files (with parent_pid set) when the pool shuts them down; workers started with
+# the 'spawn' method are not traced. Disabled, span() and timed_iter() cost a function call.
+TRACE_ENV = 'APPGW_TRACE'
+# APPGW_TRACE_MALLOC=1 also records the peak traced Python allocation per span (slows allocation-heavy code down)
+TRACE_MALLOC_ENV = 'APPGW_TRACE_MALLOC'
+# Writing 5 to clear_refs resets VmHWM, so each span gets its own peak RSS (Linux >= 4.0)
+CLEAR_REFS = '/proc/self/clear_refs'
+
+_state = None
+_local = threading.local()
+# Bytes read/written by the procfs accesses below, subtracted from the spans' IO counts
+_own_io = [0, 0]
+
+
+def _proc_status_kb(field):
+    try:
+        with open('/proc/self/status') as f:
+            text = f.read()
+    except OSError:
+        return None
+    _own_io[0] += len(text)
+    for line in text.splitlines():
+        if line.startswith(field):
+            return int(line.split()[1])
+    return None
+
+
+def _io_bytes():
+    """(bytes read, bytes written) by this process so far, cache hits included; None without procfs."""
+    try:
+        with open('/proc/self/io') as f:
+            text = f.read()
+        counters = dict(line.split(': ') for line in text.splitlines())
+        _own_io[0] += len(text)
+        return int(counters['rchar']), int(counters['wchar'])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def _reset_rss_peak():
+    try:
+        with open(CLEAR_REFS, 'w') as f:
+            f.write('5')
+    except OSError:
+        return False
+    _own_io[1] += 1
+    return True
+
+
+class _Trace:
+    def __init__(self, out_dir, trace_malloc, parent_pid=None):
+        self.out_dir = out_dir
+        self.pid = os.getpid()
+        self.parent_pid = parent_pid
+        self.exported = False
+        self.script = os.path.splitext(os.path.basename(sys.argv[0] or 'python'))[0]
+        self.started = datetime.datetime.now().isoformat(timespec='seconds')
+        self.origin_ns = time.perf_counter_ns()
+        self.events = []
+        self.lock = threading.Lock()
+        self.trace_malloc = trace_malloc
+        if trace_malloc and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        # Without clear_refs every span reports the process peak so far
+        self.rss_per_span = _reset_rss_peak()
+
+
+class _Span:
+    """One open span; peaks of its children are folded into it when they start and end."""
+
+    def __init__(self, name, args, parent):
+        self.name = name
+        self.args = args
+        self.path = f'{parent.path}/{name}' if parent else name
+        self.parent = parent
+        self.rss_peak = 0
+        self.alloc_peak = 0
+        self.interleaved = {}
+
+    def fold_peaks(self, trace):
+        rss = _proc_status_kb('VmHWM:') or 0
+        self.rss_peak = max(self.rss_peak, rss)
+        if trace.trace_malloc:
+            self.alloc_peak = max(self.alloc_peak, tracemalloc.get_traced_memory()[1])
+
+
+def enabled():
+    return _state is not None
+
+
+def enable(out_dir, trace_malloc=None):
+    """Starts recording spans of this process; the files are written to out_dir at exit."""
+    global _state
+    if _state is not None:
+        return
+    if trace_malloc is None:
+        trace_malloc = os.getenv(TRACE_MALLOC_ENV, '0') not in ('', '0')
+    _state = _Trace(os.path.abspath(out_dir), trace_malloc)
+    atexit.register(export)
+    os.register_at_fork(after_in_child=_trace_forked_child)
+
+
+def _trace_forked_child():
+    """Gives a forked process a trace of its own: it inherits the parent's spans and open stack, whose
+    files belong to the parent. Multiprocessing workers end with os._exit(), which skips atexit, so
+    the export is registered with multiprocessing's own exit hooks as well (once the worker has
+    cleared the finalizers it inherited)."""
+    global _state
+    parent = _state
+    if parent is None:
+        return
+    _state = _Trace(parent.out_dir, parent.trace_malloc, parent_pid=parent.pid)
+    _local.stack = []
+    from multiprocessing import util
+    util.register_after_fork(_state, lambda trace: util.Finalize(None, export, exitpriority=0))
+
+
+def add_trace_argument(parser):
+    parser.add_argument('--trace', metavar='DIR',
+                        help=f'Record timing/memory/IO spans and write them to DIR at exit (same as {TRACE_ENV}=DIR)')
+
+
+def enable_from_args(args):
+    if getattr(args, 'trace', None):
+        enable(args.trace)
+
+
+def _stack():
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+@contextlib.contextmanager
+def span(name, **args):
+    """Records the enclosed block as a span; args (JSON values) are shown with it in the trace."""
+    trace = _state
+    if trace is None:
+        yield
+        return
+    stack = _stack()
+    parent = stack[-1] if stack else None
+    current = _Span(name, args, parent)
+    if parent:
+        parent.fold_peaks(trace)
+    if trace.rss_per_span:
+        _reset_rss_peak()
+    if trace.trace_malloc:
+        tracemalloc.reset_peak()
+    stack.append(current)
+    # A procfs read is counted once it returns, so the first read falls inside the span and the last one does not
+    own_start = tuple(_own_io)
+    io_start = _io_bytes()
+    cpu_start = time.process_time()
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        end = time.perf_counter_ns()
+        cpu = time.process_time() - cpu_start
+        own_end = tuple(_own_io)
+        io_end = _io_bytes()
+        stack.pop()
+        current.fold_peaks(trace)
+        if parent:
+            parent.rss_peak = max(parent.rss_peak, current.rss_peak)
+            parent.alloc_peak = max(parent.alloc_peak, current.alloc_peak)
+        event = {
+            'name': name, 'path': current.path, 'ts_us': (start - trace.origin_ns) // 1000,
+            'dur_us': (end - start) // 1000, 'cpu_s': round(cpu, 6), 'tid': threading.get_ident(),
+            'peak_rss_kb': current.rss_peak, 'args': args,
+        }
+        if io_start and io_end:
+            event['read_bytes'] = io_end[0] - io_start[0] - (own_end[0] - own_start[0])
+            event['write_bytes'] = io_end[1] - io_start[1] - (own_end[1] - own_start[1])
+        if trace.trace_malloc:
+            event['peak_alloc_kb'] = current.alloc_peak // 1024
+        if current.interleaved:
+            event['interleaved'] = current.interleaved
+        with trace.lock:
+            trace.events.append(event)
+
+
+def traced(name=None):
+    """Decorator form of span(); the span is named after the function unless name is given."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name or func.__name__):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def timed_iter(name, iterable):
+    """Yields from iterable and charges the time spent producing each item to name within the
+    current span. For streams consumed in a loop that does other work per item (parse vs. render),
+    where the two cannot be separate spans."""
+    if _state is None or not _stack():
+        return iterable
+    return _timed_iter(name, iterable, _stack()[-1])
+
+
+def _timed_iter(name, iterable, owner):
+    totals = owner.interleaved.setdefault(name, {'wall_s': 0.0, 'cpu_s': 0.0, 'items': 0})
+    it = iter(iterable)
+    while True:
+        start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            item = next(it)
+        except StopIteration:
+            return
+        finally:
+            totals['wall_s'] += time.perf_counter() - start
+            totals['cpu_s'] += time.process_time() - cpu_start
+        totals['items'] += 1
+        yield item
+
+
+def summarize(events):
+    """Per-path totals of the recorded spans, in the order the paths were first entered."""
+    totals = {}
+    for event in sorted(events, key=lambda e: e['ts_us']):
+        total = totals.setdefault(event['path'], {'calls': 0, 'wall_s': 0.0, 'cpu_s': 0.0, 'read_bytes': 0,
+                                                  'write_bytes': 0, 'peak_rss_kb': 0})
+        total['calls'] += 1
+        total['wall_s'] += event['dur_us'] / 1e6
+        total['cpu_s'] += event['cpu_s']
+        total['read_bytes'] += event.get('read_bytes', 0)
+        total['write_bytes'] += event.get('write_bytes', 0)
+        total['peak_rss_kb'] = max(total['peak_rss_kb'], event['peak_rss_kb'])
+        if 'peak_alloc_kb' in event:
+            total['peak_alloc_kb'] = max(total.get('peak_alloc_kb', 0), event['peak_alloc_kb'])
+        for name, part in event.get('interleaved', {}).items():
+            sub = totals.setdefault(f"{event['path']}/{name}", {'calls': 0, 'wall_s': 0.0, 'cpu_s': 0.0,
+                                                                'items': 0, 'interleaved': True})
+            sub['calls'] += 1
+            sub['wall_s'] += part['wall_s']
+            sub['cpu_s'] += part['cpu_s']
+            sub['items'] += part['items']
+    for total in totals.values():
+        total['wall_s'] = round(total['wall_s'], 6)
+        total['cpu_s'] = round(total['cpu_s'], 6)
+    return totals
+
+
+def chrome_trace(trace):
+    """Trace Event Format document of the recorded spans ("X" complete events)."""
+    events = [{'name': 'process_name', 'ph': 'M', 'pid': trace.pid, 'args': {'name': trace.script}}]
+    for event in trace.events:
+        args = dict(event['args'], cpu_ms=round(event['cpu_s'] * 1000, 3), peak_rss_kb=event['peak_rss_kb'])
+        for key in ('read_bytes', 'write_bytes', 'peak_alloc_kb'):
+            if key in event:
+                args[key] = event[key]
+        for name, part in event.get('interleaved', {}).items():
+            args[f'{name}_ms'] = round(part['wall_s'] * 1000, 3)
+            args[f'{name}_items'] = part['items']
+        events.append({'name': event['name'], 'cat': trace.script, 'ph': 'X', 'ts': event['ts_us'],
+                       'dur': event['dur_us'], 'pid': trace.pid, 'tid': event['tid'], 'args': args})
+    return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+
+def export():
+    """Writes the summary and Chrome trace of this process (registered with atexit by enable())."""
+    trace = _state
+    # Only the process that started the trace writes it, once (a forked worker may run both exit hooks)
+    if trace is None or os.getpid() != trace.pid or trace.exported or not trace.events:
+        return
+    trace.exported = True
+    with trace.lock:
+        events = list(trace.events)
+    base = os.path.join(trace.out_dir, f'{trace.script}-{trace.pid}')
+    summary = {
+        'script': trace.script,
+        'argv': sys.argv[1:],
+        'pid': trace.pid,
+        'parent_pid': trace.parent_pid,
+        'started': trace.started,
+        'wall_s': round((time.perf_counter_ns() - trace.origin_ns) / 1e9, 6),
+        'cpu_s': round(time.process_time(), 6),
+        'peak_rss_kb': _proc_status_kb('VmHWM:'),
+        'rss_per_span': trace.rss_per_span,
+        'spans': summarize(events),
+    }
+    try:
+        os.makedirs(trace.out_dir, exist_ok=True)
+        with open(base + '.json', 'w') as f:
+            json.dump(summary, f, indent=1)
+        with open(base + '.trace.json', 'w') as f:
+            json.dump(chrome_trace(trace), f)
+    except OSError as e:
+        print(f"[WARN] Could not write the trace to {trace.out_dir}: {e}")
+        return
+    print(f"[INFO] Wrote {len(events)} span(s) to {base}.json and {base}.trace.json")
+
+
+if os.getenv(TRACE_ENV):
+    enable(os.environ[TRACE_ENV])
@@ -0,0 +1,203 @@
+import os
+import json
+from functools import lru_cache
+
+# WORKSPACE is the root of the repo (two directories up from .github/scripts/)
+WORKSPACE = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Response files at least this large are streamed by default (REPORT_STREAMING=1/0 forces it on/off)
+STREAM_THRESHOLD_BYTES = 8 * 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+_WHITESPACE = ' \t\n\r'
+_NUMBER_END = _WHITESPACE + ',]}'
+# Step payloads of packed response files (see blob_store.py) are {"$blob": <digest>} references to
+# <workspace>/blobs/<digest[:2]>/<digest[2:]>.json; load_response() puts the stored values back.
+BLOB_REF_KEY = '$blob'
+BLOB_FIELDS = ('request', 'response', 'error', 'examples')
+BLOB_DIR = os.path.join(WORKSPACE, 'blobs')
+# Parsed blobs kept in memory; the same request/response tends to recur in every run of a proposition
+BLOB_CACHE_SIZE = 4096
+
+
+def use_streaming(path):
+    mode = os.getenv('REPORT_STREAMING', '').strip().lower()
+    if mode in ('1', 'true', 'yes', 'on'):
+        return True
+    if mode in ('0', 'false', 'no', 'off'):
+        return False
+    return os.path.getsize(path) >= STREAM_THRESHOLD_BYTES
+
+
+class ResponseStream:
+    """Iterates the elements of one top-level array of a JSON object without loading the whole file.
+
+    Every other top-level key is collected into .meta as it is passed; .meta is complete once
+    iteration finishes. Only the current element and one read buffer are held in memory:
+
+        stream = ResponseStream(path)
+        for test in stream:
+            ...
+        totals = stream.meta.get('total_tests', stream.count)
+    """
+
+    def __init__(self, path, array_key='test_results', chunk_size=CHUNK_SIZE):
+        self.path = path
+        self.array_key = array_key
+        self.chunk_size = chunk_size
+        self.meta = {}
+        self.count = 0
+        self._decoder = json.JSONDecoder()
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+        self._f = None
+
+    def _fill(self, min_size=0):
+        """Drops the consumed prefix and appends at least one chunk (or min_size chars) to the buffer."""
+        if self._eof:
+            return False
+        self._buf = self._buf[self._pos:]
+        self._pos = 0
+        data = self._f.read(max(self.chunk_size, min_size))
+        if not data:
+            self._eof = True
+            return False
+        self._buf += data
+        return True
+
+    def _peek(self):
+        """Skips whitespace and returns the next character ('' at end of file)."""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ''
+
+    def _expect(self, chars):
+        ch = self._peek()
+        if not ch or ch not in chars:
+            raise ValueError(f"{self.path}: expected one of {chars!r} but found {ch!r} near offset {self._pos}")
+        self._pos += 1
+        return ch
+
+    def _value(self):
+        """Decodes the next JSON value, reading more of the file until it is complete."""
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+                # A number cut by the buffer end ("12" of "12.5e3") decodes fine but continues in the next chunk
+                complete = not isinstance(value, (int, float)) or (end < len(self._buf) and self._buf[end] in _NUMBER_END)
+                if complete or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            # Grow geometrically so a huge value is re-scanned O(log n) times, not once per chunk
+            self._fill(len(self._buf))
+
+    def __iter__(self):
+        with open(self.path, encoding='utf-8') as self._f:
+            self._expect('{')
+            if self._peek() == '}':
+                return
+            while True:
+                key = self._value()
+                self._expect(':')
+                if key == self.array_key and self._peek() == '[':
+                    self._pos += 1
+                    if self._peek() == ']':
+                        self._pos += 1
+                    else:
+                        while True:
+                            item = self._value()
+                            self.count += 1
+                            yield item
+                            if self._expect(',]') == ']':
+                                break
+                else:
+                    self.meta[key] = self._value()
+                if self._expect(',}') == '}':
+                    return
+
+
+def blob_path(digest, blob_dir=BLOB_DIR):
+    return os.path.join(blob_dir, digest[:2], digest[2:] + '.json')
+
+
+@lru_cache(maxsize=BLOB_CACHE_SIZE)
+def read_blob(digest, blob_dir=BLOB_DIR):
+    """Parsed content of one blob. Cached values are shared between tests and must not be modified."""
+    with open(blob_path(digest, blob_dir), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def resolve_blobs(test, blob_dir=BLOB_DIR):
+    """Replaces the blob references in the steps of a test with their values; returns the test."""
+    for step in test.get('steps') or ():
+        for field in BLOB_FIELDS:
+            value = step.get(field)
+            if type(value) is dict and BLOB_REF_KEY in value:
+                step[field] = read_blob(value[BLOB_REF_KEY], blob_dir)
+    return test
+
+
+def load_response(path, array_key='test_results', resolve=True):
+    """Returns (meta, tests): tests is a lazy iterator when streaming, otherwise the parsed list.
+
+    Callers must consume tests before relying on meta being complete. Blob references of packed
+    files are resolved unless resolve is false (for readers that never look at step payloads).
+    A delta-encoded run (<name>.delta.jsonl, see run_delta.py) is rebuilt and returned as a list.
+    """
+    if path.endswith('.delta.jsonl'):
+        # Imported here because run_delta reads its keyframes through this module
+        from run_delta import load_run
+        return load_run(path, resolve)
+    if use_streaming(path):
+        stream = ResponseStream(path, array_key)
+        return stream.meta, map(resolve_blobs, stream) if resolve else iter(stream)
+    with open(path) as f:
+        data = json.load(f)
+    tests = data.pop(array_key, [])
+    if resolve:
+        for test in tests:
+            resolve_blobs(test)
+    return data, tests
+
+
+class ObjectWriter:
+    """write_object() one item at a time, so a single pass over a stream can feed several files."""
+
+    def __init__(self, f, array_key='test_results'):
+        self.f = f
+        self.array_key = array_key
+        self.count = 0
+        f.write('{' + json.dumps(array_key) + ': [')
+
+    def add(self, item):
+        if self.count:
+            self.f.write(', ')
+        self.f.write(json.dumps(item))
+        self.count += 1
+
+    def close(self, meta, extra=None):
+        """Ends the array and writes the other keys; returns the item count."""
+        self.f.write(']')
+        for key, value in list(meta.items()) + list((extra or {}).items()):
+            if key != self.array_key:
+                self.f.write(', ' + json.dumps(key) + ': ' + json.dumps(value))
+        self.f.write('}')
+        return self.count
+
+
+def write_object(f, meta, items, array_key='test_results', extra=None):
+    """Writes {array_key: [items...], **meta, **extra} to f one item at a time; returns the item count.
+
+    meta is read after items are exhausted, so a ResponseStream's .meta can be passed directly.
+    """
+    writer = ObjectWriter(f, array_key)
+    for item in items:
+        writer.add(item)
+    return writer.close(meta, extra)
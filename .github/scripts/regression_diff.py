@@ -0,0 +1,140 @@
+import json
+import hashlib
+
+from report_index import STATUS_GROUPS
+
+PASSED = STATUS_GROUPS['Passed']
+# Parts of a step that are compared between runs; timings and other bookkeeping are ignored
+STEP_FIELDS = ('request', 'response', 'error')
+# Differences listed per step before the rest is summarized as "... and N more"
+MAX_DIFFS = 50
+MISSING = object()
+
+
+def fingerprint(value):
+    """Stable content hash of a JSON value; key order and whitespace do not change it."""
+    data = json.dumps(value, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+    return hashlib.blake2b(data.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def step_payload(step):
+    return {field: step.get(field) for field in STEP_FIELDS}
+
+
+class TestPrint:
+    """Fingerprints of one test: one hash per step plus a hash over all of them.
+
+    Two tests with the same digest have identical step payloads, so comparing digests is enough to
+    skip every unchanged test; only tests whose digests differ are diffed structurally.
+    """
+
+    __slots__ = ('test', 'passed', 'steps', 'digest')
+
+    def __init__(self, test):
+        self.test = test
+        self.passed = test.get('status') in PASSED
+        self.steps = tuple(fingerprint(step_payload(step)) for step in test.get('steps') or ())
+        self.digest = hashlib.blake2b(''.join(self.steps).encode('ascii'), digest_size=16).hexdigest()
+
+
+def fingerprint_tests(tests):
+    """{test_id: TestPrint} for an iterable of tests (a repeated test_id keeps its last occurrence)."""
+    return {test['test_id']: TestPrint(test) for test in tests}
+
+
+def structural_diff(base, current, path, out, limit=MAX_DIFFS):
+    """Appends {path, kind, base, current} for every leaf where two JSON values differ.
+
+    kind is 'added', 'removed' or 'changed'; MISSING stands for an absent key, list item or step.
+    Returns the total number of differences, which may exceed the number appended (limit).
+    """
+    if base is MISSING:
+        return _record(out, limit, path, 'added', base, current)
+    if current is MISSING:
+        return _record(out, limit, path, 'removed', base, current)
+    if isinstance(base, dict) and isinstance(current, dict):
+        total = 0
+        for key in sorted(set(base) | set(current), key=str):
+            b, c = base.get(key, MISSING), current.get(key, MISSING)
+            if b != c:
+                total += structural_diff(b, c, f'{path}.{key}', out, limit)
+        return total
+    if isinstance(base, list) and isinstance(current, list):
+        total = 0
+        for i in range(max(len(base), len(current))):
+            b = base[i] if i < len(base) else MISSING
+            c = current[i] if i < len(current) else MISSING
+            if b != c:
+                total += structural_diff(b, c, f'{path}[{i}]', out, limit)
+        return total
+    if base != current:
+        return _record(out, limit, path, 'changed', base, current)
+    return 0
+
+
+def _record(out, limit, path, kind, base, current):
+    if len(out) < limit:
+        out.append({
+            'path': path,
+            'kind': kind,
+            'base': None if base is MISSING else base,
+            'current': None if current is MISSING else current,
+        })
+    return 1
+
+
+def step_diffs(base_print, current_print):
+    """Differences between the steps of two tests: [{step, diffs, total}, ...] for changed steps only."""
+    base_steps = base_print.test.get('steps') or []
+    current_steps = current_print.test.get('steps') or []
+    changed = []
+    for i in range(max(len(base_print.steps), len(current_print.steps))):
+        b = base_print.steps[i] if i < len(base_print.steps) else None
+        c = current_print.steps[i] if i < len(current_print.steps) else None
+        if b == c:
+            continue
+        diffs = []
+        total = structural_diff(
+            step_payload(base_steps[i]) if b else MISSING,
+            step_payload(current_steps[i]) if c else MISSING,
+            f'steps[{i}]', diffs)
+        changed.append({'step': i, 'diffs': diffs, 'total': total})
+    return changed
+
+
+class Comparison:
+    """Outcome of comparing two runs test by test.
+
+    regressions, improvements and payload_changed hold (current_test, base_test, step_diffs)
+    tuples; payload_changed are tests whose status did not flip but whose steps differ.
+    """
+
+    def __init__(self):
+        self.regressions = []
+        self.improvements = []
+        self.payload_changed = []
+        self.new_tests = []
+        self.removed_tests = []
+        self.unchanged = 0
+
+
+def compare_runs(base_prints, current_prints):
+    """Compares two {test_id: TestPrint} maps (see fingerprint_tests) and returns a Comparison."""
+    result = Comparison()
+    for test_id, current in current_prints.items():
+        base = base_prints.get(test_id)
+        if base is None:
+            result.new_tests.append(current.test)
+            continue
+        same_payload = base.digest == current.digest
+        diffs = [] if same_payload else step_diffs(base, current)
+        if base.passed and not current.passed:
+            result.regressions.append((current.test, base.test, diffs))
+        elif current.passed and not base.passed:
+            result.improvements.append((current.test, base.test, diffs))
+        elif not same_payload:
+            result.payload_changed.append((current.test, base.test, diffs))
+        else:
+            result.unchanged += 1
+    result.removed_tests = [base.test for test_id, base in base_prints.items() if test_id not in current_prints]
+    return result
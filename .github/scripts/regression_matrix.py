@@ -0,0 +1,254 @@
+import io
+import os
+import sys
+import html
+import json
+import argparse
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import fb_coreSDK_schema_validation_regression_result as regression
+from flaky_tests import flaky_for
+from json_stream import load_response
+from regression_diff import compare_runs, fingerprint_tests
+from report_engine import SUITES, WORKSPACE
+from results_layout import CATEGORIES, iter_run_dirs, stored_response_path
+from run_index import split_run_path
+
+DEFAULT_OUT_DIR = 'regression_matrix'
+COUNT_KEYS = ('regressions', 'improvements', 'payload_changed', 'new_tests', 'removed_tests')
+
+# Baseline fingerprints of the worker process, set once by _init_worker
+_base_prints = None
+
+
+def _init_worker(base_prints):
+    global _base_prints
+    _base_prints = base_prints
+
+
+def latest_runs(workspace, response_file, categories=None, exclude_series=None):
+    """{(category, branch, proposition): json_path} of the newest run holding response_file.
+
+    Paths are relative to workspace. exclude_series, the (category, branch, proposition) of the
+    baseline, is left out entirely: its newest run would be the baseline or an older run of itself.
+    """
+    latest = {}
+    for category, branch, proposition, timestamp, run_dir in iter_run_dirs(workspace, categories):
+        if (category, branch, proposition) == exclude_series:
+            continue
+        path = stored_response_path(run_dir, response_file)
+        if path:
+            # Runs come oldest first, so the newest one ends up in the map
+            latest[(category, branch, proposition)] = os.path.relpath(path, workspace)
+    return latest
+
+
+def compare_candidate(key, json_path, out_path, base_dir):
+    """Streams one candidate run against the worker's baseline and writes its regression page.
+
+    Returns (key, json_path, counts, error); counts maps COUNT_KEYS (plus 'unchanged') to sizes.
+    """
+    try:
+        _, tests = load_response(json_path)
+        comparison = compare_runs(_base_prints, fingerprint_tests(tests))
+        os.makedirs(os.path.dirname(out_path), exist_ok=True)
+        with contextlib.redirect_stdout(io.StringIO()):
+            regression.write_comparison_report(comparison, os.path.dirname(json_path), base_dir, out_path, flaky_for(key))
+    except Exception as e:
+        return key, json_path, None, f"{type(e).__name__}: {e}"
+    counts = {name: len(getattr(comparison, name)) for name in COUNT_KEYS}
+    counts['unchanged'] = comparison.unchanged
+    return key, json_path, counts, None
+
+
+def _cell_style(counts, worst):
+    if counts['regressions']:
+        # Red that deepens with the share of the worst cell's regressions
+        alpha = 0.25 + 0.75 * counts['regressions'] / worst
+        return f"background: rgba(220, 53, 69, {alpha:.2f}); color: {'#fff' if alpha > 0.6 else '#1a2c42'};"
+    if counts['payload_changed'] or counts['removed_tests']:
+        return "background: #fff4d6; color: #8a6500;"
+    return "background: #e6f4ea; color: #1e7e34;"
+
+
+def write_heatmap(results, base_dir, out_dir):
+    """Writes <out_dir>/index.html: one row per (category, branch), one column per proposition."""
+    rows = sorted({(category, branch) for category, branch, _ in results})
+    propositions = sorted({proposition for _, _, proposition in results})
+    worst = max([entry['counts']['regressions'] for entry in results.values()] + [1])
+
+    header = "".join(f"<th>{html.escape(proposition)}</th>" for proposition in propositions)
+    body = []
+    for category, branch in rows:
+        cells = []
+        for proposition in propositions:
+            entry = results.get((category, branch, proposition))
+            if not entry:
+                cells.append("<td class=\"empty\"></td>")
+                continue
+            counts = entry['counts']
+            title = ", ".join(f"{name.replace('_', ' ')}: {counts[name]}" for name in COUNT_KEYS)
+            cells.append(
+                f"<td style=\"{_cell_style(counts, worst)}\" title=\"{html.escape(title)}\">"
+                f"<a href=\"{html.escape(entry['page'])}\">{counts['regressions']}</a>"
+                f"<div class=\"sub\">+{counts['improvements']} / ~{counts['payload_changed']}</div></td>")
+        body.append(f"<tr><th class=\"row-head\">{html.escape(category)}/{html.escape(branch)}</th>{''.join(cells)}</tr>")
+
+    totals = {name: sum(entry['counts'][name] for entry in results.values()) for name in COUNT_KEYS}
+    html_content = f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Regression Matrix</title>
+    <style>
+        body {{
+            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Helvetica, Arial, sans-serif;
+            color: #333;
+            background-color: #f4f7f9;
+            margin: 0;
+            padding: 20px;
+        }}
+        .container {{
+            background-color: #fff;
+            padding: 30px;
+            border-radius: 8px;
+            box-shadow: 0 4px 12px rgba(0,0,0,0.08);
+            overflow-x: auto;
+        }}
+        h1 {{
+            color: #1a2c42;
+            margin-top: 0;
+        }}
+        .run-info {{
+            font-size: 13px;
+            color: #44566c;
+            margin-bottom: 16px;
+        }}
+        .run-info code {{
+            background: #eef2f5;
+            padding: 2px 6px;
+            border-radius: 4px;
+        }}
+        table {{
+            border-collapse: collapse;
+        }}
+        th, td {{
+            border: 1px solid #eef2f5;
+            padding: 8px 10px;
+            text-align: center;
+            font-size: 13px;
+        }}
+        th {{
+            background-color: #f9fafb;
+            color: #555;
+        }}
+        th.row-head {{
+            text-align: left;
+            white-space: nowrap;
+        }}
+        td a {{
+            color: inherit;
+            font-weight: 700;
+            font-size: 16px;
+            text-decoration: none;
+        }}
+        td .sub {{
+            font-size: 11px;
+            opacity: 0.8;
+        }}
+        td.empty {{
+            background: #fafafa;
+        }}
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>Regression Matrix</h1>
+        <div class="run-info">
+            <div><strong>Base:</strong> <code>{html.escape(base_dir)}</code></div>
+            <div>{len(results)} run(s) compared: {totals['regressions']} regression(s), {totals['improvements']} improvement(s),
+                {totals['payload_changed']} payload change(s), {totals['new_tests']} new and {totals['removed_tests']} removed test(s).
+                Cells show regressions, then +improvements / ~payload changes; click a cell for its report.</div>
+        </div>
+        <table>
+            <thead><tr><th></th>{header}</tr></thead>
+            <tbody>{''.join(body)}</tbody>
+        </table>
+    </div>
+</body>
+</html>
+"""
+    out_path = os.path.join(out_dir, 'index.html')
+    with open(out_path, 'w') as f:
+        f.write(html_content)
+    return out_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare one baseline run against the latest run of every branch/proposition.')
+    parser.add_argument('base_dir', metavar='BASE_RUN_DIR', help='Baseline run directory (<category>/<branch>/<proposition>/<timestamp>)')
+    parser.add_argument('--root', action='append', choices=CATEGORIES, dest='roots',
+                        help='Result root to compare against (repeatable; default: all)')
+    parser.add_argument('--suite', choices=sorted(SUITES), default='CoreSDKRegression',
+                        help='Suite whose response files are compared (default: CoreSDKRegression)')
+    parser.add_argument('--out-dir', default=DEFAULT_OUT_DIR, help=f'Output directory (default: {DEFAULT_OUT_DIR})')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Worker processes (default: CPU count; 1 runs everything in this process)')
+    args = parser.parse_args()
+
+    # Candidate paths and the pages' run labels are workspace-relative, as in the per-run reports
+    base_dir = os.path.relpath(os.path.abspath(args.base_dir), WORKSPACE)
+    out_dir = os.path.abspath(args.out_dir)
+    os.chdir(WORKSPACE)
+    response_file = SUITES[args.suite]['response_file']
+    base_file = stored_response_path(base_dir, response_file) or os.path.join(base_dir, response_file)
+    if not os.path.isfile(base_file):
+        print(f"[ERROR] Base reference file not found at: {base_file}")
+        sys.exit(1)
+
+    # The baseline is parsed and fingerprinted once; workers receive the fingerprints when they start
+    _, base_tests = load_response(base_file)
+    base_prints = fingerprint_tests(base_tests)
+    base_run = split_run_path(base_dir)
+    candidates = latest_runs(WORKSPACE, response_file, args.roots, exclude_series=base_run[:3] if base_run else None)
+    print(f"[INFO] Comparing {len(base_prints)} baseline test(s) from {base_dir} against {len(candidates)} run(s)")
+
+    results = {}
+    failures = []
+
+    def report(result):
+        key, json_path, counts, error = result
+        if error:
+            failures.append(json_path)
+            print(f"[ERROR] {json_path}: {error}")
+            return
+        results[key] = {'run': json_path, 'page': os.path.join(*key) + '.html', 'counts': counts}
+        print(f"[INFO] {'/'.join(key)}: {counts['regressions']} regression(s), {counts['improvements']} improvement(s), "
+              f"{counts['payload_changed']} payload change(s), {counts['new_tests']} new, {counts['removed_tests']} removed")
+
+    tasks = [(key, json_path, os.path.join(out_dir, *key) + '.html', base_dir)
+             for key, json_path in sorted(candidates.items())]
+    if args.workers <= 1:
+        _init_worker(base_prints)
+        for task in tasks:
+            report(compare_candidate(*task))
+    else:
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker, initargs=(base_prints,)) as pool:
+            for future in as_completed([pool.submit(compare_candidate, *task) for task in tasks]):
+                report(future.result())
+
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(out_dir, 'matrix.json'), 'w') as f:
+        json.dump({'base': base_dir, 'suite': args.suite,
+                   'runs': [dict(zip(('category', 'branch', 'proposition'), key), **entry)
+                            for key, entry in sorted(results.items())]}, f, indent=2)
+    out_path = write_heatmap(results, base_dir, out_dir)
+    print(f"[SUCCESS] Generated regression matrix: {out_path}" + (f" ({len(failures)} run(s) failed)" if failures else ''))
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,287 @@
+# Page-side helpers shared by the generated report pages, and the content-hashed assets/ files
+# the pages load them (and their own stylesheets and scripts) from.
+import os
+import sys
+import hashlib
+import argparse
+import tempfile
+import urllib.request
+
+from compress_site import minify
+
+# WORKSPACE is the root of the repo (two directories up from .github/scripts/)
+WORKSPACE = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Published next to index.html and committed with the pages; every file is named <name>.<hash>.<ext>
+# and never rewritten, so browsers can cache it for good and older pages keep the files they reference
+ASSETS_DIR = os.path.join(WORKSPACE, 'assets')
+# Third-party libraries committed with the scripts (fetched once by `report_assets.py vendor --pin`) so
+# the site works without internet access; pages are never pointed at the CDN
+VENDOR_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'vendor')
+# sha256sum-format checksums of the vendored files, committed with them; a file that does not match is refused
+VENDOR_SUMS = os.path.join(VENDOR_DIR, 'SHA256SUMS')
+VENDOR_LIBS = {
+    'chart.js': ('chart.umd.min.js', 'https://cdn.jsdelivr.net/npm/chart.js@4.4.1/dist/chart.umd.min.js'),
+    'chartjs-adapter-date-fns': ('chartjs-adapter-date-fns.bundle.min.js',
+                                 'https://cdn.jsdelivr.net/npm/chartjs-adapter-date-fns@3.0.0/dist/chartjs-adapter-date-fns.bundle.min.js'),
+}
+
+
+def publish_asset(name, ext, content, assets_dir=ASSETS_DIR, minify_content=True):
+    """Writes <assets_dir>/<name>.<hash>.<ext> unless it already exists; returns its path.
+
+    The content is minified before it is hashed (compress_site.py never rewrites assets/), so the
+    name always matches what is served.
+    """
+    data = content.encode('utf-8') if isinstance(content, str) else content
+    if minify_content:
+        data = minify(f'{name}.{ext}', data)
+    path = os.path.join(assets_dir, f"{name}.{hashlib.sha256(data).hexdigest()[:10]}.{ext}")
+    if os.path.isfile(path):
+        return path
+    os.makedirs(assets_dir, exist_ok=True)
+    # A temp file of its own per writer: batch_reports renders pages in parallel processes that
+    # publish the same assets, and a shared <path>.tmp could be renamed away mid-write by another one
+    fd, tmp_path = tempfile.mkstemp(dir=assets_dir, prefix=f'.{name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path
+
+
+def links_assets(page_dir, assets_dir=ASSETS_DIR):
+    """True if a page written to page_dir is published together with assets_dir (both inside its parent)."""
+    root = os.path.dirname(os.path.abspath(assets_dir))
+    return os.path.commonpath([os.path.abspath(page_dir), root]) == root
+
+
+def asset_tag(name, ext, content, page_dir, inline=False):
+    """<link>/<script src> tag of a shared asset, relative to the page directory.
+
+    Pages written outside the workspace (CI artifacts) or asked to stay a single file get the
+    content in a <style>/<script> element instead.
+    """
+    if inline or not links_assets(page_dir):
+        return f'<style>{content}</style>' if ext == 'css' else f'<script>{content}</script>'
+    href = os.path.relpath(publish_asset(name, ext, content), os.path.abspath(page_dir)).replace(os.sep, '/')
+    return f'<link rel="stylesheet" href="{href}">' if ext == 'css' else f'<script src="{href}"></script>'
+
+
+class VendorError(Exception):
+    """A vendored library is missing, or does not match its pinned checksum."""
+
+
+def read_pins(sums_path=VENDOR_SUMS):
+    """{file name: sha256 hex digest} of the pinned libraries ({} before anything is pinned)."""
+    pins = {}
+    try:
+        with open(sums_path) as f:
+            for line in f:
+                if line.strip():
+                    digest, name = line.split(None, 1)
+                    pins[name.strip().lstrip('*')] = digest
+    except FileNotFoundError:
+        pass
+    return pins
+
+
+def _verified(file_name, data, pins):
+    expected = pins.get(file_name)
+    if expected is None:
+        raise VendorError(f"{file_name} has no pinned checksum in {VENDOR_SUMS}; "
+                          f"run 'report_assets.py vendor --pin' and commit {VENDOR_DIR}")
+    actual = hashlib.sha256(data).hexdigest()
+    if actual != expected:
+        raise VendorError(f"{file_name} does not match its pinned checksum (sha256 {actual}, expected {expected})")
+    return data
+
+
+def vendored_file(lib, vendor_dir=VENDOR_DIR):
+    """Content of a vendored library, checked against its pinned checksum; raises VendorError otherwise."""
+    file_name, _ = VENDOR_LIBS[lib]
+    path = os.path.join(vendor_dir, file_name)
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        raise VendorError(f"{lib} is not vendored ({path} is missing); "
+                          f"run 'report_assets.py vendor --pin' and commit {VENDOR_DIR}") from None
+    return _verified(file_name, data, read_pins(os.path.join(vendor_dir, os.path.basename(VENDOR_SUMS))))
+
+
+def vendor_tag(lib, page_dir):
+    """<script> tag of the published copy of a vendored library (VendorError if it is missing or modified)."""
+    file_name, _ = VENDOR_LIBS[lib]
+    content = vendored_file(lib)
+    # Published as shipped: the pinned checksum is of this exact file
+    href = os.path.relpath(publish_asset(file_name[:-len('.js')], 'js', content, minify_content=False),
+                           os.path.abspath(page_dir))
+    return f'<script src="{href.replace(os.sep, "/")}"></script>'
+
+
+def vendor_libs(vendor_dir=VENDOR_DIR, pin=False):
+    """Downloads every VENDOR_LIBS file missing from vendor_dir and checks every file against its pinned
+    checksum; pin records the checksums of files that have none yet. Returns the number fetched."""
+    os.makedirs(vendor_dir, exist_ok=True)
+    sums_path = os.path.join(vendor_dir, os.path.basename(VENDOR_SUMS))
+    pins = read_pins(sums_path)
+    fetched = 0
+    for lib, (file_name, url) in VENDOR_LIBS.items():
+        path = os.path.join(vendor_dir, file_name)
+        if os.path.isfile(path):
+            with open(path, 'rb') as f:
+                data = f.read()
+        else:
+            with urllib.request.urlopen(url, timeout=60) as response:
+                data = response.read()
+            fetched += 1
+        if pin and file_name not in pins:
+            pins[file_name] = hashlib.sha256(data).hexdigest()
+            print(f"[INFO] Pinned {lib}: sha256 {pins[file_name]}")
+        _verified(file_name, data, pins)
+        if not os.path.isfile(path):
+            with open(path, 'wb') as f:
+                f.write(data)
+            print(f"[INFO] Vendored {lib}: {path} ({len(data)} bytes)")
+    if pin:
+        with open(sums_path, 'w') as f:
+            f.writelines(f"{digest}  {name}\n" for name, digest in sorted(pins.items()))
+    return fetched
+
+
+# createVirtualList(container, renderRow, rowHeight) keeps only the rows near the viewport in the
+# DOM; the rest of the list is two spacer divs sized from measured (or estimated) row heights.
+# renderRow(item, row) fills an empty row div and may be called again whenever the row scrolls
+# back into view, so per-row state (e.g. which test is expanded) has to live outside the DOM.
+VIRTUAL_LIST_JS = '''
+        function debounce(fn, wait) {
+          let timer = null;
+          return function(...args) {
+            clearTimeout(timer);
+            timer = setTimeout(() => fn.apply(this, args), wait);
+          };
+        }
+
+        function createVirtualList(container, renderRow, rowHeight) {
+          const heights = new WeakMap();
+          const topSpacer = document.createElement('div');
+          const bottomSpacer = document.createElement('div');
+          const rows = new Map();
+          const observer = window.ResizeObserver ? new ResizeObserver(() => schedule()) : null;
+          let items = [];
+          let offsets = [0];
+          let frame = 0;
+
+          function layout() {
+            offsets = new Array(items.length + 1);
+            offsets[0] = 0;
+            for (let i = 0; i < items.length; i++) offsets[i + 1] = offsets[i] + (heights.get(items[i]) || rowHeight);
+          }
+          // Index of the row covering y (px from the top of the list)
+          function indexAt(y) {
+            let lo = 0, hi = items.length;
+            while (lo < hi) {
+              const mid = (lo + hi + 1) >> 1;
+              if (offsets[mid] <= y) lo = mid; else hi = mid - 1;
+            }
+            return lo;
+          }
+          function drop(i) {
+            const row = rows.get(i);
+            if (observer) observer.unobserve(row);
+            row.remove();
+            rows.delete(i);
+          }
+          function update() {
+            frame = 0;
+            if (bottomSpacer.parentNode !== container) return;
+            // Materialize one extra screen above and below so fast scrolling does not show gaps
+            const viewTop = -container.getBoundingClientRect().top;
+            const start = Math.max(0, indexAt(viewTop - window.innerHeight));
+            const end = Math.min(items.length, indexAt(viewTop + 2 * window.innerHeight) + 1);
+            Array.from(rows.keys()).forEach(i => { if (i < start || i >= end) drop(i); });
+            let next = bottomSpacer;
+            for (let i = end - 1; i >= start; i--) {
+              let row = rows.get(i);
+              if (!row) {
+                row = document.createElement('div');
+                row.style.display = 'flow-root';
+                renderRow(items[i], row);
+                rows.set(i, row);
+                if (observer) observer.observe(row);
+              }
+              if (row.nextSibling !== next) container.insertBefore(row, next);
+              next = row;
+            }
+            let changed = false;
+            rows.forEach((row, i) => {
+              const height = row.offsetHeight;
+              if (height && height !== heights.get(items[i])) {
+                heights.set(items[i], height);
+                changed = true;
+              }
+            });
+            if (changed) layout();
+            topSpacer.style.height = offsets[start] + 'px';
+            bottomSpacer.style.height = (offsets[items.length] - offsets[end]) + 'px';
+          }
+          function schedule() {
+            if (!frame) frame = requestAnimationFrame(update);
+          }
+          window.addEventListener('scroll', schedule, { passive: true });
+          window.addEventListener('resize', schedule);
+
+          return {
+            setItems(newItems) {
+              Array.from(rows.keys()).forEach(drop);
+              if (bottomSpacer.parentNode !== container) container.replaceChildren(topSpacer, bottomSpacer);
+              items = newItems;
+              layout();
+              update();
+            },
+            // Re-renders the rows currently in the DOM, e.g. after expanding or collapsing tests
+            refresh() {
+              rows.forEach((row, i) => {
+                row.replaceChildren();
+                renderRow(items[i], row);
+              });
+              update();
+            },
+            items() {
+              return items;
+            }
+          };
+        }
+'''
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Manage the third-party libraries the generated pages load from assets/.')
+    parser.add_argument('command', choices=['vendor', 'check'],
+                        help=f'vendor: download the pinned libraries missing from {os.path.relpath(VENDOR_DIR, WORKSPACE)}/ '
+                             '(commit them afterwards); check: verify the committed files against their checksums')
+    parser.add_argument('--pin', action='store_true',
+                        help=f'vendor: record the checksums of libraries not pinned yet in {os.path.relpath(VENDOR_SUMS, WORKSPACE)}')
+    args = parser.parse_args()
+    try:
+        if args.command == 'check':
+            for lib in VENDOR_LIBS:
+                vendored_file(lib)
+            print(f"[SUCCESS] Vendored libraries match their pinned checksums: {', '.join(VENDOR_LIBS)}")
+            return
+        fetched = vendor_libs(pin=args.pin)
+    except VendorError as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+    except OSError as e:
+        print(f"[ERROR] Could not download the vendored libraries: {e}")
+        sys.exit(1)
+    print(f"[SUCCESS] {fetched} file(s) downloaded to {VENDOR_DIR}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+import os
+import json
+from glob import glob
+
+from report_index import test_category
+
+# Fields kept in the page itself; everything else of a test (steps, request/response payloads,
+# errors, examples) goes to a detail shard that the page loads when the test is expanded.
+SLIM_KEYS = ('test_id', 'test_name', 'status', 'duration_ms')
+# A shard is closed once its serialized payloads reach this size
+SHARD_BYTES = 256 * 1024
+
+
+def shard_script(shard, payloads):
+    """Shards are JS, not JSON, so they load through a <script> tag from file:// as well as HTTP."""
+    return f"window.__detailShards.load({shard}, [{', '.join(payloads)}]);\n"
+
+
+class DetailShardWriter:
+    """Splits streamed tests into slim index entries and size-bounded detail shards.
+
+    With details_dir set, shard N is written to <details_dir>/shard_NNNN.js as soon as it fills up.
+    Without it the shards are kept as <script> blocks for inline_scripts(), so the report stays a
+    single self-contained file.
+    """
+
+    def __init__(self, details_dir=None, shard_bytes=SHARD_BYTES):
+        self.details_dir = details_dir
+        self.shard_bytes = shard_bytes
+        self.shard_count = 0
+        self._payloads = []
+        self._size = 0
+        self._inline = []
+        if details_dir:
+            os.makedirs(details_dir, exist_ok=True)
+            for stale in glob(os.path.join(details_dir, 'shard_*.js')):
+                os.remove(stale)
+
+    def add(self, test):
+        """Queues the detail payload of one test and returns its slim index entry."""
+        slim = {key: test[key] for key in SLIM_KEYS if key in test}
+        slim['category'] = test_category(test.get('test_id'))
+        payload = json.dumps({key: value for key, value in test.items() if key not in SLIM_KEYS})
+        slim['shard'] = self.shard_count
+        slim['slot'] = len(self._payloads)
+        self._payloads.append(payload)
+        self._size += len(payload)
+        if self._size >= self.shard_bytes:
+            self.flush()
+        return slim
+
+    def flush(self):
+        if not self._payloads:
+            return
+        script = shard_script(self.shard_count, self._payloads)
+        if self.details_dir:
+            with open(os.path.join(self.details_dir, f'shard_{self.shard_count:04d}.js'), 'w') as f:
+                f.write(script)
+        else:
+            self._inline.append(f'<script>{script}</script>')
+        self.shard_count += 1
+        self._payloads = []
+        self._size = 0
+
+    def inline_scripts(self):
+        self.flush()
+        return '\n'.join(self._inline)
+
+
+# Page-side loader; DETAILS_DIR is set by the page ('' when the shards are inlined)
+DETAIL_LOADER_JS = '''
+        const detailCache = {};
+        const detailWaiters = {};
+        window.__detailShards = {
+          load(shard, payloads) {
+            detailCache[shard] = payloads;
+            (detailWaiters[shard] || []).forEach(cb => cb(payloads));
+            delete detailWaiters[shard];
+          }
+        };
+        function loadDetails(test, cb) {
+          const shard = test.shard;
+          if (detailCache[shard]) { cb(Object.assign({}, test, detailCache[shard][test.slot])); return; }
+          if (!detailWaiters[shard]) {
+            detailWaiters[shard] = [];
+            if (DETAILS_DIR) {
+              const s = document.createElement('script');
+              s.src = DETAILS_DIR + '/shard_' + String(shard).padStart(4, '0') + '.js';
+              s.onerror = () => { (detailWaiters[shard] || []).forEach(w => w(null)); delete detailWaiters[shard]; };
+              document.head.appendChild(s);
+            }
+          }
+          detailWaiters[shard].push(payloads => cb(payloads ? Object.assign({}, test, payloads[test.slot]) : null));
+        }
+'''
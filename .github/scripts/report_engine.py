@@ -0,0 +1,1099 @@
+import os
+import sys
+import json
+import argparse
+from datetime import datetime
+
+import generate_index
+import fb_coreSDK_schema_validation_regression_result as regression
+from flaky_tests import flaky_for
+from instrument import add_trace_argument, enable_from_args, span, timed_iter
+from json_stream import load_response, ObjectWriter
+from regression_diff import compare_runs, fingerprint_tests
+from report_assets import VIRTUAL_LIST_JS, asset_tag
+from report_details import DetailShardWriter, DETAIL_LOADER_JS
+from report_index import TestIndex, TEST_INDEX_JS
+from results_layout import RESPONSE_FILES, RUN_DIR_RE, stored_response_path
+from run_history import append_record
+from run_index import RunIndex, split_run_path
+
+# WORKSPACE is the root of the repo (two directories up from .github/scripts/)
+WORKSPACE = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Every suite the engine knows about and the outputs it renders for it:
+#   sanity     - web_result/<sanity_page> + its summary.json entry + history.jsonl record (published)
+#   schema     - <schema_page> with detail shards, written to --schema-dir when given
+#   regression - <regression_page> comparing the run against --regression-base, when given
+SUITES = {
+    'CoreSanity': {
+        'response_file': RESPONSE_FILES['CoreSanity'],
+        'title': 'Firebolt Core Sanity Test Report',
+        'outputs': ('sanity', 'schema'),
+        'sanity_page': 'fb_core_sanity_result.html',
+        'summary_key': 'core_sanity_test',
+        'schema_page': 'CoreSanity_SchemaValidation_result_report.html',
+    },
+    'BadgerSanity': {
+        'response_file': RESPONSE_FILES['BadgerSanity'],
+        'title': 'Badger Core Sanity Test Report',
+        'outputs': ('sanity', 'schema'),
+        'sanity_page': 'fb_badger_sanity_result.html',
+        'summary_key': 'badger_sanity_test',
+        'schema_page': 'BadgerSanity_SchemaValidation_result_report.html',
+    },
+    'CoreSDKRegression': {
+        'response_file': 'fb_coreSDK_schema_validation_response.json',
+        'title': 'Firebolt CoreSDK Schema Validation Regression',
+        'outputs': ('regression',),
+        'regression_page': 'fb_coreSDK_schema_validation_regression_result.html',
+    },
+}
+
+# Page-side helpers of both page types, published once as assets/report-lib.<hash>.js
+REPORT_LIB_JS = VIRTUAL_LIST_JS + TEST_INDEX_JS + DETAIL_LOADER_JS
+
+# Per-run sanity page (fb_core_sanity_result.html / fb_badger_sanity_result.html)
+SANITY_TEMPLATE = '''
+<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="UTF-8">
+  <meta name="viewport" content="width=device-width, initial-scale=1.0">
+  <title>__TITLE__</title>
+  __STYLES__
+</head>
+<body>
+  <div class="container">
+    <h1>__TITLE__</h1>
+    <div class="platform-info">
+      <div class="left">
+        <span class="value" id="imagename"></span><br>
+        <span class="value" id="middleware_version"></span>
+      </div>
+      <div class="right">
+        <span class="value" id="test_date"></span><br>
+        <span class="value" id="fw_class"></span>
+      </div>
+    </div>
+    <div class="summary">
+      <div id="sumTotal" style="cursor:pointer;"><b>Total</b><br><span id="totalTests"></span></div>
+      <div id="sumPassed" class="passed" style="cursor:pointer;"><b>Passed</b><br><span id="passedTests"></span></div>
+      <div id="sumFailed" class="failed" style="cursor:pointer;"><b>Failed</b><br><span id="failedTests"></span></div>
+      <div id="sumSkipped" class="skipped" style="cursor:pointer;"><b>Skipped</b><br><span id="skippedTests"></span></div>
+      <div><b>Duration</b><br><span id="duration"></span></div>
+    </div>
+    <table id="catSummary" style="width:100%;margin-bottom:18px;background:#f9fafb;border-radius:8px;box-shadow:0 1px 4px #0001;overflow:hidden;">
+      <thead style="background:#e9eef3;font-weight:bold;"><tr><td>Category</td><td style='color:#28a745;cursor:pointer;'>Passed</td><td style='color:#dc3545;cursor:pointer;'>Failed</td><td style='color:#6c757d;cursor:pointer;'>Skipped</td></tr></thead>
+      <tbody></tbody>
+    </table>
+    <input id="filterInput" type="text" placeholder="Filter by name or ID..." style="width:100%;margin-bottom:12px;padding:8px 10px;border-radius:6px;border:1px solid #ccc;font-size:15px;" />
+    <div id="testNames"></div>
+  </div>
+  <script>
+    const data = __DATA__;
+  </script>
+  __SCRIPTS__
+</body>
+</html>
+'''
+
+# Stylesheet and script of the sanity page, published as assets/sanity-report.<hash>.css/.js
+SANITY_CSS = '''
+    body { font-family: sans-serif; background: #f4f7f9; color: #1a2c42; }
+    .container { max-width: 950px; margin: 32px auto; background: #fff; border-radius: 10px; box-shadow: 0 6px 16px rgba(0,0,0,0.08); padding: 28px; }
+    h1 { text-align: center; }
+    .platform-info { display: flex; justify-content: space-between; align-items: center; background: #e9eef3; border-radius: 8px; padding: 10px 18px; margin: 18px 0 18px 0; font-size: 15px; }
+    .platform-info .left { font-weight: 600; }
+    .platform-info .right { text-align: right; }
+    .platform-info .value { font-weight: 600; }
+    .summary { display: flex; justify-content: space-around; margin: 18px 0 24px 0; }
+    .summary div { background: #f4f7f9; border-radius: 8px; padding: 12px 18px; min-width: 90px; text-align: center; box-shadow: 0 1px 4px #0001; }
+    .summary .passed { color: #28a745; }
+    .summary .failed { color: #dc3545; }
+    .summary .skipped { color: #6c757d; }
+    ul { padding-left: 0; list-style: none; }
+    .test-row {
+      display: flex;
+      align-items: center;
+      justify-content: space-between;
+      padding: 10px 16px;
+      margin-bottom: 8px;
+      background: #f9fafb;
+      border-radius: 6px;
+      border: 1px solid #e3e8ee;
+      font-size: 15px;
+      transition: box-shadow 0.2s;
+      box-shadow: 0 1px 2px #0001;
+    }
+    .test-row:hover { box-shadow: 0 2px 8px #0002; background: #f3f6fa; }
+    .test-id { font-family: monospace; color: #1976d2; min-width: 110px; font-size: 14px; }
+    .test-name { flex: 1; margin: 0 18px; font-weight: 500; }
+    .test-status { min-width: 80px; text-align: right; font-size: 14px; font-weight: 600; border-radius: 12px; padding: 3px 12px; }
+    .test-status.passed { color: #28a745; background: #eaf7ef; border: 1px solid #28a745; }
+    .test-status.failed { color: #dc3545; background: #fdecef; border: 1px solid #dc3545; }
+    .test-status.skipped { color: #6c757d; background: #eef1f4; border: 1px solid #6c757d; }
+    .flaky-tag { margin-left: 8px; font-size: 11px; font-weight: 600; padding: 1px 6px; border-radius: 6px; background: #fff4d6; color: #8a6500; border: 1px solid #f0dca0; cursor: help; }
+'''
+SANITY_JS = '''
+    // Platform info values (injected by Python)
+    // Trim and shorten image name
+    let img = data._platform?.imagename || '';
+    if (img) {
+      // Keep only up to the third underscore (e.g. SCXI11BEI_MIDDLEWARE_DEV_develop)
+      let parts = img.split('_');
+      let trimmed = parts.slice(0, 4).join('_');
+      document.getElementById('imagename').textContent = trimmed;
+    } else {
+      document.getElementById('imagename').textContent = '';
+    }
+    document.getElementById('middleware_version').textContent = data._platform?.MIDDLEWARE_VERSION || '';
+    document.getElementById('fw_class').textContent = data._platform?.FW_CLASS || '';
+    // Format date (YYYYMMDD_HHMMSS to readable)
+    let dt = data._platform?.test_date || '';
+    if (/^\d{8}_\d{6}$/.test(dt)) {
+      // e.g. 20260216_175249
+      const y = dt.slice(0,4), m = dt.slice(4,6), d = dt.slice(6,8);
+      const hh = dt.slice(9,11), mm = dt.slice(11,13), ss = dt.slice(13,15);
+      document.getElementById('test_date').textContent = `${y}-${m}-${d} ${hh}:${mm}:${ss}`;
+    } else {
+      document.getElementById('test_date').textContent = dt;
+    }
+    // Summary
+    document.getElementById('totalTests').textContent = data.total_tests || (data.test_results ? data.test_results.length : 0);
+    document.getElementById('passedTests').textContent = data.passed || 0;
+    document.getElementById('failedTests').textContent = data.failed || 0;
+    document.getElementById('skippedTests').textContent = data.skipped || 0;
+    document.getElementById('duration').textContent = (data.duration_ms || 0) + ' ms';
+    // Test names
+    const filterInput = document.getElementById('filterInput');
+    let currentCategory = null;
+    let currentStatus = null;
+    let openTest = null;
+    // Only the rows near the viewport are in the DOM; renderRow fills a row when it scrolls into view
+    const testList = createVirtualList(document.getElementById('testNames'), renderRow, 46);
+    function renderList() {
+      const q = (filterInput.value || '').toLowerCase();
+      // Category/status membership is precomputed (data._index); only the text query is checked per test
+      const tests = indexedTests(data, currentCategory, currentStatus);
+      testList.setItems(q ? tests.filter(test => !q || (test.test_name && test.test_name.toLowerCase().includes(q)) || (test.test_id && test.test_id.toLowerCase().includes(q))) : tests);
+    }
+    function renderRow(test, row) {
+      const item = document.createElement('div');
+      item.className = 'test-row';
+      item.style.cursor = 'pointer';
+      // Status badge
+      let statusClass = '';
+      if (test.status === 'Passed' || test.status === 'Success') statusClass = 'passed';
+      else if (test.status === 'Failed') statusClass = 'failed';
+      else if (test.status === 'Skipped') statusClass = 'skipped';
+      const flaky = data._flaky && data._flaky[test.test_id];
+      const flakyTag = flaky ? `<span class=\"flaky-tag\" title=\"Outcome flipped in ${Math.round(flaky.flip_rate * 100)}% of its last ${flaky.runs} runs (${Math.round(flaky.failure_rate * 100)}% failed)\">flaky</span>` : '';
+      item.innerHTML = `<span class=\"test-id\">${test.test_id || ''}</span><span class=\"test-name\">${test.test_name || ''}${flakyTag}</span><span class=\"test-status ${statusClass}\">${test.status || ''}</span>`;
+
+      // Details div (always below, collapsible)
+      const details = document.createElement('div');
+      details.style.display = test === openTest ? 'block' : 'none';
+      details.style.background = '#f9fafb';
+      details.style.border = '1px solid #e3e8ee';
+      details.style.borderRadius = '6px';
+      details.style.margin = '0 0 12px 0';
+      details.style.padding = '10px 14px';
+      details.style.fontSize = '14px';
+      details.style.position = 'relative';
+      // Details are only built for the expanded test
+      if (test === openTest) {
+        let html = `<div><b>Status:</b> ${test.status || ''}</div>`;
+        html += `<div><b>Duration:</b> ${test.duration_ms || 0} ms</div>`;
+        if (test.status === 'Skipped') {
+          // For skipped, show request, response, error, and example if present
+          if (test.steps && test.steps.length > 0) {
+            html += `<div><b>Steps:</b><ol style='margin:6px 0 0 18px;'>`;
+            test.steps.forEach((step, idx) => {
+              html += `<li><b>${step.description || step.step_id || ''}</b><br>`;
+              if (step.request) html += `<span>Request:<br><pre style='background:#eef2f5;padding:6px 8px;border-radius:4px;margin:4px 0;'>${JSON.stringify(step.request, null, 2)}</pre></span>`;
+              if (step.response) html += `<span>Response:<br><pre style='background:#eef2f5;padding:6px 8px;border-radius:4px;margin:4px 0;'>${JSON.stringify(step.response, null, 2)}</pre></span>`;
+              if (step.error) html += `<span style='color:#c00;'>Error: ${step.error}</span><br>`;
+              if (step.examples && step.examples.length > 0) {
+                const ex = step.examples[0];
+                html += `<div style='margin-top:6px;'><b>Example Result:</b><br><pre style='background:#eaf7ef;padding:6px 8px;border-radius:4px;margin:4px 0;'>${JSON.stringify(ex.expected_result, null, 2)}</pre></div>`;
+              }
+              html += `</li>`;
+            });
+            html += `</ol></div>`;
+          }
+          if (test.error) html += `<div style='color:#c00;'><b>Error:</b> ${test.error}</div>`;
+        } else {
+          if (test.error) html += `<div style='color:#c00;'><b>Error:</b> ${test.error}</div>`;
+          if (test.steps && test.steps.length > 0) {
+            html += `<div><b>Steps:</b><ol style='margin:6px 0 0 18px;'>`;
+            test.steps.forEach((step, idx) => {
+              html += `<li><b>${step.description || step.step_id || ''}</b><br>`;
+              if (step.status) html += `<span>Status: ${step.status}</span><br>`;
+              if (step.request) html += `<span>Request:<br><pre style='background:#eef2f5;padding:6px 8px;border-radius:4px;margin:4px 0;'>${JSON.stringify(step.request, null, 2)}</pre></span>`;
+              if (step.response) html += `<span>Response:<br><pre style='background:#eef2f5;padding:6px 8px;border-radius:4px;margin:4px 0;'>${JSON.stringify(step.response, null, 2)}</pre></span>`;
+              if (step.error) html += `<span style='color:#c00;'>Error: ${step.error}</span><br>`;
+              // Show example result if failed and example exists
+              if ((test.status === 'Failed' || step.status === 'Failed') && step.examples && step.examples.length > 0) {
+                const ex = step.examples[0];
+                html += `<div style='margin-top:6px;'><b>Example Result:</b><br><pre style='background:#eaf7ef;padding:6px 8px;border-radius:4px;margin:4px 0;'>${JSON.stringify(ex.expected_result, null, 2)}</pre></div>`;
+              }
+              html += `</li>`;
+            });
+            html += `</ol></div>`;
+          }
+        }
+        details.innerHTML = html;
+      }
+      item.addEventListener('click', function(e) {
+        if (e.target.tagName === 'A' || e.target.tagName === 'INPUT' || e.target.tagName === 'BUTTON') return;
+        // One test is expanded at a time; re-rendering the visible rows collapses the previous one
+        openTest = openTest === test ? null : test;
+        testList.refresh();
+      });
+      details.classList.add('test-details');
+      row.appendChild(item);
+      row.appendChild(details);
+    }
+        // Summary bar click handlers
+        document.getElementById('sumTotal').onclick = () => {
+          currentStatus = 'Total';
+          renderList();
+        };
+        document.getElementById('sumPassed').onclick = () => {
+          currentStatus = 'Passed';
+          renderList();
+        };
+        document.getElementById('sumFailed').onclick = () => {
+          currentStatus = 'Failed';
+          renderList();
+        };
+        document.getElementById('sumSkipped').onclick = () => {
+          currentStatus = 'Skipped';
+          renderList();
+        };
+        // Default to show all
+        currentStatus = 'Total';
+    // Filtering re-runs over every test, so wait until typing pauses
+    filterInput.addEventListener('input', debounce(renderList, 150));
+
+    // Category summary table logic
+    function renderCatSummary() {
+      const tbody = document.querySelector('#catSummary tbody');
+      tbody.innerHTML = '';
+      // Category stats are precomputed (data._index.counts)
+      const catStats = data._index.counts;
+      const totalPassed = data._index.status.Passed.length;
+      const totalFailed = data._index.status.Failed.length;
+      const totalSkipped = data._index.status.Skipped.length;
+      // Add each category row
+      data._index.categories.forEach(cat => {
+        const stat = catStats[cat];
+        const tr = document.createElement('tr');
+        tr.style.cursor = 'pointer';
+        tr.innerHTML = `<td>${cat}</td><td style='color:#28a745;'>${stat.passed}</td><td style='color:#dc3545;'>${stat.failed}</td><td style='color:#6c757d;'>${stat.skipped}</td>`;
+        // Category cell click
+        tr.children[0].onclick = (e) => {
+          e.stopPropagation();
+          currentCategory = (currentCategory === cat) ? null : cat;
+          currentStatus = null;
+          renderList();
+          Array.from(tbody.children).forEach(row => row.style.background = '');
+          if (currentCategory) tr.style.background = '#e0e7ef';
+        };
+        // Passed/Failed/Skipped cell click
+        tr.children[1].onclick = (e) => {
+          e.stopPropagation();
+          currentCategory = cat;
+          currentStatus = 'Passed';
+          renderList();
+          Array.from(tbody.children).forEach(row => row.style.background = '');
+          tr.style.background = '#e0e7ef';
+        };
+        tr.children[2].onclick = (e) => {
+          e.stopPropagation();
+          currentCategory = cat;
+          currentStatus = 'Failed';
+          renderList();
+          Array.from(tbody.children).forEach(row => row.style.background = '');
+          tr.style.background = '#e0e7ef';
+        };
+        tr.children[3].onclick = (e) => {
+          e.stopPropagation();
+          currentCategory = cat;
+          currentStatus = 'Skipped';
+          renderList();
+          Array.from(tbody.children).forEach(row => row.style.background = '');
+          tr.style.background = '#e0e7ef';
+        };
+        tbody.appendChild(tr);
+      });
+      // Add total row last
+      const totalTr = document.createElement('tr');
+      totalTr.style.background = '#f3f6fa';
+      totalTr.style.fontWeight = 'bold';
+      totalTr.innerHTML = `<td>Total</td><td style='color:#28a745;'>${totalPassed}</td><td style='color:#dc3545;'>${totalFailed}</td><td style='color:#6c757d;'>${totalSkipped}</td>`;
+      // Click handlers for total row
+      totalTr.children[0].onclick = (e) => {
+        e.stopPropagation();
+        currentCategory = null;
+        currentStatus = 'Total';
+        renderList();
+        Array.from(tbody.children).forEach(row => row.style.background = '');
+        totalTr.style.background = '#e0e7ef';
+      };
+      totalTr.children[1].onclick = (e) => {
+        e.stopPropagation();
+        currentCategory = null;
+        currentStatus = 'Passed';
+        renderList();
+        Array.from(tbody.children).forEach(row => row.style.background = '');
+        totalTr.style.background = '#e0e7ef';
+      };
+      totalTr.children[2].onclick = (e) => {
+        e.stopPropagation();
+        currentCategory = null;
+        currentStatus = 'Failed';
+        renderList();
+        Array.from(tbody.children).forEach(row => row.style.background = '');
+        totalTr.style.background = '#e0e7ef';
+      };
+      totalTr.children[3].onclick = (e) => {
+        e.stopPropagation();
+        currentCategory = null;
+        currentStatus = 'Skipped';
+        renderList();
+        Array.from(tbody.children).forEach(row => row.style.background = '');
+        totalTr.style.background = '#e0e7ef';
+      };
+      tbody.appendChild(totalTr);
+    }
+
+    renderCatSummary();
+    renderList();
+'''
+
+# Schema validation page (<Suite>_SchemaValidation_result_report.html); step details live in shards
+SCHEMA_TEMPLATE = '''
+    <!DOCTYPE html>
+    <html lang="en">
+    <head>
+      <meta charset="UTF-8">
+      <meta name="viewport" content="width=device-width, initial-scale=1.0">
+      <title>Firebolt Schema Validation Result</title>
+      __STYLES__
+    </head>
+    <body>
+      <div class="container">
+        <h1 id="suiteName">Firebolt Schema Validation</h1>
+        <div class="meta"><span id="timestamp">Generated On: __TIMESTAMP__</span></div>
+        <div class="summary">
+          <div class="card">
+            <h3>Total</h3>
+            <div class="count" id="totalTests"></div>
+          </div>
+          <div class="card passed">
+            <h3>Passed</h3>
+            <div class="count" id="passedTests"></div>
+            <div class="progress"><span id="passBar" style="width:0%"></span></div>
+          </div>
+          <div class="card failed">
+            <h3>Failed</h3>
+            <div class="count" id="failedTests"></div>
+          </div>
+          <div class="card">
+            <h3>Skipped</h3>
+            <div class="count" id="skippedTests"></div>
+          </div>
+          <div class="card">
+            <h3>Duration</h3>
+            <div class="count" id="duration"></div>
+          </div>
+        </div>
+        <div style="margin-bottom: 16px;">
+          <table id="categorySummaryTable">
+            <thead><tr><th>Category</th><th>Total</th><th>Passed</th><th>Failed</th><th>Skipped</th></tr></thead>
+            <tbody id="categorySummaryBody"></tbody>
+            <tfoot id="categorySummaryFoot"></tfoot>
+          </table>
+        </div>
+        <div class="tabs" id="categoryTabs" style="margin-bottom: 12px;"></div>
+        <div class="controls">
+          <div class="left-controls">
+            <div class="search">
+              <span>🔎</span>
+              <input id="searchBox" type="text" placeholder="Search tests by name or ID..." />
+            </div>
+            <select id="sortSelect" class="select">
+              <option value="status">Sort: Status</option>
+              <option value="name">Sort: Name</option>
+              <option value="duration">Sort: Duration</option>
+            </select>
+          </div>
+          <div class="right-controls">
+            <button class="btn" onclick="expandAll()">Expand All</button>
+            <button class="btn" onclick="collapseAll()">Collapse All</button>
+          </div>
+        </div>
+        <div class="tabs" style="margin-bottom: 12px;">
+          <div class="tab active" id="tab-all" onclick="showTab('All')">All</div>
+          <div class="tab" id="tab-pass" onclick="showTab('Passed')">Pass</div>
+          <div class="tab" id="tab-fail" onclick="showTab('Failed')">Fail</div>
+        </div>
+        <div class="test-list" id="testList"></div>
+      </div>
+      <script>
+        const data = __DATA__;
+        // Step payloads are not part of data; they are loaded per shard when a test is expanded
+        const DETAILS_DIR = '__DETAILS_DIR__';
+      </script>
+      __SCRIPTS__
+__DETAIL_SHARDS__    </body>
+    </html>
+    '''
+
+# Stylesheet and script of the schema validation page (assets/schema-report.<hash>.css/.js)
+SCHEMA_CSS = '''
+        body { font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Helvetica, Arial, sans-serif; margin: 0; padding: 0; background: #f4f7f9; color:#1a2c42; }
+        .container { max-width: 1200px; margin: 32px auto; background: #fff; border-radius: 10px; box-shadow: 0 6px 16px rgba(0,0,0,0.08); padding: 28px; }
+        h1 { text-align: center; margin: 0 0 6px 0; }
+        .meta { text-align:center; color:#6b7b8c; font-size: 13px; margin-bottom: 16px; }
+        .summary { display: grid; grid-template-columns: repeat(auto-fit, minmax(160px,1fr)); gap: 14px; margin-bottom: 16px; }
+        .card { background:#f9fafb; border:1px solid #eef2f5; border-radius:10px; padding:14px; text-align:center; }
+        .card h3 { margin:0 0 6px 0; font-size:13px; color:#44566c; font-weight:600; }
+        .card .count { font-size:24px; font-weight:700; }
+        .card.passed .count{ color:#28a745; }
+        .card.failed .count{ color:#dc3545; }
+        .card.skipped .count{ color:#6c757d; }
+        .progress { position:relative; height:6px; background:#eef2f5; border-radius:999px; overflow:hidden; margin-top:8px; }
+        .progress > span { position:absolute; left:0; top:0; bottom:0; background:linear-gradient(90deg,#28a745,#20c997); border-radius:999px; }
+        .controls { display:flex; gap:10px; flex-wrap:wrap; align-items:center; justify-content:space-between; background:#f9fafb; border:1px solid #eef2f5; border-radius:10px; padding:10px 12px; margin: 10px 0 18px 0; }
+        .left-controls, .right-controls{ display:flex; gap:10px; align-items:center; flex-wrap:wrap; }
+        .search { display:flex; align-items:center; gap:8px; background:#fff; border:1px solid #e3e8ee; border-radius:8px; padding:6px 10px; }
+        .search input{ border:none; outline:none; font-size:14px; min-width:220px; }
+        .select { border:1px solid #e3e8ee; background:#fff; border-radius:8px; padding:6px 10px; font-size:14px; }
+        .btn { border:1px solid #e3e8ee; background:#fff; border-radius:8px; padding:6px 10px; font-size:13px; cursor:pointer; }
+        .btn:hover{ background:#f3f6f9; }
+        .tabs { display:flex; justify-content:center; flex-wrap:wrap; margin: 10px 0 12px 0; gap:6px; }
+        .tab { padding:10px 18px; cursor:pointer; border-radius:999px; background:#e9eef3; font-weight:600; color:#44566c; }
+        .tab.active { background:#1976d2; color:#fff; }
+        .test-list { background:#fff; border:1px solid #eef2f5; border-radius:10px; padding: 0 0 6px 0; overflow:hidden; }
+        .test-item { border-top: 1px solid #eef2f5; padding: 12px 16px; }
+        .test-item:first-child{ border-top:none; }
+        .test-header { display:flex; justify-content:space-between; align-items:center; gap:12px; cursor:pointer; }
+        .test-name { font-weight:600; }
+        .idtag { font-size:11px; padding:2px 6px; border-radius:6px; background:#eef1f4; color:#6b7b8c; margin-right:8px; border:1px solid #e3e8ee; }
+        .badge { font-size:12px; padding:3px 8px; border-radius:999px; border:1px solid currentColor; }
+        .badge.passed{ color:#28a745; background:#eaf7ef; }
+        .badge.failed{ color:#dc3545; background:#fdecef; }
+        .badge.skipped{ color:#6c757d; background:#eef1f4; }
+        .duration { color:#6b7b8c; font-size:12px; }
+        .details { display:none; background:#f9fbfd; border:1px solid #eef2f5; border-radius:8px; margin-top:10px; padding:12px; }
+        .detail-grid{ display:flex; gap:12px; flex-wrap:wrap; }
+        .col{ flex:1 1 380px; }
+        h4{ margin:8px 0 6px 0; font-size:13px; color:#44566c; }
+        pre{ background:#eef2f5; padding:10px; border-radius:6px; overflow:auto; font-size:12px; white-space: pre-wrap; word-break: break-word; overflow-wrap: anywhere; }
+        table { width:100%;border-collapse:collapse;background:#fff;border-radius:10px;overflow:hidden;box-shadow:0 1px 4px #0001; margin-bottom: 16px; }
+        th, td { padding:10px; text-align:center; }
+        thead { background:#1976d2;color:#fff; }
+        .link{ color:#1976d2; cursor:pointer; text-decoration:underline; }
+'''
+SCHEMA_JS = '''
+        // Header and counters
+        if (data.suite_name !== undefined) document.getElementById('suiteName').textContent = data.suite_name;
+        document.getElementById('totalTests').textContent = data.total_tests !== undefined ? data.total_tests : data.test_results.length;
+        document.getElementById('passedTests').textContent = data.passed || 0;
+        document.getElementById('failedTests').textContent = data.failed || 0;
+        document.getElementById('skippedTests').textContent = data.skipped || 0;
+        document.getElementById('duration').textContent = (data.duration_ms || 0) + ' ms';
+        // Categories, per-category counts and status groups are precomputed in data._index
+        const categories = data._index.categories;
+        let selectedCategory = 'All';
+        let currentSearch = '';
+        let currentSort = 'status';
+
+        function renderCategoryTabs() {
+          const catTabs = document.getElementById('categoryTabs');
+          catTabs.innerHTML = '';
+          const allTab = document.createElement('div');
+          allTab.className = 'tab' + (selectedCategory === 'All' ? ' active' : '');
+          allTab.textContent = 'All';
+          allTab.onclick = () => { selectedCategory = 'All'; renderCategoryTabs(); showTab(currentStatusTab); };
+          catTabs.appendChild(allTab);
+          categories.forEach(cat => {
+            const tab = document.createElement('div');
+            tab.className = 'tab' + (cat === selectedCategory ? ' active' : '');
+            tab.textContent = cat;
+            tab.onclick = () => { selectedCategory = cat; renderCategoryTabs(); showTab(currentStatusTab); };
+            catTabs.appendChild(tab);
+          });
+        }
+
+        // Category summary table
+        function renderCategorySummaryTable() {
+          const tbody = document.getElementById('categorySummaryBody');
+          const tfoot = document.getElementById('categorySummaryFoot');
+          tbody.innerHTML = '';
+          tfoot.innerHTML = '';
+          const allCats = categories;
+          let grandTotal = 0, grandPassed = 0, grandFailed = 0, grandSkipped = 0;
+          
+          allCats.forEach(cat => {
+            const { total, passed, failed, skipped } = data._index.counts[cat];
+            
+            grandTotal += total;
+            grandPassed += passed;
+            grandFailed += failed;
+            grandSkipped += skipped;
+            
+            const tr = document.createElement('tr');
+            tr.innerHTML = `<td class='link' onclick="filterCategory('${cat}')">${cat}</td>
+                            <td>${total}</td>
+                            <td style='color:#28a745;'>${passed}</td>
+                            <td style='color:#dc3545;'>${failed}</td>
+                            <td style='color:#6c757d;'>${skipped}</td>`;
+            tbody.appendChild(tr);
+          });
+          
+          // Add total row in footer
+          const totalTr = document.createElement('tr');
+          totalTr.innerHTML = `<td style='font-weight:bold;background:#f8f9fa;'><b>Total</b></td>
+                              <td style='font-weight:bold;background:#f8f9fa;'><b>${grandTotal}</b></td>
+                              <td style='font-weight:bold;background:#f8f9fa;color:#28a745;'><b>${grandPassed}</b></td>
+                              <td style='font-weight:bold;background:#f8f9fa;color:#dc3545;'><b>${grandFailed}</b></td>
+                              <td style='font-weight:bold;background:#f8f9fa;color:#6c757d;'><b>${grandSkipped}</b></td>`;
+          tfoot.appendChild(totalTr);
+        }
+
+        window.filterCategory = function(cat) {
+          selectedCategory = cat;
+          renderCategoryTabs();
+          showTab(currentStatusTab);
+        }
+
+        // Tab logic
+        let currentStatusTab = 'All';
+        window.showTab = function(status) {
+          currentStatusTab = status;
+          document.getElementById('tab-all').classList.remove('active');
+          document.getElementById('tab-pass').classList.remove('active');
+          document.getElementById('tab-fail').classList.remove('active');
+          if (status === 'All') {
+            document.getElementById('tab-all').classList.add('active');
+          } else if (status === 'Passed') {
+            document.getElementById('tab-pass').classList.add('active');
+          } else {
+            document.getElementById('tab-fail').classList.add('active');
+          }
+          renderTestList(status);
+        }
+
+        // Builds the step details of one test (request/response/error/example per step)
+        function renderDetails(test, detailsDiv, loaded) {
+          let html = `<div style='margin-bottom:8px;color:#6b7b8c;font-size:12px;'><b>Test ID:</b> ${test.test_id || ''}</div>`;
+          if (!loaded) {
+            html += `<div style='color:#dc3545;'>Could not load the step details from ${DETAILS_DIR}/.</div>`;
+          }
+          if (test.steps && test.steps.length > 0) {
+            test.steps.forEach((step) => {
+              const req = step.request ? JSON.stringify(step.request, null, 2) : '';
+              const res = step.response ? JSON.stringify(step.response, null, 2) : '';
+              const err = step.error ? `${step.error}` : '';
+              
+              // Generate example when test failed
+              let exampleSection = '';
+              if (test.status === 'Failed' && step.error) {
+                const exampleRequest = step.request ? JSON.stringify(step.request, null, 2) : 
+                  `{
+  "jsonrpc": "2.0",
+  "id": "1",
+  "method": "Device.version",
+  "params": {}
+}`;
+                const exampleResponse = (step.examples && step.examples.length > 0 && step.examples[0].expected_result !== undefined)
+                  ? JSON.stringify(step.examples[0].expected_result, null, 2)
+                  : (res || '');
+                exampleSection = `<h4 style='color:#28a745;'>✨ Expected Example</h4>
+                  <div class='detail-grid' style='margin-bottom:10px;'>
+                    <div class='col'>
+                      <h5>Example Request</h5>
+                      <pre style='background:#eaf7ef;border:1px solid #28a745;'>${exampleRequest}</pre>
+                    </div>
+                    <div class='col'>
+                      <h5>Example Response</h5>
+                      <pre style='background:#eaf7ef;border:1px solid #28a745;'>${exampleResponse}</pre>
+                    </div>
+                  </div>`;
+              }
+              
+              html += `<div style='margin-bottom:12px;'>
+                <div><b>Step:</b> ${step.description || step.step_id || ''}</div>
+                <div class='detail-grid'>
+                  <div class='col'>
+                    <h4>Request <span class='link' onclick="copyText(this)">Copy</span></h4>
+                    <pre>${req}</pre>
+                  </div>
+                  <div class='col'>
+                    <h4>Response <span class='link' onclick="copyText(this)">Copy</span></h4>
+                    <pre>${res}</pre>
+                    ${err ? `<h4 style='color:#dc3545;'>❌ Error Details</h4><pre style='background:#fdecef;color:#842029;border:1px solid #dc3545;'>${err}</pre>` : ''}
+                  </div>
+                </div>
+                ${exampleSection}
+              </div>`;
+            });
+          }
+          detailsDiv.innerHTML = html;
+        }
+
+        // Only the rows near the viewport are in the DOM; expanded tests are tracked here so they
+        // stay expanded when their row is scrolled out and back in
+        const expanded = new Set();
+        const testListView = createVirtualList(document.getElementById('testList'), renderTestRow, 60);
+
+        function renderTestList(status) {
+          let filtered = indexedTests(data, selectedCategory, status);
+          if (currentSearch.trim() !== ''){
+            const q = currentSearch.toLowerCase();
+            filtered = filtered.filter(t => (t.test_name||'').toLowerCase().includes(q) || (t.test_id||'').toLowerCase().includes(q));
+          }
+          if (currentSort === 'status'){
+            filtered.sort((a, b) => { const order = { 'Passed': 0, 'Success': 0, 'Failed': 1, 'Skipped': 2 }; return (order[a.status]||9) - (order[b.status]||9); });
+          } else if (currentSort === 'name'){
+            filtered.sort((a,b)=> (a.test_name||'').localeCompare(b.test_name||''));
+          } else if (currentSort === 'duration'){
+            filtered.sort((a,b)=> (a.duration_ms||0) - (b.duration_ms||0));
+          }
+          testListView.setItems(filtered);
+          if (filtered.length === 0) {
+            document.getElementById('testList').innerHTML = `<div style='padding:12px;'>No ${status === 'All' ? '' : status.toLowerCase()} test cases${selectedCategory !== 'All' ? ' in ' + selectedCategory : ''}.</div>`;
+          }
+        }
+
+        function renderTestRow(test, row) {
+          const testDiv = document.createElement('div');
+          testDiv.className = 'test-item';
+
+          const header = document.createElement('div');
+          header.className = 'test-header';
+          header.innerHTML = `<div>
+              <span class="idtag">${test.test_id || ''}</span>
+              <span class="test-name">${test.test_name}</span>
+              <span class="badge ${(test.status||'').toLowerCase()}">${test.status}</span>
+            </div>
+            <div class="duration">${(test.duration_ms||0)} ms</div>`;
+
+          const detailsDiv = document.createElement('div');
+          detailsDiv.className = 'details';
+          // Details are only rendered for expanded tests, once their shard has been loaded
+          const showDetails = function() {
+            detailsDiv.style.display = 'block';
+            detailsDiv.innerHTML = `<div style='color:#6b7b8c;font-size:12px;'>Loading details...</div>`;
+            loadDetails(test, full => renderDetails(full || test, detailsDiv, !!full));
+          };
+          if (expanded.has(test)) showDetails();
+          testDiv.appendChild(header);
+          testDiv.appendChild(detailsDiv);
+
+          header.addEventListener('click', function(e) {
+            if (e.target.tagName === 'A' || e.target.tagName === 'INPUT' || e.target.tagName === 'BUTTON') return;
+            if (expanded.has(test)) {
+              expanded.delete(test);
+              detailsDiv.style.display = 'none';
+            } else {
+              expanded.add(test);
+              showDetails();
+            }
+          });
+
+          row.appendChild(testDiv);
+        }
+
+        // Initial render
+        renderCategoryTabs();
+        renderCategorySummaryTable();
+        window.showTab('All');
+
+        // Enhance counters and bars
+        const passPct = data.total_tests ? Math.round(((data.passed||0)/data.total_tests)*100) : 0;
+        const passBar = document.getElementById('passBar');
+        if (passBar) passBar.style.width = passPct + '%';
+
+        // Controls listeners
+        // Filtering re-runs over every test, so wait until typing pauses
+        const refilter = debounce(() => showTab(currentStatusTab), 150);
+        document.getElementById('searchBox').addEventListener('input', (e)=>{ currentSearch = e.target.value || ''; refilter(); });
+        document.getElementById('sortSelect').addEventListener('change', (e)=>{ currentSort = e.target.value; showTab(currentStatusTab); });
+
+        // Expand/Collapse helpers
+        window.expandAll = function(){
+          testListView.items().forEach(t => expanded.add(t));
+          testListView.refresh();
+        }
+        window.collapseAll = function(){
+          expanded.clear();
+          testListView.refresh();
+        }
+
+        // Copy helper
+        window.copyText = function(el){
+          const pre = el.closest('h4')?.nextElementSibling;
+          if (!pre) return;
+          const txt = pre.innerText;
+          navigator.clipboard?.writeText(txt).then(()=>{
+            const old = el.textContent;
+            el.textContent = 'Copied';
+            setTimeout(()=> el.textContent = 'Copy', 1000);
+          }).catch(()=>{});
+        }
+'''
+
+
+def parse_version_txt(version_txt_path, test_date):
+    platform = {}
+    if os.path.isfile(version_txt_path):
+        with open(version_txt_path) as f:
+            for line in f:
+                if line.startswith('imagename:'):
+                    platform['imagename'] = line.strip().split(':', 1)[1]
+                elif line.startswith('MIDDLEWARE_VERSION='):
+                    platform['MIDDLEWARE_VERSION'] = line.strip().split('=', 1)[1]
+                elif line.startswith('FW_CLASS='):
+                    platform['FW_CLASS'] = line.strip().split('=', 1)[1]
+    platform['test_date'] = test_date
+    return platform
+
+
+def display_timestamp(timestamp):
+    """'20260118_181549' -> 'Jan 18, 2026 18:15:49'; the current time if the name is not a timestamp."""
+    try:
+        return datetime.strptime(timestamp, "%Y%m%d_%H%M%S").strftime("%b %d, %Y %H:%M:%S")
+    except Exception:
+        return datetime.now().strftime("%b %d, %Y %H:%M:%S")
+
+
+def find_latest_result_file(base_folder, file_name):
+    """Returns (result_file, run_folder) of the newest run folder under base_folder holding file_name.
+
+    Falls back to file_name directly inside base_folder; (None, None) if neither exists.
+    """
+    print(f"[INFO] Searching for results in base folder: {base_folder}")
+    if not os.path.isdir(base_folder):
+        print(f"[ERROR] Base folder not found: {base_folder}")
+        return None, None
+    # Exclude the aggregation folders from consideration
+    subfolders = [f.name for f in os.scandir(base_folder) if f.is_dir() and f.name not in ('artifacts', 'web_result')]
+    if subfolders:
+        # Folder names are YYYYMMDD_HHMMSS; mtimes are all the same in a fresh checkout
+        latest_subfolder = os.path.join(base_folder, max(subfolders))
+        print(f"[INFO] Using latest subfolder: {latest_subfolder}")
+        result_file = os.path.join(latest_subfolder, file_name)
+        if os.path.isfile(result_file):
+            print(f"[INFO] Found result file: {result_file}")
+            return result_file, latest_subfolder
+        print(f"[WARN] Result JSON not found in {latest_subfolder}")
+    direct_json = os.path.join(base_folder, file_name)
+    if os.path.isfile(direct_json):
+        print(f"[INFO] Found direct result file: {direct_json}")
+        return direct_json, base_folder
+    print(f"[ERROR] No timestamped subfolders found and no direct JSON in {base_folder}")
+    return None, None
+
+
+def latest_run_dir(result_dir):
+    """Newest <YYYYMMDD_HHMMSS> directory under a proposition directory (by name), or None."""
+    runs = sorted(e.name for e in os.scandir(result_dir) if e.is_dir() and RUN_DIR_RE.match(e.name))
+    return os.path.join(result_dir, runs[-1]) if runs else None
+
+
+class SanityPage:
+    """Streams one run into web_result/<sanity_page> next to the run directory."""
+
+    def __init__(self, suite, json_path, platform, index, flaky=None):
+        self.index = index
+        self.platform = platform
+        self.flaky = flaky or {}
+        self.path = os.path.join(os.path.dirname(os.path.dirname(json_path)), 'web_result', suite['sanity_page'])
+        page_dir = os.path.dirname(self.path)
+        page = SANITY_TEMPLATE.replace('__TITLE__', suite['title'])
+        page = page.replace('__STYLES__', asset_tag('sanity-report', 'css', SANITY_CSS, page_dir))
+        page = page.replace('__SCRIPTS__', asset_tag('report-lib', 'js', REPORT_LIB_JS, page_dir) + '\n  '
+                            + asset_tag('sanity-report', 'js', SANITY_JS, page_dir))
+        head, self.tail = page.split('__DATA__', 1)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.f = open(self.path, 'w')
+        self.f.write(head)
+        self.writer = ObjectWriter(self.f)
+
+    def add(self, test):
+        self.writer.add(test)
+
+    def close(self, meta):
+        with span('close sanity page'):
+            self.writer.close(meta, extra={'_platform': self.platform, '_index': self.index.data, '_flaky': self.flaky})
+            self.f.write(self.tail)
+            self.f.close()
+        print(f"[SUCCESS] Generated JS-based report: {self.path}")
+
+
+class SchemaPage:
+    """Streams one run into <out_dir>/<schema_page>: a slim test list plus detail shards.
+
+    The shards go to <schema_page minus .html>_details/ unless split_details is false, in which
+    case they (and the page's assets) are embedded so the page stays a single file.
+    """
+
+    def __init__(self, suite, out_dir, timestamp, index, split_details=True):
+        self.index = index
+        self.path = os.path.join(out_dir, suite['schema_page'])
+        details_url = ''
+        self.shards = DetailShardWriter()
+        if split_details:
+            details_url = os.path.splitext(suite['schema_page'])[0] + '_details'
+            self.shards = DetailShardWriter(os.path.join(out_dir, details_url))
+        # A single-file page embeds its stylesheet and scripts as well
+        inline = not split_details
+        page = SCHEMA_TEMPLATE.replace('__TIMESTAMP__', display_timestamp(timestamp)).replace('__DETAILS_DIR__', details_url)
+        page = page.replace('__STYLES__', asset_tag('schema-report', 'css', SCHEMA_CSS, out_dir, inline))
+        page = page.replace('__SCRIPTS__', asset_tag('report-lib', 'js', REPORT_LIB_JS, out_dir, inline) + '\n      '
+                            + asset_tag('schema-report', 'js', SCHEMA_JS, out_dir, inline))
+        head, rest = page.split('__DATA__', 1)
+        self.tail, self.end = rest.split('__DETAIL_SHARDS__', 1)
+        os.makedirs(out_dir, exist_ok=True)
+        self.f = open(self.path, 'w')
+        self.f.write(head)
+        self.writer = ObjectWriter(self.f)
+
+    def add(self, test):
+        self.writer.add(self.shards.add(test))
+
+    def close(self, meta):
+        with span('close schema page'):
+            self.writer.close(meta, extra={'_index': self.index.data})
+            self.f.write(self.tail)
+            self.f.write(self.shards.inline_scripts())
+            self.f.write(self.end)
+            self.f.close()
+        if self.shards.details_dir:
+            print(f"[INFO] Wrote {self.shards.shard_count} detail shard(s) to {self.shards.details_dir}")
+        print(f"[SUCCESS] Generated test report: {self.path}")
+
+
+def summary_entry(json_path, platform, meta, test_count):
+    """summary.json / history.jsonl entry of one run; json_path is <category>/<branch>/<proposition>/<timestamp>/..."""
+    path_parts = os.path.normpath(json_path).split(os.sep)
+    return {
+        'result_category': path_parts[0] if len(path_parts) > 0 else '',
+        'date': path_parts[3] if len(path_parts) > 3 else '',
+        'image': platform.get('imagename', ''),
+        'RDK version': platform.get('MIDDLEWARE_VERSION', ''),
+        'branch': path_parts[1] if len(path_parts) > 1 else '',
+        'proposition': path_parts[2] if len(path_parts) > 2 else '',
+        'result': {
+            'Total': meta.get('total_tests', test_count),
+            'passed': meta.get('passed', 0),
+            'failed': meta.get('failed', 0),
+            'skiped': meta.get('skipped', 0)
+        }
+    }
+
+
+def update_summary(web_result_dir, key, entry):
+    summary_path = os.path.join(web_result_dir, 'summary.json')
+    summary = {}
+    if os.path.isfile(summary_path):
+        try:
+            with open(summary_path) as f:
+                summary = json.load(f)
+        except Exception:
+            summary = {}
+    summary[key] = entry
+    with open(summary_path, 'w') as f:
+        json.dump(summary, f, indent=2)
+    print(f"[SUCCESS] Updated summary.json: {summary_path}")
+
+
+def render_run(suite_name, json_path, render=True, schema_dir=None, split_details=True, keep_tests=False):
+    """Parses one response file once and feeds every requested output while the tests stream past.
+
+    json_path must be relative to the workspace root (<category>/<branch>/<proposition>/<timestamp>/...).
+    render=False only records the run in the history (runs older than the published one).
+    schema_dir additionally writes the schema validation page there; keep_tests returns the parsed
+    tests (for the regression comparison), otherwise they are not kept in memory.
+    Returns (summary entry, tests or None).
+    """
+    with span(f'render {suite_name}', path=json_path):
+        return _render_run(suite_name, json_path, render, schema_dir, split_details, keep_tests)
+
+
+def _render_run(suite_name, json_path, render, schema_dir, split_details, keep_tests):
+    suite = SUITES[suite_name]
+    run_dir = os.path.dirname(json_path)
+    timestamp = os.path.basename(run_dir)
+    platform = parse_version_txt(os.path.join(run_dir, 'version.txt'), timestamp)
+    # Small files are parsed here in one go, large ones are streamed (timed as 'parse' below)
+    with span('load response'):
+        meta, tests = load_response(json_path)
+
+    index = TestIndex()
+    sinks = []
+    with span('open pages'):
+        if render and 'sanity' in suite['outputs']:
+            # Tests tagged as flaky by flaky_tests.py for this branch/proposition
+            flaky = flaky_for(split_run_path(run_dir), suite_name)
+            sinks.append(SanityPage(suite, json_path, platform, index, flaky))
+        if schema_dir and 'schema' in suite['outputs']:
+            sinks.append(SchemaPage(suite, schema_dir, timestamp, index, split_details))
+    kept = [] if keep_tests else None
+    test_count = 0
+    # Parsing and rendering interleave per test; the span's 'parse' part is the time spent in the parser
+    with span('stream tests'):
+        for test in timed_iter('parse', tests):
+            index.add(test)
+            for sink in sinks:
+                sink.add(test)
+            if kept is not None:
+                kept.append(test)
+            test_count += 1
+    for sink in sinks:
+        sink.close(meta)
+
+    entry = None
+    if 'sanity' in suite['outputs']:
+        entry = summary_entry(json_path, platform, meta, test_count)
+        web_result_dir = os.path.join(os.path.dirname(run_dir), 'web_result')
+        with span('summary and history'):
+            if render:
+                update_summary(web_result_dir, suite['summary_key'], entry)
+            # Keep every run, not just the latest, in the append-only history
+            append_record(web_result_dir, suite['summary_key'], entry)
+    if kept is not None:
+        kept = dict(meta, test_results=kept)
+    return entry, kept
+
+
+def regression_baseline(run_dir, response_file):
+    """Workspace-relative directory of the latest release run to compare run_dir against, or None."""
+    run = split_run_path(run_dir)
+    base = None
+    if run and len(run) == 4:
+        # The saved index is only updated by generate_index.py, which runs after this (also under
+        # dev_server.py): re-list the proposition's release runs so a new or deleted one is seen
+        index = RunIndex.load()
+        index.refresh_branches('release', run[2])
+        base = index.release_baseline(run, file_name=response_file)
+    if not base:
+        print(f"[WARN] No release run with {response_file} found for {run_dir}; skipping regression")
+        return None
+    print(f"[INFO] Using regression base {os.path.join(*base)}")
+    return os.path.join(*base)
+
+
+def render_regression(suite_name, json_path, base_dir, out_dir='.'):
+    """Writes the regression page of one run against the same suite's response in base_dir."""
+    suite = SUITES[suite_name]
+    base_file = stored_response_path(base_dir, suite['response_file']) or os.path.join(base_dir, suite['response_file'])
+    if not os.path.isfile(base_file):
+        print(f"[WARN] Base reference file not found at: {base_file}; skipping {suite_name} regression")
+        return None
+    with span(f'regression {suite_name}', base=base_dir):
+        _, current_data = render_run(suite_name, json_path, render=False, keep_tests=True)
+        with span('load base'):
+            _, base_tests = load_response(base_file)
+        with span('fingerprint base'):
+            base_prints = fingerprint_tests(timed_iter('parse', base_tests))
+        with span('fingerprint current'):
+            prints = fingerprint_tests(current_data['test_results'])
+        with span('compare'):
+            comparison = compare_runs(base_prints, prints)
+        out_path = os.path.join(out_dir, suite['regression_page'])
+        flaky = flaky_for(split_run_path(os.path.dirname(json_path)))
+        regression.write_comparison_report(comparison, os.path.dirname(json_path), base_dir, out_path, flaky)
+    return out_path
+
+
+def sanity_main(suite_name):
+    """CLI of the per-suite sanity scripts: <script> <result_json>."""
+    if len(sys.argv) != 2:
+        print(f"Usage: python {os.path.basename(sys.argv[0])} <result_json>")
+        sys.exit(1)
+    json_path = sys.argv[1]
+    if not os.path.isfile(json_path):
+        print(f"File not found: {json_path}")
+        sys.exit(1)
+    render_run(suite_name, json_path)
+
+
+def schema_main(suite_name):
+    """CLI of the per-suite schema validation scripts: page for the latest run under RESULT_DIR, written to cwd."""
+    result_dir = os.getenv('RESULT_DIR')
+    result_file = None
+    if result_dir:
+        print(f"[INFO] Loading files from RESULT_DIR: {result_dir}")
+        result_file, _ = find_latest_result_file(result_dir, SUITES[suite_name]['response_file'])
+    if not result_file:
+        print("[ERROR] Cannot generate test report. Result JSON is missing.")
+        print("[ERROR] RESULT_DIR is empty Aborting report generation.")
+        return
+    # REPORT_SPLIT_DETAILS=0 embeds the detail shards so the report stays a single file
+    split_details = os.getenv('REPORT_SPLIT_DETAILS', '1') != '0'
+    suite = SUITES[suite_name]
+    with span(f'schema {suite_name}', path=result_file):
+        with span('load response'):
+            meta, tests = load_response(result_file)
+        index = TestIndex()
+        page = SchemaPage(suite, os.getcwd(), os.path.basename(os.path.dirname(result_file)), index, split_details)
+        with span('stream tests'):
+            for test in timed_iter('parse', tests):
+                page.add(index.add(test))
+        page.close(meta)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Render every configured output of the latest run of a proposition in one pass.')
+    parser.add_argument('result_dir', metavar='RESULT_DIR', help='Proposition directory, e.g. develop/<branch>/<proposition>/')
+    parser.add_argument('--suite', action='append', choices=sorted(SUITES), help='Only these suites (default: every suite with a response file)')
+    parser.add_argument('--run', metavar='TIMESTAMP', help='Render this run instead of the latest one')
+    parser.add_argument('--schema-dir', metavar='DIR', help='Also write the schema validation pages (with detail shards) here')
+    parser.add_argument('--regression-base', metavar='DIR',
+                        help="Also write regression pages against the run directory DIR; 'auto' picks the latest "
+                             "release run of the same proposition from the run index")
+    parser.add_argument('--no-index', action='store_true', help='Do not refresh the index tabs afterwards')
+    add_trace_argument(parser)
+    args = parser.parse_args()
+    enable_from_args(args)
+
+    # Summary entries derive category/branch/proposition from the workspace-relative path
+    result_dir = os.path.relpath(os.path.abspath(args.result_dir), WORKSPACE)
+    if args.regression_base and args.regression_base != 'auto':
+        args.regression_base = os.path.relpath(os.path.abspath(args.regression_base), WORKSPACE)
+    os.chdir(WORKSPACE)
+    run_dir = os.path.join(result_dir, args.run) if args.run else latest_run_dir(result_dir)
+    if not run_dir or not os.path.isdir(run_dir):
+        print(f"[WARN] No timestamped run directory found in {result_dir}, nothing to render")
+        return
+    print(f"[INFO] Rendering run {run_dir}")
+
+    rendered = 0
+    for suite_name in args.suite or SUITES:
+        suite = SUITES[suite_name]
+        json_path = stored_response_path(run_dir, suite['response_file'])
+        if not json_path:
+            continue
+        if 'regression' in suite['outputs']:
+            base_dir = args.regression_base
+            if base_dir == 'auto':
+                base_dir = regression_baseline(run_dir, suite['response_file'])
+            if base_dir:
+                render_regression(suite_name, json_path, base_dir)
+                rendered += 1
+            continue
+        render_run(suite_name, json_path, schema_dir=args.schema_dir)
+        rendered += 1
+    print(f"[INFO] Rendered {rendered} suite(s) from {run_dir}")
+
+    if rendered and not args.no_index:
+        generate_index.update_index([result_dir])
+
+
+if __name__ == '__main__':
+    main()
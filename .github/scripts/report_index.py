@@ -0,0 +1,70 @@
+import re
+
+# Status groups used by the summary tables and tabs of the report pages ('Success' counts as passed)
+STATUS_GROUPS = {
+    'Passed': ('Passed', 'Success'),
+    'Failed': ('Failed',),
+    'Skipped': ('Skipped',),
+}
+_GROUP_OF = {status: group for group, statuses in STATUS_GROUPS.items() for status in statuses}
+
+
+def test_category(test_id):
+    """Category of a test: its id up to the first digit (same rule as the report pages)."""
+    return re.split(r'\d', test_id or '')[0]
+
+
+class TestIndex:
+    """Category/status lookup tables for one report, built while its tests stream past.
+
+    .data is embedded in the page as data._index and filled in place by add(), so it can be handed
+    to write_object() as extra before the tests are consumed:
+
+        {"categories": [cat, ...],                       # first-seen order
+         "counts": {cat: {"total", "passed", "failed", "skipped"}},
+         "status": {"Passed": [i, ...], "Failed": [...], "Skipped": [...]},
+         "category": {cat: {"All": [i, ...], "Passed": [...], "Failed": [...], "Skipped": [...]}}}
+
+    where i is the position of the test in data.test_results.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.data = {
+            'categories': [],
+            'counts': {},
+            'status': {group: [] for group in STATUS_GROUPS},
+            'category': {},
+        }
+
+    def add(self, test):
+        """Records the next test and returns it unchanged."""
+        i = self.count
+        self.count += 1
+        category = test_category(test.get('test_id'))
+        groups = self.data['category'].get(category)
+        if groups is None:
+            self.data['categories'].append(category)
+            self.data['counts'][category] = {'total': 0, 'passed': 0, 'failed': 0, 'skipped': 0}
+            groups = self.data['category'][category] = {'All': [], **{group: [] for group in STATUS_GROUPS}}
+        self.data['counts'][category]['total'] += 1
+        groups['All'].append(i)
+        group = _GROUP_OF.get(test.get('status'))
+        if group:
+            self.data['counts'][category][group.lower()] += 1
+            self.data['status'][group].append(i)
+            groups[group].append(i)
+        return test
+
+
+# Page-side lookup over data._index; category/status of null (or 'All'/'Total') mean "any"
+TEST_INDEX_JS = '''
+        function indexedTests(data, category, status) {
+          const index = data._index;
+          const anyCategory = !category || category === 'All';
+          const anyStatus = !status || status === 'All' || status === 'Total';
+          if (anyCategory && anyStatus) return data.test_results.slice();
+          const ids = anyCategory ? index.status[status] : (index.category[category] || {})[anyStatus ? 'All' : status];
+          return (ids || []).map(i => data.test_results[i]);
+        }
+'''
@@ -0,0 +1,345 @@
+import os
+import re
+import sys
+import json
+import base64
+import sqlite3
+import hashlib
+import argparse
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from build_test_db import DEFAULT_DB_PATH, WORKSPACE, connect, ingest
+from compress_site import MIN_COMPRESS_BYTES, compress
+
+# Read-only JSON API over the SQLite index written by build_test_db.py:
+#   GET /api/branches                    branches with their proposition/run counts and latest run
+#   GET /api/propositions                propositions with their run count and latest run
+#   GET /api/runs                        runs (one per suite), newest first
+#   GET /api/runs/<id>                   one run's summary
+#   GET /api/runs/<id>/tests             per-test outcomes of one run, by test_id
+#   GET /api/tests/<test_id>/history     one test's outcome in every run, newest first
+# Filters (?category=&branch=&proposition=&test_type=&suite=&since=&until=) become WHERE clauses;
+# since/until take YYYYMMDD or YYYYMMDD_HHMMSS and are inclusive. Lists return
+# {'items': [...], 'next_cursor': ...}; pass next_cursor back as ?cursor= for the next page.
+DEFAULT_PORT = 8001
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+# Encoded responses kept per index generation, so repeated dashboard polls skip SQLite
+RESPONSE_CACHE_ENTRIES = 256
+RUN_FILTERS = ('category', 'branch', 'proposition', 'suite')
+_DATE_RE = re.compile(r'^\d{8}(_\d{6})?$')
+
+RUN_COLUMNS = 'r.id, r.suite, r.category, r.branch, r.proposition, r.run_ts, r.total, r.passed, r.failed, r.skipped, r.duration_ms, r.path'
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def test_type_suite(test_type):
+    """Dashboard label ('Core Sanity') to suite name ('CoreSanity')."""
+    return test_type.replace(' ', '')
+
+
+def run_filters(params, alias='r'):
+    """(WHERE fragments, values) for the run filters of a query string."""
+    clauses, values = [], []
+    if params.get('test_type'):
+        params = dict(params, suite=test_type_suite(params['test_type']))
+    for column in RUN_FILTERS:
+        if params.get(column):
+            clauses.append(f'{alias}.{column} = ?')
+            values.append(params[column])
+    for key, op, fill in (('since', '>=', '_000000'), ('until', '<=', '_999999')):
+        value = params.get(key)
+        if not value:
+            continue
+        if not _DATE_RE.match(value):
+            raise ApiError(400, f"{key} must be YYYYMMDD or YYYYMMDD_HHMMSS, got {value!r}")
+        clauses.append(f'{alias}.run_ts {op} ?')
+        values.append(value if len(value) > 8 else value + fill)
+    return clauses, values
+
+
+def encode_cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values, separators=(',', ':')).encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, length):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except ValueError:
+        raise ApiError(400, 'invalid cursor')
+    if not isinstance(values, list) or len(values) != length:
+        raise ApiError(400, 'invalid cursor')
+    return values
+
+
+def page_limit(params):
+    try:
+        limit = int(params.get('limit', DEFAULT_LIMIT))
+    except ValueError:
+        raise ApiError(400, 'limit must be an integer')
+    return max(1, min(limit, MAX_LIMIT))
+
+
+def _where(clauses):
+    return (' WHERE ' + ' AND '.join(clauses)) if clauses else ''
+
+
+def _page(rows, limit, key):
+    """{'items', 'next_cursor'} from limit + 1 fetched rows; key(row) is the keyset of the last item."""
+    items = rows[:limit]
+    return {'items': items, 'next_cursor': encode_cursor(key(items[-1])) if len(rows) > limit else None}
+
+
+def run_item(row):
+    run_id, suite, category, branch, proposition, run_ts, total, passed, failed, skipped, duration_ms, path = row
+    return {
+        'id': run_id, 'suite': suite, 'category': category, 'branch': branch, 'proposition': proposition,
+        'run': run_ts, 'total': total, 'passed': passed, 'failed': failed, 'skipped': skipped,
+        'pass_rate': round((passed / total * 100), 1) if total else 0, 'duration_ms': duration_ms, 'path': path,
+    }
+
+
+def list_branches(conn, params):
+    """Branches with runs matching the filters, newest first per category, paginated by (category, latest run, branch)."""
+    clauses, values = run_filters(params)
+    having, having_values = '', []
+    if params.get('cursor'):
+        category, latest, branch = decode_cursor(params['cursor'], 3)
+        having = ' HAVING r.category > ? OR (r.category = ? AND (MAX(r.run_ts) < ? OR (MAX(r.run_ts) = ? AND r.branch > ?)))'
+        having_values = [category, category, latest, latest, branch]
+    limit = page_limit(params)
+    rows = conn.execute(
+        'SELECT r.category, r.branch, COUNT(DISTINCT r.proposition), COUNT(*), MAX(r.run_ts) FROM runs r'
+        f'{_where(clauses)} GROUP BY r.category, r.branch{having} ORDER BY r.category, MAX(r.run_ts) DESC, r.branch LIMIT ?',
+        values + having_values + [limit + 1]).fetchall()
+    items = [{'category': c, 'branch': b, 'propositions': p, 'runs': n, 'latest_run': latest}
+             for c, b, p, n, latest in rows]
+    return _page(items, limit, lambda item: [item['category'], item['latest_run'], item['branch']])
+
+
+def list_propositions(conn, params):
+    """Propositions with runs matching the filters, paginated by (category, branch, proposition)."""
+    clauses, values = run_filters(params)
+    if params.get('cursor'):
+        clauses.append('(r.category, r.branch, r.proposition) > (?, ?, ?)')
+        values += decode_cursor(params['cursor'], 3)
+    limit = page_limit(params)
+    rows = conn.execute(
+        'SELECT r.category, r.branch, r.proposition, COUNT(DISTINCT r.run_ts), MAX(r.run_ts) FROM runs r'
+        f'{_where(clauses)} GROUP BY r.category, r.branch, r.proposition ORDER BY r.category, r.branch, r.proposition LIMIT ?',
+        values + [limit + 1]).fetchall()
+    items = [{'category': c, 'branch': b, 'proposition': p, 'runs': n, 'latest_run': latest}
+             for c, b, p, n, latest in rows]
+    return _page(items, limit, lambda item: [item['category'], item['branch'], item['proposition']])
+
+
+def list_runs(conn, params):
+    """Runs matching the filters, newest first, paginated by (run_ts, id)."""
+    clauses, values = run_filters(params)
+    if params.get('cursor'):
+        run_ts, run_id = decode_cursor(params['cursor'], 2)
+        clauses.append('(r.run_ts < ? OR (r.run_ts = ? AND r.id < ?))')
+        values += [run_ts, run_ts, run_id]
+    limit = page_limit(params)
+    rows = conn.execute(f'SELECT {RUN_COLUMNS} FROM runs r{_where(clauses)} ORDER BY r.run_ts DESC, r.id DESC LIMIT ?',
+                        values + [limit + 1]).fetchall()
+    return _page([run_item(row) for row in rows], limit, lambda item: [item['run'], item['id']])
+
+
+def get_run(conn, run_id):
+    row = conn.execute(f'SELECT {RUN_COLUMNS} FROM runs r WHERE r.id = ?', (run_id,)).fetchone()
+    if not row:
+        raise ApiError(404, f'no run with id {run_id}')
+    return run_item(row)
+
+
+def list_tests(conn, run_id, params):
+    """Per-test outcomes of one run (optionally one status), by test_id."""
+    get_run(conn, run_id)
+    clauses, values = ['t.run_id = ?'], [run_id]
+    if params.get('status'):
+        clauses.append('t.status = ?')
+        values.append(params['status'])
+    if params.get('cursor'):
+        clauses.append('t.test_id > ?')
+        values += decode_cursor(params['cursor'], 1)
+    limit = page_limit(params)
+    rows = conn.execute('SELECT t.test_id, t.test_name, t.status, t.duration_ms FROM test_results t'
+                        f'{_where(clauses)} ORDER BY t.test_id LIMIT ?', values + [limit + 1]).fetchall()
+    items = [{'test_id': test_id, 'test_name': name, 'status': status, 'duration_ms': duration_ms}
+             for test_id, name, status, duration_ms in rows]
+    return _page(items, limit, lambda item: [item['test_id']])
+
+
+def test_history(conn, test_id, params):
+    """One test's outcome in every run matching the filters, newest first, paginated by (run_ts, id)."""
+    clauses, values = run_filters(params)
+    clauses.insert(0, 't.test_id = ?')
+    values.insert(0, test_id)
+    if params.get('status'):
+        clauses.append('t.status = ?')
+        values.append(params['status'])
+    if params.get('cursor'):
+        run_ts, run_id = decode_cursor(params['cursor'], 2)
+        clauses.append('(r.run_ts < ? OR (r.run_ts = ? AND r.id < ?))')
+        values += [run_ts, run_ts, run_id]
+    limit = page_limit(params)
+    rows = conn.execute(f'SELECT {RUN_COLUMNS}, t.status, t.duration_ms FROM test_results t JOIN runs r ON r.id = t.run_id'
+                        f'{_where(clauses)} ORDER BY r.run_ts DESC, r.id DESC LIMIT ?', values + [limit + 1]).fetchall()
+    items = [dict(run_item(row[:-2]), status=row[-2], test_duration_ms=row[-1]) for row in rows]
+    return _page(items, limit, lambda item: [item['run'], item['id']])
+
+
+def route(conn, path, params):
+    """Payload of one GET request; raises ApiError for unknown paths and bad parameters."""
+    parts = [unquote(p) for p in path.strip('/').split('/')]
+    if parts[0] != 'api':
+        raise ApiError(404, 'not found')
+    parts = parts[1:]
+    if parts == ['branches']:
+        return list_branches(conn, params)
+    if parts == ['propositions']:
+        return list_propositions(conn, params)
+    if parts == ['runs']:
+        return list_runs(conn, params)
+    if len(parts) in (2, 3) and parts[0] == 'runs':
+        if not parts[1].isdigit():
+            raise ApiError(404, f'no run with id {parts[1]}')
+        if len(parts) == 2:
+            return get_run(conn, int(parts[1]))
+        if parts[2] == 'tests':
+            return list_tests(conn, int(parts[1]), params)
+    if len(parts) == 3 and parts[0] == 'tests' and parts[2] == 'history':
+        return test_history(conn, parts[1], params)
+    if parts in ([], ['']):
+        return {'endpoints': ['/api/branches', '/api/propositions', '/api/runs', '/api/runs/<id>',
+                              '/api/runs/<id>/tests', '/api/tests/<test_id>/history']}
+    raise ApiError(404, 'not found')
+
+
+def index_generation(conn):
+    """Changes whenever build_test_db.py adds, re-ingests or drops a run (re-ingested runs get a new id)."""
+    count, max_id, mtimes = conn.execute('SELECT COUNT(*), MAX(id), TOTAL(mtime_ns) FROM runs').fetchone()
+    return f'{count}-{max_id}-{int(mtimes)}'
+
+
+class ResultsApi:
+    """Answers requests from per-thread read-only connections and a small cache of encoded responses."""
+
+    def __init__(self, db_path, cache_entries=RESPONSE_CACHE_ENTRIES):
+        self.db_path = db_path
+        self.local = threading.local()
+        self.cache = OrderedDict()
+        self.cache_entries = cache_entries
+        self.lock = threading.Lock()
+
+    def conn(self):
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = self.local.conn = sqlite3.connect(f'file:{self.db_path}?mode=ro', uri=True)
+            self.local.data_version = None
+        return conn
+
+    def generation(self, conn):
+        # data_version only changes when another connection committed, so most requests skip the scan
+        data_version = conn.execute('PRAGMA data_version').fetchone()[0]
+        if data_version != self.local.data_version:
+            self.local.generation = index_generation(conn)
+            self.local.data_version = data_version
+        return self.local.generation
+
+    def get(self, target):
+        """(status, etag, body bytes) of a request target (path and query string)."""
+        conn = self.conn()
+        url = urlsplit(target)
+        # A parameter given twice keeps its last value
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        canonical = url.path + '?' + '&'.join(f'{k}={params[k]}' for k in sorted(params))
+        generation = self.generation(conn)
+        etag = '"' + hashlib.sha256(f'{generation} {canonical}'.encode('utf-8')).hexdigest()[:20] + '"'
+        with self.lock:
+            if etag in self.cache:
+                self.cache.move_to_end(etag)
+                return 200, etag, self.cache[etag]
+        try:
+            payload = route(conn, url.path, params)
+            status = 200
+        except ApiError as e:
+            payload, status = {'error': str(e)}, e.status
+        body = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        if status == 200:
+            with self.lock:
+                self.cache[etag] = body
+                while len(self.cache) > self.cache_entries:
+                    self.cache.popitem(last=False)
+        return status, etag, body
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    api = None
+
+    def do_GET(self):
+        try:
+            status, etag, body = self.api.get(self.path)
+        except sqlite3.Error as e:
+            status, etag, body = 503, None, json.dumps({'error': f'index unavailable: {e}'}).encode('utf-8')
+        if status == 200 and etag in [t.strip().removeprefix('W/') for t in self.headers.get('If-None-Match', '').split(',')]:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        gzipped = len(body) >= MIN_COMPRESS_BYTES and 'gzip' in self.headers.get('Accept-Encoding', '')
+        if gzipped:
+            body = compress(body, 'gz')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if status == 200:
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', 'no-cache')
+        if gzipped:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Vary', 'Accept-Encoding')
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve branches, propositions, runs and per-test outcomes from the '
+                                                 'results index (build_test_db.py) as a local JSON API.')
+    parser.add_argument('--db', default=os.getenv('RESULTS_DB', DEFAULT_DB_PATH), help='SQLite database path')
+    parser.add_argument('--bind', default='127.0.0.1', help='Address to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'Port to listen on (default: {DEFAULT_PORT})')
+    parser.add_argument('--no-ingest', action='store_true', help='Serve the database as-is instead of updating it first')
+    args = parser.parse_args()
+
+    if not args.no_ingest:
+        conn = connect(args.db)
+        ingested, skipped, removed = ingest(conn, WORKSPACE)
+        conn.close()
+        print(f"[INFO] Ingested {ingested} run(s), {skipped} unchanged, {removed} removed: {args.db}")
+    elif not os.path.isfile(args.db):
+        print(f"[ERROR] {args.db} does not exist; run build_test_db.py first")
+        sys.exit(1)
+
+    ApiHandler.api = ResultsApi(os.path.abspath(args.db))
+    server = ThreadingHTTPServer((args.bind, args.port), ApiHandler)
+    print(f"[SUCCESS] Serving the results API at http://{args.bind}:{server.server_address[1]}/api/ (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
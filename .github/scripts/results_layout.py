@@ -0,0 +1,111 @@
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+# Results tree written by extract_files_from_push.yml:
+#   <category>/<branch>/<proposition>/<YYYYMMDD_HHMMSS>/<Suite>_SchemaValidation_response.json
+#   <category>/<branch>/<proposition>/web_result/summary.json
+CATEGORIES = ['develop', 'release']
+RESPONSE_FILES = {
+    'CoreSanity': 'CoreSanity_SchemaValidation_response.json',
+    'BadgerSanity': 'BadgerSanity_SchemaValidation_response.json',
+}
+RUN_DIR_RE = re.compile(r'^\d{8}_\d{6}$')
+# Runs delta-encoded by run_delta.py keep <name>.delta.jsonl instead of <name>.json
+DELTA_SUFFIX = '.delta.jsonl'
+SUMMARY_FILE = os.path.join('web_result', 'summary.json')
+# Threads listing branch subtrees in parallel; the work is directory I/O, so more threads than CPUs is fine
+DISCOVERY_WORKERS = 8
+
+
+def _subdirs(path):
+    try:
+        with os.scandir(path) as it:
+            return sorted(e.name for e in it if e.is_dir() and not e.name.startswith('.'))
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+
+
+def delta_path(response_path):
+    return response_path[:-len('.json')] + DELTA_SUFFIX
+
+
+def stored_response_path(run_dir, file_name):
+    """Path of a run's response file as stored: the full file, else its delta (see run_delta.py), else None."""
+    path = os.path.join(run_dir, file_name)
+    if os.path.isfile(path):
+        return path
+    if os.path.isfile(delta_path(path)):
+        return delta_path(path)
+    return None
+
+
+def iter_run_dirs(workspace, categories=None):
+    """Yields (category, branch, proposition, timestamp, run_dir) for every timestamped run directory.
+
+    Only the three known levels below each category are listed, oldest run first per proposition.
+    """
+    for category in categories or CATEGORIES:
+        category_dir = os.path.join(workspace, category)
+        for branch in _subdirs(category_dir):
+            branch_dir = os.path.join(category_dir, branch)
+            for proposition in _subdirs(branch_dir):
+                proposition_dir = os.path.join(branch_dir, proposition)
+                for timestamp in _subdirs(proposition_dir):
+                    if RUN_DIR_RE.match(timestamp):
+                        yield category, branch, proposition, timestamp, os.path.join(proposition_dir, timestamp)
+
+
+def iter_response_files(workspace, categories=None, suites=None):
+    """Yields (category, branch, proposition, timestamp, suite, path) for every response JSON.
+
+    path is the delta file for delta-encoded runs; load_response() reads both.
+    """
+    for category, branch, proposition, timestamp, run_dir in iter_run_dirs(workspace, categories):
+        for suite, file_name in RESPONSE_FILES.items():
+            if suites and suite not in suites:
+                continue
+            path = stored_response_path(run_dir, file_name)
+            if path:
+                yield category, branch, proposition, timestamp, suite, path
+
+
+def _branch_summaries(branch_dir):
+    """summary.json paths of the propositions of one branch directory, sorted by proposition."""
+    paths = []
+    for proposition in _subdirs(branch_dir):
+        path = os.path.join(branch_dir, proposition, SUMMARY_FILE)
+        if os.path.isfile(path):
+            paths.append(path)
+    return paths
+
+
+def iter_summary_files(workspace, scopes=None, workers=DISCOVERY_WORKERS):
+    """Yields the <category>/<branch>/<proposition>/web_result/summary.json paths under workspace.
+
+    Only the known levels are listed (no run directories, .git or other trees are entered), and
+    the branch subtrees are listed on a thread pool; paths come out in sorted order as soon as
+    their branch is done. scopes limits the walk to workspace-relative directories at any depth
+    of the layout (a category, branch or proposition); others cannot hold summaries and are skipped.
+    """
+    branch_dirs = []
+    propositions = []
+    for scope in scopes or ['']:
+        parts = [p for p in os.path.normpath(scope).split(os.sep) if p not in ('', '.')]
+        if parts and (parts[0] not in CATEGORIES or len(parts) > 3):
+            continue
+        if len(parts) == 3:
+            propositions.append(os.path.join(workspace, *parts, SUMMARY_FILE))
+            continue
+        for category in parts[:1] or CATEGORIES:
+            category_dir = os.path.join(workspace, category)
+            branches = parts[1:2] or _subdirs(category_dir)
+            branch_dirs.extend(os.path.join(category_dir, branch) for branch in branches)
+    for path in propositions:
+        if os.path.isfile(path):
+            yield path
+    if not branch_dirs:
+        return
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(branch_dirs)))) as pool:
+        for paths in pool.map(_branch_summaries, branch_dirs):
+            yield from paths
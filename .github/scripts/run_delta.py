@@ -0,0 +1,248 @@
+import os
+import sys
+import json
+import argparse
+
+from json_stream import WORKSPACE, ObjectWriter, load_response, resolve_blobs
+from results_layout import CATEGORIES, DELTA_SUFFIX, RUN_DIR_RE, delta_path, iter_run_dirs
+
+DELTA_VERSION = 1
+# Every KEYFRAME_INTERVAL-th run of a proposition keeps its full response file, which bounds
+# how many deltas have to be replayed to rebuild a run
+KEYFRAME_INTERVAL = 10
+
+# A run stored as a delta is <Suite>_..._response.delta.jsonl next to where the full file would be:
+#   line 1:  header {"delta": 1, "keyframe": false, "base": <previous run timestamp>, "meta": {...},
+#                    "count": n, "added": [id, ...], "removed": [id, ...], "changed": [id, ...],
+#                    "status": {id: [old, new]}, "order": [id, ...] or null}
+#   line 2+: one entry per added test (the test itself) or changed test
+#            ({"test_id": id, "$patch": {key: value}, "$unset": [key, ...]}), in that order
+# Keyframes keep their full file and get a header-only .delta.jsonl ("keyframe": true), so
+# "what changed since the previous run" is always answered by the first line of one file.
+# order is only stored when the tests are not in base order (minus removed, plus added at the end).
+
+
+def read_header(path):
+    with open(path, encoding='utf-8') as f:
+        return json.loads(f.readline())
+
+
+def read_delta(path):
+    """(header, entries) of a delta file."""
+    with open(path, encoding='utf-8') as f:
+        header = json.loads(f.readline())
+        entries = [json.loads(line) for line in f if line.strip()]
+    return header, entries
+
+
+def apply_delta(order, tests, header, entries):
+    """Applies one delta to (order, {test_id: test}) and returns the new pair; the inputs are not modified."""
+    tests = dict(tests)
+    for test_id in header['removed']:
+        tests.pop(test_id, None)
+    for entry in entries:
+        if '$patch' in entry:
+            test = dict(tests[entry['test_id']])
+            test.update(entry['$patch'])
+            for key in entry.get('$unset', ()):
+                test.pop(key, None)
+            tests[entry['test_id']] = test
+        else:
+            tests[entry['test_id']] = entry
+    if header.get('order') is not None:
+        order = header['order']
+    else:
+        removed = set(header['removed'])
+        order = [test_id for test_id in order if test_id not in removed] + header['added']
+    return order, tests
+
+
+def diff_runs(prev_order, prev_tests, order, tests):
+    """Header fields and entries that turn the previous run into this one."""
+    added, changed, entries, status = [], [], [], {}
+    for test_id in order:
+        test = tests[test_id]
+        base = prev_tests.get(test_id)
+        if base is None:
+            added.append(test_id)
+        elif base != test:
+            changed.append(test_id)
+            if base.get('status') != test.get('status'):
+                status[test_id] = [base.get('status'), test.get('status')]
+    removed = [test_id for test_id in prev_order if test_id not in tests]
+    entries = [tests[test_id] for test_id in added]
+    for test_id in changed:
+        base, test = prev_tests[test_id], tests[test_id]
+        entry = {'test_id': test_id, '$patch': {k: v for k, v in test.items() if base.get(k, object()) != v}}
+        unset = [k for k in base if k not in test]
+        if unset:
+            entry['$unset'] = unset
+        entries.append(entry)
+    expected = [test_id for test_id in prev_order if test_id in tests] + added
+    header = {'added': added, 'removed': removed, 'changed': changed, 'status': status,
+              'order': None if expected == order else order}
+    return header, entries
+
+
+def load_run(path, resolve=True):
+    """(meta, tests) of a run stored as a delta: the nearest keyframe with every later delta replayed.
+
+    Follows the base links back to the keyframe, so only the runs in between are read.
+    """
+    chain = []
+    current = path
+    while True:
+        header, entries = read_delta(current)
+        chain.append((header, entries))
+        base = header.get('base')
+        if base is None:
+            raise ValueError(f"{current}: delta without a base run")
+        run_dir = os.path.join(os.path.dirname(os.path.dirname(current)), base)
+        full_path = os.path.join(run_dir, os.path.basename(current)[:-len(DELTA_SUFFIX)] + '.json')
+        if os.path.isfile(full_path):
+            break
+        current = os.path.join(run_dir, os.path.basename(current))
+    _, keyframe = load_response(full_path, resolve=False)
+    keyframe = list(keyframe)
+    order = [test['test_id'] for test in keyframe]
+    tests = {test['test_id']: test for test in keyframe}
+    for header, entries in reversed(chain):
+        order, tests = apply_delta(order, tests, header, entries)
+    result = [tests[test_id] for test_id in order]
+    if resolve:
+        # resolve_blobs() replaces payloads in place, so steps shared with other runs are copied first
+        result = [resolve_blobs(dict(test, steps=[dict(step) for step in test['steps']])) if test.get('steps') else test
+                  for test in result]
+    return chain[0][0]['meta'], result
+
+
+def write_full(path, meta, order, tests):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        writer = ObjectWriter(f)
+        for test_id in order:
+            writer.add(tests[test_id])
+        writer.close(meta)
+    os.replace(tmp_path, path)
+
+
+def write_delta(path, header, entries):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(header) + '\n')
+        for entry in entries:
+            f.write(json.dumps(entry) + '\n')
+    os.replace(tmp_path, path)
+
+
+def encode_proposition(proposition_dir, file_name, interval=KEYFRAME_INTERVAL, unpack=False):
+    """(Re)encodes every run of one proposition that holds file_name.
+
+    Runs at positions 0, interval, 2 * interval, ... and the newest run stay full files (keyframes);
+    the others become deltas against the run before them. unpack turns every run back into a full
+    file. Returns (full, deltas) counts.
+    """
+    runs = sorted(e.name for e in os.scandir(proposition_dir) if e.is_dir() and RUN_DIR_RE.match(e.name))
+    stored = []
+    for timestamp in runs:
+        full_path = os.path.join(proposition_dir, timestamp, file_name)
+        if os.path.isfile(full_path) or os.path.isfile(delta_path(full_path)):
+            stored.append((timestamp, full_path))
+    full = deltas = 0
+    prev = None
+    for i, (timestamp, full_path) in enumerate(stored):
+        # Runs are visited oldest first, so a delta run is rebuilt from the previous state in memory
+        is_full = os.path.isfile(full_path)
+        if is_full:
+            meta, tests = load_response(full_path, resolve=False)
+            tests = list(tests)
+            order = [test['test_id'] for test in tests]
+            tests = {test['test_id']: test for test in tests}
+        else:
+            header, entries = read_delta(delta_path(full_path))
+            meta = header['meta']
+            order, tests = apply_delta(prev[1], prev[2], header, entries)
+        keyframe = unpack or prev is None or i % interval == 0 or i == len(stored) - 1 or len(tests) != len(order)
+        header = {'delta': DELTA_VERSION, 'keyframe': keyframe, 'base': prev[0] if prev else None,
+                  'meta': meta, 'count': len(order)}
+        entries = []
+        if prev:
+            changes, entries = diff_runs(prev[1], prev[2], order, tests)
+            header.update(changes)
+        else:
+            # First stored run: nothing to compare against
+            header.update({'added': [], 'removed': [], 'changed': [], 'status': {}, 'order': None})
+        if keyframe:
+            if not is_full:
+                write_full(full_path, meta, order, tests)
+            if unpack:
+                if os.path.isfile(delta_path(full_path)):
+                    os.remove(delta_path(full_path))
+            else:
+                write_delta(delta_path(full_path), header, [])
+            full += 1
+        else:
+            write_delta(delta_path(full_path), header, entries)
+            if is_full:
+                os.remove(full_path)
+            deltas += 1
+        prev = (timestamp, order, tests)
+    return full, deltas
+
+
+def response_names(proposition_dir):
+    """Response file names stored (fully or as deltas) in any run of a proposition."""
+    names = set()
+    for entry in os.scandir(proposition_dir):
+        if entry.is_dir() and RUN_DIR_RE.match(entry.name):
+            for name in os.listdir(entry.path):
+                if name.endswith('_response.json'):
+                    names.add(name)
+                elif name.endswith('_response' + DELTA_SUFFIX):
+                    names.add(name[:-len(DELTA_SUFFIX)] + '.json')
+    return sorted(names)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Store runs as deltas against the previous run of the same proposition (or back as full files).')
+    sub = parser.add_subparsers(dest='command', required=True)
+    for name, help_text in (('pack', 'Delta-encode every run except keyframes and the newest one'),
+                            ('unpack', 'Turn every delta back into a full response file')):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument('propositions', nargs='*', metavar='PROPOSITION_DIR',
+                       help='<category>/<branch>/<proposition> directories (default: all)')
+        if name == 'pack':
+            p.add_argument('--keyframe-interval', type=int, default=KEYFRAME_INTERVAL,
+                           help=f'Keep every Nth run as a full file (default: {KEYFRAME_INTERVAL})')
+    p = sub.add_parser('changes', help='What changed in a run since the previous one (reads one header line)')
+    p.add_argument('run_dir', metavar='RUN_DIR')
+    args = parser.parse_args()
+
+    if args.command == 'changes':
+        headers = sorted(name for name in os.listdir(args.run_dir) if name.endswith('_response' + DELTA_SUFFIX))
+        if not headers:
+            print(f"[ERROR] No delta headers in {args.run_dir}; run 'run_delta.py pack' first")
+            sys.exit(1)
+        for name in headers:
+            header = read_header(os.path.join(args.run_dir, name))
+            print(f"[INFO] {name[:-len(DELTA_SUFFIX)]} since {header['base'] or '(first run)'}: "
+                  f"{len(header['added'])} added, {len(header['removed'])} removed, {len(header['changed'])} changed")
+            for test_id, (old, new) in sorted(header['status'].items()):
+                print(f"  {test_id}: {old} -> {new}")
+        return
+
+    propositions = args.propositions or sorted({os.path.join(WORKSPACE, c, b, p)
+                                                for c, b, p, _, _ in iter_run_dirs(WORKSPACE, CATEGORIES)})
+    total_full = total_deltas = 0
+    for proposition_dir in propositions:
+        for file_name in response_names(proposition_dir):
+            full, deltas = encode_proposition(proposition_dir, file_name, getattr(args, 'keyframe_interval', KEYFRAME_INTERVAL),
+                                              unpack=args.command == 'unpack')
+            total_full += full
+            total_deltas += deltas
+    print(f"[SUCCESS] {args.command.capitalize()}ed {len(propositions)} proposition(s): "
+          f"{total_full} full run file(s), {total_deltas} delta(s)")
+
+
+if __name__ == '__main__':
+    main()
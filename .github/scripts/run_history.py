@@ -0,0 +1,65 @@
+import os
+import json
+
+# One JSON object per line, one line per timestamped run, appended next to summary.json:
+#   <category>/<branch>/<proposition>/web_result/history.jsonl
+# Each record is the summary.json entry of that run plus the summary key it was written under.
+HISTORY_FILE = 'history.jsonl'
+# {history file: (offset read up to, {(key, date)} of the runs recorded before it)}, so repeated
+# appends to the same file (a batch rebuild of every run) only read the lines written since
+_recorded = {}
+
+
+def history_path(web_result_dir):
+    return os.path.join(web_result_dir, HISTORY_FILE)
+
+
+def _recorded_runs(path):
+    """(key, date) of every run recorded in a history file, read incrementally across calls."""
+    offset, runs = _recorded.get(path, (0, set()))
+    if os.path.getsize(path) < offset:
+        # Rewritten rather than appended to
+        offset, runs = 0, set()
+    for offset, record in iter_records(path, offset):
+        runs.add((record.get('key'), record.get('date')))
+    _recorded[path] = (offset, runs)
+    return runs
+
+
+def append_record(web_result_dir, key, entry):
+    """Appends the summary entry of one run to the proposition history.
+
+    Re-generating a report for a run that is already recorded anywhere in the file (same key
+    and date) is a no-op, so the workflow and batch rebuilds can call this unconditionally.
+    """
+    path = history_path(web_result_dir)
+    record = dict(entry, key=key)
+    if os.path.isfile(path) and (key, record.get('date')) in _recorded_runs(path):
+        print(f"[INFO] Run {record.get('date')} already recorded in {path}")
+        return False
+    os.makedirs(web_result_dir, exist_ok=True)
+    with open(path, 'a') as f:
+        f.write(json.dumps(record, separators=(',', ':')) + '\n')
+    print(f"[SUCCESS] Appended run {record.get('date')} to {path}")
+    return True
+
+
+def iter_records(path, offset=0):
+    """Streams (end_offset, record) pairs from a history file, starting at byte offset.
+
+    Only one line is held in memory at a time. end_offset can be passed back as offset
+    later to read just the records appended since. A trailing line without a newline
+    (a write still in progress) is not consumed.
+    """
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b'\n'):
+                return
+            offset += len(line)
+            try:
+                record = json.loads(line)
+            except ValueError:
+                print(f"[WARN] Skipping malformed history line in {path} before offset {offset}")
+                continue
+            yield offset, record
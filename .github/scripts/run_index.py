@@ -0,0 +1,200 @@
+import os
+import json
+from bisect import bisect_left, bisect_right, insort
+
+from results_layout import CATEGORIES, DELTA_SUFFIX, RUN_DIR_RE, iter_run_dirs
+
+# WORKSPACE is the root of the repo (two directories up from .github/scripts/)
+WORKSPACE = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+RUN_INDEX_PATH = os.path.join(WORKSPACE, 'tabs', 'run_index.json')
+RUN_INDEX_VERSION = 1
+# Sorts after every YYYYMMDD_HHMMSS name, so bisecting on it lands after the newest run
+_AFTER_ALL = '~'
+
+
+def _response_files(run_dir):
+    """Response file names of a run; delta-encoded ones (see run_delta.py) count under their full name."""
+    with os.scandir(run_dir) as it:
+        names = {e.name[:-len(DELTA_SUFFIX)] + '.json' if e.name.endswith(DELTA_SUFFIX) else e.name for e in it}
+    return sorted(name for name in names if name.endswith('_response.json'))
+
+
+class RunIndex:
+    """Every timestamped run directory, sorted by its YYYYMMDD_HHMMSS name.
+
+    Runs are kept in two sorted lists so that both "newest run of this branch/proposition" and
+    "newest run of this proposition on any branch of a category" are one bisect away:
+
+        by_branch:      (category, branch, proposition, timestamp)
+        by_proposition: (category, proposition, timestamp, branch)
+
+    Folder names rather than mtimes decide what is newest; in a fresh checkout every mtime is the
+    checkout time. tabs/run_index.json stores the runs and the response files each one holds.
+    """
+
+    def __init__(self, runs=()):
+        self.files = {}
+        for category, branch, proposition, timestamp, files in runs:
+            self.files[(category, branch, proposition, timestamp)] = tuple(files)
+        self.by_branch = sorted(self.files)
+        self.by_proposition = sorted((c, p, t, b) for c, b, p, t in self.by_branch)
+
+    @classmethod
+    def scan(cls, workspace=WORKSPACE, categories=None):
+        return cls((category, branch, proposition, timestamp, _response_files(run_dir))
+                   for category, branch, proposition, timestamp, run_dir in iter_run_dirs(workspace, categories))
+
+    @classmethod
+    def read(cls, path=RUN_INDEX_PATH):
+        """The saved index, or None when there is none (or it is from another version)."""
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            if data.get('version') == RUN_INDEX_VERSION:
+                return cls(data['runs'])
+        except (OSError, ValueError):
+            pass
+        return None
+
+    @classmethod
+    def load(cls, path=RUN_INDEX_PATH, workspace=WORKSPACE):
+        """Reads the saved index; scans the workspace when there is none (or it is from another version)."""
+        index = cls.read(path)
+        if index is None:
+            print(f"[INFO] No run index at {path}; scanning {workspace}")
+            index = cls.scan(workspace)
+        return index
+
+    def save(self, path=RUN_INDEX_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # One run per line keeps the committed file's diffs to the runs that were added
+        with open(path, 'w') as f:
+            f.write(f'{{"version": {RUN_INDEX_VERSION}, "runs": [\n')
+            f.write(',\n'.join(json.dumps([*run, list(self.files[run])]) for run in self.by_branch))
+            f.write('\n]}\n')
+
+    def __len__(self):
+        return len(self.by_branch)
+
+    def changes_since(self, other):
+        """Number of runs added, removed, or holding other response files compared with the index other."""
+        return (sum(1 for run, files in self.files.items() if other.files.get(run) != files)
+                + sum(1 for run in other.files if run not in self.files))
+
+    def add(self, category, branch, proposition, timestamp, files=()):
+        """Adds (or updates the files of) one run; returns True if the index changed."""
+        run = (category, branch, proposition, timestamp)
+        files = tuple(sorted(files))
+        if run in self.files:
+            changed = self.files[run] != files
+            self.files[run] = files
+            return changed
+        self.files[run] = files
+        insort(self.by_branch, run)
+        insort(self.by_proposition, (category, proposition, timestamp, branch))
+        return True
+
+    def refresh(self, proposition_dir, workspace=WORKSPACE):
+        """Re-lists the runs of one <category>/<branch>/<proposition> directory.
+
+        Returns the number of runs added, updated or dropped; None if the path is not a proposition directory.
+        """
+        key = split_run_path(proposition_dir, workspace)
+        if not key or len(key) != 3:
+            return None
+        changed = 0
+        present = set()
+        # A proposition directory that is gone has no runs left
+        if os.path.isdir(os.path.join(workspace, *key)):
+            with os.scandir(os.path.join(workspace, *key)) as it:
+                for entry in it:
+                    if entry.is_dir() and RUN_DIR_RE.match(entry.name):
+                        present.add(entry.name)
+                        changed += self.add(*key, entry.name, _response_files(entry.path))
+        # Runs deleted from the tree since the last refresh
+        category, branch, proposition = key
+        for run in [run for run in self.files if run[:3] == key and run[3] not in present]:
+            del self.files[run]
+            self.by_branch.remove(run)
+            self.by_proposition.remove((category, proposition, run[3], branch))
+            changed += 1
+        return changed
+
+    def latest(self, category, proposition, branch=None, file_name=None, before=None):
+        """Newest run (category, branch, proposition, timestamp) matching the arguments, or None.
+
+        branch=None searches every branch of the category. file_name skips runs without that
+        response file; before (a YYYYMMDD_HHMMSS name) skips that run and everything newer.
+        """
+        if branch is None:
+            runs, prefix = self.by_proposition, (category, proposition)
+        else:
+            runs, prefix = self.by_branch, (category, branch, proposition)
+        # Position just past the newest candidate: before the first run >= before, or after the prefix
+        i = bisect_left(runs, prefix + (before,)) if before else bisect_right(runs, prefix + (_AFTER_ALL,))
+        while i > 0 and runs[i - 1][:len(prefix)] == prefix:
+            i -= 1
+            run = runs[i] if branch is not None else (runs[i][0], runs[i][3], runs[i][1], runs[i][2])
+            if file_name is None or file_name in self.files[run]:
+                return run
+        return None
+
+    def refresh_branches(self, category, proposition, workspace=WORKSPACE):
+        """Re-lists <category>/<every branch>/<proposition>, the runs latest(branch=None) chooses from.
+
+        Returns the number of runs added, updated or dropped.
+        """
+        branches = {run[3] for run in self.by_proposition if run[:2] == (category, proposition)}
+        category_dir = os.path.join(workspace, category)
+        if os.path.isdir(category_dir):
+            with os.scandir(category_dir) as it:
+                branches.update(e.name for e in it if os.path.isdir(os.path.join(e.path, proposition)))
+        return sum(self.refresh(os.path.join(category_dir, branch, proposition), workspace)
+                   for branch in sorted(branches))
+
+    def release_baseline(self, run, file_name=None):
+        """Newest release run of the proposition of run (a split_run_path tuple) to compare it against.
+
+        For a release run that is the newest release run older than itself; None if there is none.
+        Reads the index as it is: callers that run before generate_index.py has updated the saved
+        index call refresh_branches('release', proposition) first.
+        """
+        category, branch, proposition = run[:3]
+        before = run[3] if category == 'release' and len(run) == 4 else None
+        return self.latest('release', proposition, file_name=file_name, before=before)
+
+
+def update_run_index(changed_dirs=None, path=RUN_INDEX_PATH, workspace=WORKSPACE):
+    """Keeps the saved index in step with the results tree and returns it.
+
+    changed_dirs (proposition directories) are re-listed on top of the saved index; without them,
+    or when one of them is not a proposition directory, the whole workspace is scanned and compared
+    with the saved index. The file is only rewritten when a run was added, changed or removed.
+    """
+    saved = RunIndex.read(path)
+    keys = [split_run_path(d, workspace) for d in changed_dirs or ()]
+    if saved is not None and keys and all(key and len(key) == 3 for key in keys):
+        index = saved
+        changed = sum(index.refresh(d, workspace) for d in changed_dirs)
+    else:
+        index = RunIndex.scan(workspace)
+        changed = index.changes_since(saved) if saved is not None else len(index)
+    if changed or saved is None:
+        index.save(path)
+    print(f"[INFO] Run index: {len(index)} run(s), {changed} added, changed or removed")
+    return index
+
+
+def split_run_path(path, workspace=WORKSPACE):
+    """(category, branch, proposition[, timestamp]) of a results path, or None if it is outside the tree."""
+    parts = os.path.relpath(os.path.abspath(path), workspace).split(os.sep)
+    if parts[0] not in CATEGORIES or len(parts) not in (3, 4):
+        return None
+    if len(parts) == 4 and not RUN_DIR_RE.match(parts[3]):
+        return None
+    return tuple(parts)
+
+
+def run_dir(run, workspace=None):
+    """Directory of a (category, branch, proposition, timestamp) run; workspace-relative unless workspace is given."""
+    return os.path.join(workspace, *run) if workspace else os.path.join(*run)
@@ -0,0 +1,32 @@
+import os
+import sys
+import subprocess
+
+import pytest
+
+# The scripts import their siblings by module name, as they do when run from .github/scripts
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+sys.path.insert(0, os.path.join(SCRIPTS_DIR, 'benchmarks'))
+
+import synth_tree
+
+# Small synthetic tree: enough runs per proposition for keyframes, deltas and history
+TREE_PARAMS = {'branches': 1, 'propositions': 2, 'runs': 4, 'tests': 12, 'steps': 2, 'payload_bytes': 200}
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """A synthetic results tree with its own copy of the scripts (which locate the workspace from their path)."""
+    root = str(tmp_path / 'tree')
+    synth_tree.generate_tree(root, **TREE_PARAMS)
+    synth_tree.install_scripts(root)
+    return root
+
+
+def run_script(tree, *argv):
+    """Runs one of the tree's scripts from the tree root; fails the test on a non-zero exit code."""
+    proc = subprocess.run([sys.executable, os.path.join(tree, '.github', 'scripts', argv[0]), *argv[1:]],
+                          cwd=tree, capture_output=True, text=True)
+    assert proc.returncode == 0, f"{' '.join(argv)} exited with {proc.returncode}:\n{proc.stdout}{proc.stderr}"
+    return proc.stdout
@@ -0,0 +1,16 @@
+import json
+
+from conftest import run_script
+
+
+def test_latest_query_without_run_column(tree):
+    run_script(tree, 'appgw_results.py', 'index')
+    out = run_script(tree, 'appgw_results.py', 'query', '--category', 'release', '--proposition', 'SCXI*',
+                     '--test-type', 'Core Sanity', '--latest', '--columns', 'branch,proposition,pass_rate',
+                     '--format', 'json')
+    rows = json.loads(out)
+    assert rows
+    assert all(set(row) == {'branch', 'proposition', 'pass_rate'} for row in rows)
+    assert all(row['proposition'].startswith('SCXI') for row in rows)
+    # One row per proposition and branch: the latest run only
+    assert len({(row['branch'], row['proposition']) for row in rows}) == len(rows)
@@ -0,0 +1,21 @@
+import os
+import glob
+
+from conftest import TREE_PARAMS, run_script
+from report_engine import SUITES
+from run_history import HISTORY_FILE
+
+
+def test_delta_encoded_runs_are_recorded(tree):
+    run_script(tree, 'run_delta.py', 'pack', '--keyframe-interval', '3')
+    assert glob.glob(os.path.join(tree, '*', '*', '*', '*', '*.delta.jsonl'))
+    for path in glob.glob(os.path.join(tree, '*', '*', '*', 'web_result', HISTORY_FILE)):
+        os.remove(path)
+
+    run_script(tree, 'batch_reports.py', '--quiet', '--workers', '1')
+    sanity_suites = [name for name, suite in SUITES.items() if 'sanity' in suite['outputs']]
+    history_files = glob.glob(os.path.join(tree, '*', '*', '*', 'web_result', HISTORY_FILE))
+    assert history_files
+    for path in history_files:
+        with open(path) as f:
+            assert sum(1 for _ in f) == TREE_PARAMS['runs'] * len(sanity_suites), path
@@ -0,0 +1,20 @@
+import os
+
+from conftest import run_script
+from json_stream import load_response, resolve_blobs
+from results_layout import DELTA_SUFFIX, iter_response_files
+
+
+def test_gc_keeps_blobs_referenced_by_deltas(tree):
+    run_script(tree, 'blob_store.py', 'pack')
+    run_script(tree, 'run_delta.py', 'pack', '--keyframe-interval', '3')
+    run_script(tree, 'blob_store.py', 'gc')
+
+    blob_dir = os.path.join(tree, 'blobs')
+    paths = [path for *_, path in iter_response_files(tree)]
+    assert any(path.endswith(DELTA_SUFFIX) for path in paths)
+    for path in paths:
+        _, tests = load_response(path, resolve=False)
+        for test in tests:
+            # Raises FileNotFoundError for a collected blob that is still referenced
+            resolve_blobs(test, blob_dir)
@@ -0,0 +1,20 @@
+import os
+import re
+import hashlib
+
+from conftest import run_script
+
+ASSET_RE = re.compile(r'^.+\.([0-9a-f]{10})\.(js|css)$')
+
+
+def test_hashed_assets_match_their_names_after_compression(tree):
+    run_script(tree, 'batch_reports.py', '--quiet', '--workers', '1')
+    run_script(tree, 'generate_index.py')
+    run_script(tree, 'compress_site.py')
+
+    assets_dir = os.path.join(tree, 'assets')
+    names = [name for name in os.listdir(assets_dir) if ASSET_RE.match(name)]
+    assert names
+    for name in names:
+        with open(os.path.join(assets_dir, name), 'rb') as f:
+            assert hashlib.sha256(f.read()).hexdigest()[:10] == ASSET_RE.match(name).group(1), name
@@ -0,0 +1,74 @@
+import json
+import random
+
+import fb_coreSDK_schema_validation_regression_result as regression_page
+from flaky_tests import OutcomeBits, find_flaky, flaky_for, outcome_stats
+from regression_diff import compare_runs, fingerprint_tests
+
+
+def _plain_stats(outcomes):
+    """outcome_stats computed by walking the outcome list (True = failed), oldest first."""
+    flips = sum(a != b for a, b in zip(outcomes, outcomes[1:]))
+    streak = 1
+    while streak < len(outcomes) and outcomes[-streak - 1] == outcomes[-1]:
+        streak += 1
+    longest = current = 0
+    for failed in outcomes:
+        current = current + 1 if failed else 0
+        longest = max(longest, current)
+    runs = len(outcomes)
+    return {'runs': runs, 'failures': sum(outcomes), 'flips': flips, 'failure_rate': round(sum(outcomes) / runs, 3),
+            'flip_rate': round(flips / (runs - 1), 3) if runs > 1 else 0.0, 'streak': streak,
+            'streak_status': 'Failed' if outcomes[-1] else 'Passed', 'longest_failure_streak': longest}
+
+
+def _bits(outcomes):
+    bits = OutcomeBits()
+    for failed in outcomes:
+        bits.add(failed)
+    return bits
+
+
+def test_bit_packed_stats_match_a_plain_walk():
+    rng = random.Random(3)
+    for _ in range(500):
+        outcomes = [rng.random() < rng.choice((0.05, 0.5, 0.95)) for _ in range(rng.randrange(1, 200))]
+        bits = _bits(outcomes)
+        assert outcome_stats(bits.failed, bits.runs) == _plain_stats(outcomes)
+        assert outcome_stats(bits.failed, bits.runs, window=50) == _plain_stats(outcomes[-50:])
+
+
+def test_only_tests_that_keep_flipping_are_tagged(tmp_path):
+    P, F = False, True
+    tests = {
+        'Device_flaky': _bits([F, P, F, P, P, F, P, P]),
+        # Broke once and stayed broken: a real regression, not flakiness
+        'Device_broken': _bits([P] * 10 + [F] * 5),
+        'Device_short': _bits([F, P, F]),
+        'Device_stable': _bits([P] * 20),
+    }
+    path = str(tmp_path / 'flaky_tests.json')
+    with open(path, 'w') as f:
+        json.dump(find_flaky({('CoreSanity', 'develop', 'RDKEMW-2000', 'SCXI11BEI'): tests}), f)
+
+    flaky = flaky_for(('develop', 'RDKEMW-2000', 'SCXI11BEI', '20260111_092100'), path=path)
+    assert list(flaky) == ['Device_flaky']
+    assert flaky['Device_flaky']['flips'] == 5
+    assert flaky_for(('develop', 'RDKEMW-2000', 'SCXI11BEI'), suite='BadgerSanity', path=path) == {}
+    assert flaky_for(('develop', 'RDKEMW-3000', 'SCXI11BEI'), path=path) == {}
+
+
+def test_regression_page_tags_flaky_regressions(tmp_path):
+    base = [{'test_id': test_id, 'test_name': test_id, 'status': 'Passed', 'steps': [{'response': {'ok': True}}]}
+            for test_id in ('Device_0001', 'Device_0002')]
+    current = [dict(test, status='Failed') for test in base]
+    comparison = compare_runs(fingerprint_tests(base), fingerprint_tests(current))
+    stats = {'runs': 8, 'failures': 3, 'flips': 5, 'failure_rate': 0.375, 'flip_rate': 0.714}
+    out_path = str(tmp_path / 'regression.html')
+    regression_page.write_comparison_report(comparison, 'develop/RDKEMW-2000/SCXI11BEI/20260111_092100',
+                                            'release/8.0.0.0/SCXI11BEI/20260111_142100', out_path,
+                                            flaky={'Device_0002': stats})
+    with open(out_path) as f:
+        page = f.read()
+    assert page.count('class="flaky-tag"') == 1
+    assert 'Outcome flipped in 71% of its last 8 runs (38% failed)' in page
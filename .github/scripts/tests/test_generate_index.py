@@ -0,0 +1,51 @@
+import os
+import json
+import glob
+
+from conftest import run_script
+from run_history import HISTORY_FILE, append_record
+
+
+def _history_points(tree):
+    with open(os.path.join(tree, 'tabs', 'reports_data.json')) as f:
+        return json.load(f)['history']['length']
+
+
+def test_incremental_build_reads_history_appended_without_summary_change(tree):
+    run_script(tree, 'batch_reports.py', '--quiet')
+    run_script(tree, 'generate_index.py')
+    history_files = glob.glob(os.path.join(tree, '*', '*', '*', 'web_result', HISTORY_FILE))
+    assert history_files
+
+    # An older run recorded later (batch_reports with render=False) only appends to history.jsonl
+    web_result_dir = os.path.dirname(history_files[0])
+    with open(history_files[0]) as f:
+        record = json.loads(f.readline())
+    key = record.pop('key')
+    summary_st = os.stat(os.path.join(web_result_dir, 'summary.json'))
+    append_record(web_result_dir, key, dict(record, date='20250101_000000'))
+    assert os.stat(os.path.join(web_result_dir, 'summary.json')).st_mtime_ns == summary_st.st_mtime_ns
+
+    out = run_script(tree, 'generate_index.py')
+    assert '1 re-read' in out
+    total = 0
+    for path in history_files:
+        with open(path) as f:
+            total += sum(1 for _ in f)
+    assert _history_points(tree) == total
+    assert '0 re-read' in run_script(tree, 'generate_index.py')
+
+
+def test_manifest_does_not_copy_history_records(tree):
+    run_script(tree, 'batch_reports.py', '--quiet')
+    run_script(tree, 'generate_index.py')
+    with open(os.path.join(tree, 'tabs', 'index_manifest.json')) as f:
+        summaries = json.load(f)['summaries']
+    assert summaries
+    total = 0
+    for rel_path, entry in summaries.items():
+        assert set(entry['history']) == {'offset', 'records', 'mtime_ns', 'size'}
+        with open(os.path.join(tree, os.path.dirname(rel_path), HISTORY_FILE)) as f:
+            assert entry['history']['records'] == sum(1 for _ in f)
+        total += entry['history']['records']
+    assert _history_points(tree) == total
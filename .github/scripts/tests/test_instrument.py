@@ -0,0 +1,42 @@
+import os
+import json
+import glob
+import inspect
+
+from conftest import run_script
+from instrument import TRACE_ENV, traced
+
+
+def test_traced_keeps_the_function_metadata():
+    @traced('custom span')
+    def render(page, out_dir='.', *, inline=False):
+        """Renders a page."""
+        return page
+
+    assert render.__name__ == 'render'
+    assert render.__doc__ == 'Renders a page.'
+    assert render.__qualname__.endswith('<locals>.render')
+    assert render.__module__ == __name__
+    assert str(inspect.signature(render)) == "(page, out_dir='.', *, inline=False)"
+    assert render('index') == 'index'
+
+
+def test_forked_pool_workers_write_their_own_traces(tree, tmp_path, monkeypatch):
+    trace_dir = str(tmp_path / 'trace')
+    monkeypatch.setenv(TRACE_ENV, trace_dir)
+    run_script(tree, 'batch_reports.py', '--quiet', '--workers', '2')
+
+    summaries = []
+    for path in glob.glob(os.path.join(trace_dir, 'batch_reports-*.json')):
+        if not path.endswith('.trace.json'):
+            with open(path) as f:
+                summaries.append(json.load(f))
+    workers = [s for s in summaries if s['parent_pid']]
+    assert workers
+    # Each worker's own file, with only the spans it recorded
+    assert len({s['pid'] for s in workers}) == len(workers)
+    assert all(os.path.isfile(os.path.join(trace_dir, f"batch_reports-{s['pid']}.trace.json")) for s in workers)
+    assert all(s['pid'] != s['parent_pid'] and 'render CoreSanity' in s['spans'] for s in workers)
+    # Every run is rendered or recorded once, by one of the workers
+    runs = glob.glob(os.path.join(tree, '*', '*', '*', '*', 'CoreSanity_SchemaValidation_response*'))
+    assert sum(s['spans']['render CoreSanity']['calls'] for s in workers) == len(runs)
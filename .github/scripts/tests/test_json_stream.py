@@ -0,0 +1,54 @@
+import os
+import json
+import glob
+import shutil
+
+from conftest import run_script
+from json_stream import ResponseStream, load_response
+
+DOCUMENT = {
+    'device': 'SCXI11BEI',
+    'test_results': [
+        {'test_id': 'CS_001', 'status': 'Passed', 'duration': 12.5e3, 'steps': [{'response': {'a': [1, -2.25, None]}}]},
+        {'test_id': 'CS_002', 'status': 'Failed', 'error': 'quote \" brace } bracket ] comma , \\u00e9', 'steps': []},
+        {'test_id': 'CS_003', 'status': 'Skipped', 'retries': 1234567890123, 'ok': True},
+    ],
+    'total_tests': 3,
+    'notes': {'nested': {'list': [[], {}, '']}},
+}
+
+
+def test_stream_matches_json_load_at_every_chunk_boundary(tmp_path):
+    path = str(tmp_path / 'response.json')
+    with open(path, 'w') as f:
+        json.dump(DOCUMENT, f, indent=2)
+    expected_meta = {k: v for k, v in DOCUMENT.items() if k != 'test_results'}
+    # One-character chunks cut every number, string and escape sequence somewhere
+    for chunk_size in (1, 2, 7, 64 * 1024):
+        stream = ResponseStream(path, chunk_size=chunk_size)
+        assert list(stream) == DOCUMENT['test_results']
+        assert stream.meta == expected_meta
+        assert stream.count == 3
+
+
+def test_streamed_and_loaded_responses_render_identical_pages(tree, monkeypatch):
+    proposition = os.path.join('develop', 'RDKEMW-2000', 'SCXI11BEI')
+    run = sorted(name for name in os.listdir(os.path.join(tree, proposition)) if name[0].isdigit())[-1]
+    meta, tests = load_response(os.path.join(tree, proposition, run, 'CoreSanity_SchemaValidation_response.json'))
+    assert isinstance(tests, list) and tests
+
+    outputs = {}
+    for mode in ('0', '1'):
+        monkeypatch.setenv('REPORT_STREAMING', mode)
+        run_script(tree, 'report_engine.py', proposition, '--run', run, '--schema-dir', f'schema_{mode}', '--no-index')
+        web_result_dir = os.path.join(tree, proposition, 'web_result')
+        pages = {}
+        for path in glob.glob(os.path.join(tree, f'schema_{mode}', '**', '*'), recursive=True) + \
+                glob.glob(os.path.join(web_result_dir, '*')):
+            if os.path.isfile(path) and not path.endswith('history.jsonl'):
+                with open(path, 'rb') as f:
+                    pages[os.path.relpath(path, tree).replace(f'schema_{mode}', 'schema')] = f.read()
+        outputs[mode] = pages
+        shutil.rmtree(web_result_dir)
+
+    assert outputs['1'] and outputs['0'] == outputs['1']
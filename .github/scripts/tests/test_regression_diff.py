@@ -0,0 +1,67 @@
+import copy
+import random
+
+from regression_diff import compare_runs, fingerprint_tests
+
+
+def _old_diff(base_results, current_results):
+    """Classification of the regression page before fingerprints: top-level status only."""
+    base_tests = {test['test_id']: test for test in base_results}
+    current_tests = {test['test_id']: test for test in current_results}
+    regressions, improvements = [], []
+    for test_id, current_test in current_tests.items():
+        base_test = base_tests.get(test_id)
+        if base_test:
+            base_status_ok = base_test['status'] in ['Passed', 'Success']
+            current_status_ok = current_test['status'] in ['Passed', 'Success']
+            if base_status_ok and not current_status_ok:
+                regressions.append(test_id)
+            if not base_status_ok and current_status_ok:
+                improvements.append(test_id)
+    new_tests = [test_id for test_id in current_tests if test_id not in base_tests]
+    removed_tests = [test_id for test_id in base_tests if test_id not in current_tests]
+    return regressions, improvements, new_tests, removed_tests
+
+
+def _run(count, rng):
+    return [{'test_id': f'Device_{i:04d}', 'status': rng.choice(['Passed', 'Success', 'Failed', 'Skipped']),
+             'duration_ms': rng.randrange(1000),
+             'steps': [{'request': {'id': i, 'step': s}, 'response': {'result': {'value': i * s, 'items': [s, i]}},
+                        'error': None, 'duration_ms': rng.randrange(100)} for s in range(3)]}
+            for i in range(count)]
+
+
+def test_fingerprints_classify_like_the_status_diff_and_catch_payload_changes():
+    rng = random.Random(11)
+    base = _run(300, rng)
+    current = copy.deepcopy(base)
+    for test in rng.sample(current, 40):
+        test['status'] = rng.choice(['Passed', 'Failed', 'Skipped'])
+    # Step 3 changes with the status unchanged: invisible to the old page, which only showed steps[0]
+    payload_only = set()
+    for test in rng.sample(current, 60):
+        test['steps'][2]['response']['result']['items'].append('extra')
+        payload_only.add(test['test_id'])
+    # Timings and key order are not payload
+    for test in current:
+        test['duration_ms'] += 1
+        test['steps'][0]['duration_ms'] += 1
+        test['steps'][1]['request'] = dict(reversed(list(test['steps'][1]['request'].items())))
+    del current[5]
+    current.append(dict(copy.deepcopy(base[0]), test_id='Device_9999'))
+
+    comparison = compare_runs(fingerprint_tests(base), fingerprint_tests(current))
+    regressions, improvements, new_tests, removed_tests = _old_diff(base, current)
+    assert [t['test_id'] for t, _, _ in comparison.regressions] == regressions
+    assert [t['test_id'] for t, _, _ in comparison.improvements] == improvements
+    assert [t['test_id'] for t in comparison.new_tests] == new_tests
+    assert [t['test_id'] for t in comparison.removed_tests] == removed_tests
+
+    flipped = set(regressions) | set(improvements)
+    assert {t['test_id'] for t, _, _ in comparison.payload_changed} == payload_only - flipped
+    for _, _, diffs in comparison.payload_changed:
+        assert [d['step'] for d in diffs] == [2]
+        assert diffs[0]['diffs'] == [{'path': 'steps[2].response.result.items[2]', 'kind': 'added',
+                                      'base': None, 'current': 'extra'}]
+    matched = len(current) - len(new_tests)
+    assert comparison.unchanged == matched - len(flipped) - len(comparison.payload_changed)
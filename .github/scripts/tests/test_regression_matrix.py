@@ -0,0 +1,12 @@
+from regression_matrix import latest_runs
+from results_layout import RESPONSE_FILES, iter_run_dirs
+
+
+def test_baseline_series_is_not_a_candidate(tree):
+    category, branch, proposition, _, _ = next(iter_run_dirs(tree))
+    response_file = RESPONSE_FILES['CoreSanity']
+    every = latest_runs(tree, response_file)
+    assert (category, branch, proposition) in every
+
+    candidates = latest_runs(tree, response_file, exclude_series=(category, branch, proposition))
+    assert set(candidates) == set(every) - {(category, branch, proposition)}
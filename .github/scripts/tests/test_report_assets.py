@@ -0,0 +1,103 @@
+import os
+import sys
+import json
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from conftest import SCRIPTS_DIR
+import report_assets
+from report_assets import VIRTUAL_LIST_JS
+
+REPO_ROOT = os.path.dirname(os.path.dirname(SCRIPTS_DIR))
+
+
+# Runs against the repo's own .github/scripts/vendor/, not a synthetic tree's placeholders. Until the
+# libraries are committed (the first CI run on a branch vendors and pins them) this is reported as an
+# expected failure in every run; once SHA256SUMS exists it must pass
+@pytest.mark.xfail(not os.path.isfile(report_assets.VENDOR_SUMS), strict=True,
+                   reason='.github/scripts/vendor/ is not committed yet')
+def test_repo_vendored_libraries_pass_check():
+    proc = subprocess.run([sys.executable, os.path.join(SCRIPTS_DIR, 'report_assets.py'), 'check'],
+                          cwd=REPO_ROOT, capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stdout + proc.stderr
+
+
+def test_concurrent_publishers_write_one_complete_asset(tmp_path):
+    assets_dir = str(tmp_path / 'assets')
+    content = 'body { color: red; }\n' * 2000
+    with ThreadPoolExecutor(8) as pool:
+        paths = set(pool.map(lambda _: report_assets.publish_asset('style', 'css', content, assets_dir), range(32)))
+
+    assert len(paths) == 1
+    assert os.listdir(assets_dir) == [os.path.basename(paths.pop())]
+    # Already published: returned as is, without writing again
+    path = report_assets.publish_asset('style', 'css', content, assets_dir)
+    mtime = os.stat(path).st_mtime_ns
+    assert report_assets.publish_asset('style', 'css', content, assets_dir) == path
+    assert os.stat(path).st_mtime_ns == mtime
+
+
+# Just enough DOM for createVirtualList: rows are 20px, every third one 40px once rendered
+FAKE_DOM_JS = '''
+class El {
+  constructor() { this.style = {}; this.children = []; this.parentNode = null; this.offsetHeight = 0; this.top = 0; }
+  get nextSibling() { return this.parentNode ? this.parentNode.children[this.parentNode.children.indexOf(this) + 1] || null : null; }
+  remove() { if (this.parentNode) { this.parentNode.children.splice(this.parentNode.children.indexOf(this), 1); this.parentNode = null; } }
+  insertBefore(node, ref) {
+    node.remove();
+    node.parentNode = this;
+    const i = ref ? this.children.indexOf(ref) : -1;
+    this.children.splice(i < 0 ? this.children.length : i, 0, node);
+  }
+  replaceChildren(...nodes) { this.children.slice().forEach(n => n.remove()); nodes.forEach(n => this.insertBefore(n, null)); }
+  getBoundingClientRect() { return { top: this.top }; }
+}
+const listeners = {};
+let frame = null;
+global.document = { createElement: () => new El() };
+global.window = { innerHeight: 600, addEventListener: (name, fn) => { listeners[name] = fn; } };
+global.requestAnimationFrame = fn => { frame = fn; return 1; };
+'''
+
+VIRTUAL_LIST_CHECK_JS = '''
+const container = new El();
+const list = createVirtualList(container, (item, row) => { row.item = item.i; row.offsetHeight = item.i % 3 ? 20 : 40; }, 20);
+const state = () => {
+  const [top, ...rest] = container.children;
+  const bottom = rest.pop();
+  return { top: parseInt(top.style.height), bottom: parseInt(bottom.style.height),
+           items: rest.map(r => r.item), heights: rest.map(r => r.offsetHeight) };
+};
+// Heights are kept per item object, as they are per test on the pages
+list.setItems(Array.from({ length: 10000 }, (_, i) => ({ i })));
+const first = state();
+container.top = -50000;
+listeners.scroll();
+frame();
+const scrolled = state();
+console.log(JSON.stringify({ first, scrolled }));
+'''
+
+
+@pytest.mark.skipif(not shutil.which('node'), reason='node is not installed')
+def test_virtual_list_only_materializes_rows_near_the_viewport():
+    proc = subprocess.run(['node', '-e', FAKE_DOM_JS + VIRTUAL_LIST_JS + VIRTUAL_LIST_CHECK_JS],
+                          capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stderr
+    result = json.loads(proc.stdout)
+    first, scrolled = result['first'], result['scrolled']
+
+    # Top of the list: the viewport plus one screen below (3 * 600px of 20px rows at most)
+    assert first['top'] == 0 and first['items'] == list(range(len(first['items'])))
+    assert 45 <= len(first['items']) <= 91
+    # Spacers stand in for every row that is not in the DOM: rendered rows measured, the rest estimated
+    assert first['top'] + sum(first['heights']) + first['bottom'] == sum(first['heights']) + 20 * (10000 - len(first['items']))
+
+    # 50000px down: consecutive rows covering one screen above to two screens below the viewport
+    items = scrolled['items']
+    assert items == list(range(items[0], items[0] + len(items))) and len(items) <= 91
+    assert scrolled['top'] <= 50000 - 600
+    assert scrolled['top'] + sum(scrolled['heights']) >= 50000 + 2 * 600
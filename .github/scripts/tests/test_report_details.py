@@ -0,0 +1,73 @@
+import os
+import json
+import glob
+
+from conftest import run_script
+from json_stream import load_response
+from report_details import SLIM_KEYS, DetailShardWriter
+
+
+def _shard_payloads(script):
+    """Payload list of one shard script: window.__detailShards.load(N, [...]);"""
+    prefix, _, rest = script.partition(', ')
+    assert prefix.startswith('window.__detailShards.load(')
+    return int(prefix[len('window.__detailShards.load('):]), json.loads(rest[:-len(');\n')])
+
+
+def _tests(count):
+    return [{'test_id': f'Device_{i:04d}', 'test_name': f'case {i}', 'status': 'Failed' if i % 3 else 'Passed',
+             'duration_ms': i, 'steps': [{'request': {'id': i}, 'response': {'result': 'x' * (50 * i)}}]}
+            for i in range(count)]
+
+
+def test_slim_entries_and_shards_rebuild_every_test(tmp_path):
+    details_dir = str(tmp_path / 'report_details')
+    writer = DetailShardWriter(details_dir, shard_bytes=2000)
+    tests = _tests(40)
+    slims = [writer.add(dict(test)) for test in tests]
+    writer.flush()
+
+    shards = {}
+    for path in sorted(glob.glob(os.path.join(details_dir, 'shard_*.js'))):
+        with open(path) as f:
+            shard, payloads = _shard_payloads(f.read())
+        assert os.path.basename(path) == f'shard_{shard:04d}.js'
+        # A shard closes as soon as it reaches the limit: only its last payload may cross it
+        assert sum(len(json.dumps(p)) for p in payloads[:-1]) < 2000
+        shards[shard] = payloads
+    assert len(shards) == writer.shard_count > 1
+
+    for test, slim in zip(tests, slims):
+        assert set(slim) - {'category', 'shard', 'slot'} <= set(SLIM_KEYS)
+        assert 'steps' not in slim and slim['category'] == 'Device_'
+        details = shards[slim['shard']][slim['slot']]
+        assert dict({k: v for k, v in slim.items() if k in SLIM_KEYS}, **details) == test
+
+
+def test_inline_shards_hold_the_same_payloads():
+    writer = DetailShardWriter(shard_bytes=2000)
+    tests = _tests(10)
+    slims = [writer.add(dict(test)) for test in tests]
+    blocks = [block.strip() for block in writer.inline_scripts().split('</script>') if block.strip()]
+    assert len(blocks) == writer.shard_count > 1
+    shards = dict(_shard_payloads(block[len('<script>'):] + '\n') for block in blocks)
+    for test, slim in zip(tests, slims):
+        assert shards[slim['shard']][slim['slot']]['steps'] == test['steps']
+
+
+def test_schema_page_leaves_step_payloads_to_its_shards(tree):
+    proposition = os.path.join('develop', 'RDKEMW-2000', 'SCXI11BEI')
+    run = sorted(name for name in os.listdir(os.path.join(tree, proposition)) if name[0].isdigit())[-1]
+    run_script(tree, 'report_engine.py', proposition, '--run', run, '--schema-dir', 'schema', '--no-index')
+    _, tests = load_response(os.path.join(tree, proposition, run, 'CoreSanity_SchemaValidation_response.json'))
+
+    with open(os.path.join(tree, 'schema', 'CoreSanity_SchemaValidation_result_report.html')) as f:
+        page = f.read()
+    shards = ''
+    for path in glob.glob(os.path.join(tree, 'schema', 'CoreSanity_SchemaValidation_result_report_details', '*.js')):
+        with open(path) as f:
+            shards += f.read()
+    for test in tests:
+        assert json.dumps(test['test_id']) in page
+        response = json.dumps(test['steps'][0]['response'])
+        assert response not in page and response in shards
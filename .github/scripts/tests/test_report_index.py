@@ -0,0 +1,37 @@
+import re
+import random
+
+import report_index
+from report_index import STATUS_GROUPS
+
+
+def _old_page_filter(tests, category, statuses):
+    """What the pages computed before the index: split(/\\d/)[0] per test, one filter pass per lookup."""
+    return [i for i, t in enumerate(tests)
+            if re.split(r'\d', t.get('test_id') or '')[0] == category and t.get('status') in statuses]
+
+
+def test_index_matches_the_per_category_filter_passes():
+    rng = random.Random(7)
+    statuses = ['Passed', 'Success', 'Failed', 'Skipped', 'Blocked', None]
+    tests = [{'test_id': f"{rng.choice(['Device_', 'Network', 'AV_', ''])}{rng.randrange(100)}",
+              'status': rng.choice(statuses)} for _ in range(500)]
+    tests.append({'status': 'Failed'})
+    # Not imported by name: pytest would try to collect a Test* class
+    index = report_index.TestIndex()
+    for test in tests:
+        assert index.add(test) is test
+    data = index.data
+
+    categories = list(dict.fromkeys(re.split(r'\d', t.get('test_id') or '')[0] for t in tests))
+    assert data['categories'] == categories
+    for category in categories:
+        everything = _old_page_filter(tests, category, statuses)
+        assert data['category'][category]['All'] == everything
+        assert data['counts'][category]['total'] == len(everything)
+        for group, group_statuses in STATUS_GROUPS.items():
+            expected = _old_page_filter(tests, category, group_statuses)
+            assert data['category'][category][group] == expected
+            assert data['counts'][category][group.lower()] == len(expected)
+    for group, group_statuses in STATUS_GROUPS.items():
+        assert data['status'][group] == [i for i, t in enumerate(tests) if t.get('status') in group_statuses]
@@ -0,0 +1,117 @@
+import os
+import re
+import json
+import datetime
+from glob import glob
+
+import synth_tree
+from conftest import TREE_PARAMS, run_script
+
+KEYS = ['core_sanity_test', 'badger_sanity_test']
+
+
+def _parse_date(dt):
+    try:
+        return datetime.datetime.strptime(dt, "%Y%m%d_%H%M%S")
+    except Exception:
+        return datetime.datetime.min
+
+
+def _baseline_results(tree):
+    """The 7-tuple rows the index was built from before the record store, summaries read in sorted order."""
+    results = {'develop': {}, 'release': {}}
+    for summary_path in sorted(glob(os.path.join(tree, '**/web_result/summary.json'), recursive=True)):
+        with open(summary_path) as f:
+            summary = json.load(f)
+        web_result_dir = os.path.dirname(summary_path)
+        proposition = os.path.basename(os.path.dirname(web_result_dir))
+        for key in KEYS:
+            if key in summary:
+                entry = summary[key]
+                html_name = 'fb_core_sanity_result.html' if key == 'core_sanity_test' else 'fb_badger_sanity_result.html'
+                html_path = os.path.relpath(os.path.join(web_result_dir, html_name), tree)
+                if not os.path.exists(os.path.join(tree, html_path)):
+                    continue
+                results[entry.get('result_category', 'develop')].setdefault(entry.get('branch', 'unknown'), []).append(
+                    (proposition, entry.get('date', 'unknown'), html_path, key, entry.get('image', ''),
+                     entry.get('RDK version', ''), entry.get('result', {})))
+    return results
+
+
+def _baseline_reports(results):
+    all_reports = []
+    for cat in ['develop', 'release']:
+        for branch, reports in results[cat].items():
+            for proposition, date, html_path, key, image, rdk_version, result_data in reports:
+                total = result_data.get('Total', 0)
+                passed = result_data.get('passed', 0)
+                all_reports.append({
+                    'category': cat, 'branch': branch, 'proposition': proposition, 'date': date,
+                    'html_path': '../' + html_path, 'test_type': 'Core Sanity' if key == 'core_sanity_test' else 'Badger Sanity',
+                    'image': image, 'rdk_version': rdk_version, 'total': total, 'passed': passed,
+                    'failed': result_data.get('failed', 0), 'skipped': result_data.get('skiped', 0),
+                    'pass_rate': round((passed / total * 100), 1) if total > 0 else 0,
+                })
+    all_reports.sort(key=lambda r: _parse_date(r['date']), reverse=True)
+    return all_reports
+
+
+def _baseline_branch_blocks(results, col):
+    """<details> block of every branch of a summary tab column, branch with the newest report first."""
+    branch_dates = [(branch, max((_parse_date(r[1]) for r in reports), default=datetime.datetime.min))
+                    for branch, reports in results[col].items()]
+    branch_dates.sort(key=lambda x: x[1], reverse=True)
+    blocks = []
+    for branch, _ in branch_dates:
+        prop_groups = {}
+        for proposition, date, html_path, key, image, rdk_version, result_data in results[col][branch]:
+            prop_groups.setdefault(proposition, {})[key] = (html_path, result_data)
+        block = [f'<details style="margin-bottom:10px;"><summary class="branch">{branch}</summary><div class="prop-list">']
+        for proposition, tests in prop_groups.items():
+            rows = []
+            for key in KEYS:
+                if key in tests:
+                    html_path, result_data = tests[key]
+                    label = 'Core Sanity' if key == 'core_sanity_test' else 'Badger Sanity'
+                    total, passed = result_data.get('Total', 0), result_data.get('passed', 0)
+                    failed, skipped = result_data.get('failed', 0), result_data.get('skiped', 0)
+                    pct = [round((n / total * 100), 1) if total > 0 else 0 for n in (passed, failed, skipped)]
+                    rows.append(f'<a href="../{html_path}" target="_blank" class="test-link"><span class="lbl">{label}</span><span class="nums"><span class="p">{passed}</span><span class="f">{failed}</span><span class="s">{skipped}</span></span><span class="bar"><span class="bp" style="width:{pct[0]}%"></span><span class="bf" style="width:{pct[1]}%"></span><span class="bs" style="width:{pct[2]}%"></span></span></a>')
+            block.append(f'''<div class="prop-row">
+                <div class="prop-name">{proposition}</div>
+                <div class="prop-tests">{''.join(rows)}</div>
+            </div>''')
+        block.append('</div></details>')
+        # The page drops every '</div></div>' when it pastes the column in
+        blocks.append(''.join(block).replace('</div></div>', ''))
+    return blocks
+
+
+def _decode(table, dicts):
+    names = [name for name in table if name != 'length']
+    return [{name: dicts[name][table[name][i]] if name in dicts else table[name][i] for name in names}
+            for i in range(table['length'])]
+
+
+def test_tabs_show_what_the_tuple_rows_produced(tmp_path):
+    tree = str(tmp_path / 'tree')
+    synth_tree.generate_tree(tree, **dict(TREE_PARAMS, branches=3))
+    synth_tree.install_scripts(tree)
+    run_script(tree, 'batch_reports.py', '--quiet')
+    run_script(tree, 'generate_index.py')
+    results = _baseline_results(tree)
+
+    with open(os.path.join(tree, 'tabs', 'reports_data.json')) as f:
+        dataset = json.load(f)
+    reports = _decode(dataset['reports'], dataset['dicts'])
+    expected = _baseline_reports(results)
+    assert len(reports) == len(expected) > 4
+    # Newest first; reports of the same run (Core and Badger share a date) may come in either order
+    assert [r['date'] for r in reports] == [r['date'] for r in expected]
+    key = lambda r: (r['date'], r['html_path'])
+    assert sorted(reports, key=key) == sorted(expected, key=key)
+
+    with open(os.path.join(tree, 'tabs', 'summary_tab.html')) as f:
+        page = f.read()
+    blocks = re.findall(r'<details style="margin-bottom:10px;">.*?</details>', page, re.S)
+    assert blocks == _baseline_branch_blocks(results, 'develop') + _baseline_branch_blocks(results, 'release')
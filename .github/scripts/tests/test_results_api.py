@@ -0,0 +1,24 @@
+import pytest
+
+from build_test_db import connect, ingest
+from results_api import MAX_LIMIT, list_branches, list_propositions
+
+
+def _walk(list_fn, conn, limit):
+    items, params = [], {'limit': str(limit)}
+    while True:
+        page = list_fn(conn, params)
+        items += page['items']
+        if not page['next_cursor']:
+            return items
+        params = {'limit': str(limit), 'cursor': page['next_cursor']}
+
+
+@pytest.mark.parametrize('list_fn', [list_branches, list_propositions])
+def test_list_endpoints_paginate_by_keyset(tree, tmp_path, list_fn):
+    conn = connect(str(tmp_path / 'results.sqlite'))
+    ingest(conn, tree)
+    everything = list_fn(conn, {'limit': str(MAX_LIMIT)})
+    assert everything['next_cursor'] is None and len(everything['items']) >= 2
+    for limit in (1, 2):
+        assert _walk(list_fn, conn, limit) == everything['items']
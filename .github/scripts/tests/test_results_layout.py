@@ -0,0 +1,56 @@
+import os
+import glob
+
+from results_layout import CATEGORIES, RUN_DIR_RE, SUMMARY_FILE, iter_summary_files
+
+
+def _decoy(tree, *parts):
+    path = os.path.join(tree, *parts, SUMMARY_FILE)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write('{}')
+
+
+def _layout_summaries(tree):
+    """What the old recursive glob found, minus paths that are not <category>/<branch>/<proposition>/web_result."""
+    found = glob.glob(os.path.join(tree, '**', 'web_result', 'summary.json'), recursive=True)
+    return sorted(path for path in found
+                  if len(os.path.relpath(path, tree).split(os.sep)) == 5
+                  and os.path.relpath(path, tree).split(os.sep)[0] in CATEGORIES)
+
+
+def test_walker_finds_what_the_glob_found_without_entering_runs(tree, monkeypatch):
+    _decoy(tree, '.git', 'refs')
+    _decoy(tree, 'extracted', 'develop', 'RDKEMW-2000')
+    run = sorted(name for name in os.listdir(os.path.join(tree, 'develop', 'RDKEMW-2000', 'SCXI11BEI'))
+                 if RUN_DIR_RE.match(name))[0]
+    _decoy(tree, 'develop', 'RDKEMW-2000', 'SCXI11BEI', run)
+    expected = _layout_summaries(tree)
+    assert len(expected) == 4
+
+    listed = []
+    scandir = os.scandir
+    monkeypatch.setattr(os, 'scandir', lambda path='.': listed.append(path) or scandir(path))
+    for workers in (1, 8):
+        assert list(iter_summary_files(tree, workers=workers)) == expected
+    entered = [os.path.relpath(path, tree) for path in listed]
+    assert not any(RUN_DIR_RE.match(os.path.basename(path)) for path in entered)
+    assert not any(path.split(os.sep)[0] not in CATEGORIES for path in entered)
+
+
+def test_scopes_limit_the_walk_to_their_part_of_the_layout(tree):
+    everything = _layout_summaries(tree)
+    proposition = os.path.join('develop', 'RDKEMW-2000', 'SCXI11BEI')
+
+    def walk(*scopes):
+        return [os.path.relpath(path, tree) for path in iter_summary_files(tree, list(scopes))]
+
+    assert walk('develop') == [os.path.relpath(p, tree) for p in everything if p.startswith(os.path.join(tree, 'develop'))]
+    assert walk(os.path.join('develop', 'RDKEMW-2000')) == walk('develop')
+    assert walk(proposition) == [os.path.join(proposition, SUMMARY_FILE)]
+    assert walk(proposition + os.sep, os.path.join('release', '8.0.0.0', 'SKXI11ADS')) == [
+        os.path.join(proposition, SUMMARY_FILE), os.path.join('release', '8.0.0.0', 'SKXI11ADS', SUMMARY_FILE)]
+    # Outside the layout, or below a proposition: nothing there can be a summary
+    assert walk('extracted') == []
+    assert walk(os.path.join(proposition, '20260105_090000')) == []
+    assert walk(os.path.join('develop', 'RDKEMW-9999')) == []
@@ -0,0 +1,29 @@
+import os
+
+import run_history
+from run_history import append_record, history_path
+
+
+def _entry(i):
+    return {'date': f'2026{i // 100 + 1:02d}{i % 28 + 1:02d}_{i % 24:02d}0000', 'branch': 'RDKEMW-2000',
+            'result_category': 'develop', 'result': {'passed': i, 'failed': 0, 'skiped': 0, 'Total': i},
+            'notes': 'x' * 200}
+
+
+def test_rerecording_an_old_run_is_a_no_op_anywhere_in_the_file(tmp_path):
+    web_result_dir = str(tmp_path / 'web_result')
+    entries = {_entry(i)['date']: _entry(i) for i in range(600)}
+    for entry in entries.values():
+        assert append_record(web_result_dir, 'core_sanity_test', entry)
+    path = history_path(web_result_dir)
+    size = os.path.getsize(path)
+    assert size > 64 * 1024
+
+    first = next(iter(entries.values()))
+    assert not append_record(web_result_dir, 'core_sanity_test', first)
+    # A new process knows nothing of the earlier appends and reads the whole file once
+    run_history._recorded.clear()
+    assert not append_record(web_result_dir, 'core_sanity_test', first)
+    assert os.path.getsize(path) == size
+    # Same run under the other suite's key is a different record
+    assert append_record(web_result_dir, 'badger_sanity_test', first)
@@ -0,0 +1,60 @@
+import os
+import sys
+import shutil
+import subprocess
+
+from conftest import run_script
+from results_layout import DELTA_SUFFIX
+from run_delta import encode_proposition
+from run_index import update_run_index
+
+SCRIPT = 'fb_coreSDK_schema_validation_regression_result.py'
+RESPONSE_FILE = 'fb_coreSDK_schema_validation_response.json'
+
+
+def test_full_scan_only_rewrites_when_runs_change(tree, capsys):
+    path = os.path.join(tree, 'tabs', 'run_index.json')
+    index = update_run_index(path=path, workspace=tree)
+    assert f'{len(index)} added, changed or removed' in capsys.readouterr().out
+
+    mtime_ns = os.stat(path).st_mtime_ns
+    update_run_index(path=path, workspace=tree)
+    assert '0 added, changed or removed' in capsys.readouterr().out
+    assert os.stat(path).st_mtime_ns == mtime_ns
+
+    category, branch, proposition, timestamp = index.by_branch[0]
+    shutil.rmtree(os.path.join(tree, category, branch, proposition, timestamp))
+    index = update_run_index(path=path, workspace=tree)
+    assert '1 added, changed or removed' in capsys.readouterr().out
+    assert (category, branch, proposition, timestamp) not in index.files
+
+
+def test_regression_page_sees_runs_the_saved_index_has_not(tree):
+    update_run_index(path=os.path.join(tree, 'tabs', 'run_index.json'), workspace=tree)
+    current_dir = os.path.join('develop', 'RDKEMW-2000', 'SCXI11BEI')
+    release_dir = os.path.join(tree, 'release', '8.0.0.0', 'SCXI11BEI')
+    # After the index was saved: the newest current run is deleted, which leaves a delta-encoded run
+    # the newest, and a newer release run arrives
+    encode_proposition(os.path.join(tree, current_dir), RESPONSE_FILE)
+    runs = sorted(name for name in os.listdir(os.path.join(tree, current_dir)) if name[0].isdigit())
+    shutil.rmtree(os.path.join(tree, current_dir, runs[-1]))
+    newest_release = sorted(name for name in os.listdir(release_dir) if name[0].isdigit())[-1]
+    shutil.copytree(os.path.join(release_dir, newest_release), os.path.join(release_dir, '20270101_000000'))
+
+    proc = subprocess.run([sys.executable, os.path.join(tree, '.github', 'scripts', SCRIPT)], cwd=tree,
+                          env=dict(os.environ, CURRENT_BRANCH_DIR=current_dir), capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stdout + proc.stderr
+    assert f"Found result file: {os.path.join(current_dir, runs[-2], RESPONSE_FILE[:-len('.json')] + DELTA_SUFFIX)}" in proc.stdout
+    assert os.path.join('release', '8.0.0.0', 'SCXI11BEI', '20270101_000000', RESPONSE_FILE) in proc.stdout
+    assert os.path.isfile(os.path.join(tree, SCRIPT[:-len('.py')] + '.html'))
+
+
+def test_report_engine_regression_base_sees_release_runs_the_saved_index_has_not(tree):
+    update_run_index(path=os.path.join(tree, 'tabs', 'run_index.json'), workspace=tree)
+    release_dir = os.path.join(tree, 'release', '8.0.0.0', 'SKXI11ADS')
+    newest_release = sorted(name for name in os.listdir(release_dir) if name[0].isdigit())[-1]
+    shutil.copytree(os.path.join(release_dir, newest_release), os.path.join(release_dir, '20270101_000000'))
+
+    out = run_script(tree, 'report_engine.py', os.path.join('develop', 'RDKEMW-2000', 'SKXI11ADS'),
+                     '--regression-base', 'auto', '--no-index')
+    assert f"Using regression base {os.path.join('release', '8.0.0.0', 'SKXI11ADS', '20270101_000000')}" in out